@@ -0,0 +1,361 @@
+"""Local archive of events in SQLite, beyond the window of the upstream feed."""
+
+from __future__ import annotations
+
+import asyncio
+from collections.abc import Callable, Iterable
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+import logging
+from math import ceil, floor
+import os
+import sqlite3
+from typing import TYPE_CHECKING, Any, TypeVar
+
+from .distance import bounding_box, haversine_distances
+from .xml_parser.compact_event import from_epoch, to_epoch
+
+if TYPE_CHECKING:
+    from .feed_entry import FeedEntry
+
+_LOGGER = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+DEFAULT_CELL_SIZE = 1.0
+COLUMNS = (
+    "external_id",
+    "type",
+    "description",
+    "origin_time",
+    "latitude",
+    "longitude",
+    "depth",
+    "evaluation_status",
+    "magnitude",
+    "magnitude_type",
+    "creation_time",
+    "agency_id",
+    "author",
+    "cell",
+)
+SCHEMA = (
+    (
+        "CREATE TABLE IF NOT EXISTS events ("
+        "external_id TEXT PRIMARY KEY, type TEXT, description TEXT, "
+        "origin_time REAL, latitude REAL, longitude REAL, depth REAL, "
+        "evaluation_status TEXT, magnitude REAL, magnitude_type TEXT, "
+        "creation_time REAL, agency_id TEXT, author TEXT, cell INTEGER)"
+    ),
+    "CREATE INDEX IF NOT EXISTS events_origin_time ON events (origin_time)",
+    "CREATE INDEX IF NOT EXISTS events_magnitude ON events (magnitude)",
+    "CREATE INDEX IF NOT EXISTS events_cell ON events (cell)",
+)
+UPSERT = (
+    f"INSERT INTO events ({', '.join(COLUMNS)}) "  # noqa: S608
+    f"VALUES ({', '.join('?' for _ in COLUMNS)}) "
+    f"ON CONFLICT (external_id) DO UPDATE SET "
+    f"{', '.join(f'{column} = excluded.{column}' for column in COLUMNS[1:])}"
+)
+
+
+class ArchivedEvent:
+    """Event as stored in the archive."""
+
+    __slots__ = COLUMNS[:-1]
+
+    def __init__(self, row: tuple):
+        """Initialise the archived event from a row of the archive."""
+        for column, value in zip(self.__slots__, row, strict=False):
+            setattr(self, column, value)
+        self.origin_time = from_epoch(self.origin_time)
+        self.creation_time = from_epoch(self.creation_time)
+
+    def __repr__(self):
+        """Return string representation of this event."""
+        return f"<{self.__class__.__name__}({self.external_id})>"
+
+    @property
+    def coordinates(self) -> tuple[float, float] | None:
+        """Return the coordinates (latitude, longitude) of this event."""
+        if self.latitude is not None and self.longitude is not None:
+            return self.latitude, self.longitude
+        return None
+
+
+class EventArchive:
+    """Archive of events in SQLite, upserted by external id.
+
+    Events are indexed by origin time, magnitude and spatial grid cell. All
+    database access happens on a single background thread, so that the event
+    loop is never blocked, and each upsert is a single transaction. Using
+    the archive after it has been closed raises a RuntimeError.
+    """
+
+    def __init__(
+        self, path: str | os.PathLike, *, cell_size: float = DEFAULT_CELL_SIZE
+    ):
+        """Initialise the archive, with the grid cell size in degrees."""
+        self._path: str = os.fspath(path)
+        self._cell_size: float = cell_size
+        self._columns: int = ceil(360.0 / cell_size)
+        self._rows: int = ceil(180.0 / cell_size)
+        self._executor: ThreadPoolExecutor = ThreadPoolExecutor(
+            max_workers=1, thread_name_prefix="quakeml_archive"
+        )
+        # Only ever used on the background thread.
+        self._connection: sqlite3.Connection | None = None
+        self._closed: bool = False
+
+    def __repr__(self):
+        """Return string representation of this archive."""
+        return f"<{self.__class__.__name__}(path={self._path}, cell_size={self._cell_size})>"
+
+    async def _run(self, func: Callable[..., T], *args: Any) -> T:
+        """Run the function on the background thread."""
+        if self._closed:
+            raise RuntimeError(f"Archive {self._path} has been closed")
+        return await asyncio.get_running_loop().run_in_executor(
+            self._executor, func, *args
+        )
+
+    def _connect(self) -> sqlite3.Connection:
+        """Return the connection, opening the database if necessary."""
+        if self._connection is None:
+            connection = sqlite3.connect(self._path)
+            connection.execute("PRAGMA journal_mode = WAL")
+            connection.execute("PRAGMA synchronous = NORMAL")
+            with connection:
+                for statement in SCHEMA:
+                    connection.execute(statement)
+            self._connection = connection
+        return self._connection
+
+    async def close(self):
+        """Close the database, and stop the background thread."""
+
+        def _close():
+            if self._connection is not None:
+                self._connection.close()
+                self._connection = None
+
+        if self._closed:
+            return
+        await self._run(_close)
+        self._closed = True
+        self._executor.shutdown()
+
+    def _cell(self, latitude: float, longitude: float) -> int:
+        """Return the grid cell of the coordinates."""
+        return self._row(latitude) * self._columns + self._column(longitude)
+
+    def _row(self, latitude: float) -> int:
+        """Return the grid row of the latitude."""
+        return min(max(floor((latitude + 90.0) / self._cell_size), 0), self._rows - 1)
+
+    def _column(self, longitude: float) -> int:
+        """Return the grid column of the longitude."""
+        return min(
+            max(floor((longitude + 180.0) / self._cell_size), 0), self._columns - 1
+        )
+
+    def _record(self, entry: FeedEntry) -> tuple:
+        """Return the row of the archive for the feed entry."""
+        origin = entry.origin
+        magnitude = entry.magnitude
+        creation_info = entry.creation_info
+        coordinates: tuple[float, float] | None = entry.coordinates
+        return (
+            entry.external_id,
+            entry.type,
+            entry.description,
+            to_epoch(origin.time) if origin else None,
+            origin.latitude if origin else None,
+            origin.longitude if origin else None,
+            origin.depth if origin else None,
+            origin.evaluation_status if origin else None,
+            magnitude.mag if magnitude else None,
+            magnitude.type if magnitude else None,
+            to_epoch(creation_info.creation_time) if creation_info else None,
+            creation_info.agency_id if creation_info else None,
+            creation_info.author if creation_info else None,
+            self._cell(*coordinates) if coordinates else None,
+        )
+
+    async def upsert(self, entries: Iterable[FeedEntry]) -> int:
+        """Insert or update the entries in one transaction.
+
+        Return the number of archived entries, 0 if archiving failed.
+        """
+        records: list[tuple] = [self._record(entry) for entry in entries]
+        if not records:
+            return 0
+        try:
+            await self._run(self._upsert, records)
+        except sqlite3.Error as error:
+            _LOGGER.warning("Archiving events in %s failed with %s", self._path, error)
+            return 0
+        return len(records)
+
+    def _upsert(self, records: list[tuple]):
+        """Write the records in one transaction."""
+        connection = self._connect()
+        with connection:
+            connection.executemany(UPSERT, records)
+
+    async def count(self) -> int:
+        """Return the number of archived events."""
+        rows: list[tuple] = await self._run(
+            self._select, "SELECT COUNT(*) FROM events", ()
+        )
+        return rows[0][0]
+
+    def _select(self, sql: str, params: tuple) -> list[tuple]:
+        """Return all rows of the query."""
+        return self._connect().execute(sql, params).fetchall()
+
+    async def _events(
+        self, where: str, params: tuple, order: str | None, limit: int | None
+    ) -> list[ArchivedEvent]:
+        """Return the events matching the condition, in the order if any."""
+        sql: str = f"SELECT {', '.join(COLUMNS[:-1])} FROM events WHERE {where}"  # noqa: S608
+        if order is not None:
+            sql += f" ORDER BY {order}"
+        if limit is not None:
+            sql += " LIMIT ?"
+            params = (*params, limit)
+        return [
+            ArchivedEvent(row) for row in await self._run(self._select, sql, params)
+        ]
+
+    async def events_by_origin_time(
+        self,
+        start: datetime | None = None,
+        end: datetime | None = None,
+        *,
+        limit: int | None = None,
+    ) -> list[ArchivedEvent]:
+        """Return events with an origin time in the range, oldest first."""
+        where, params = _range("origin_time", to_epoch(start), to_epoch(end))
+        return await self._events(where, params, "origin_time", limit)
+
+    async def events_by_magnitude(
+        self,
+        minimum: float | None = None,
+        maximum: float | None = None,
+        *,
+        limit: int | None = None,
+    ) -> list[ArchivedEvent]:
+        """Return events with a magnitude in the range, smallest first."""
+        where, params = _range("magnitude", minimum, maximum)
+        return await self._events(where, params, "magnitude", limit)
+
+    async def events_within_bounding_box(
+        self,
+        south_west: tuple[float, float],
+        north_east: tuple[float, float],
+        *,
+        limit: int | None = None,
+    ) -> list[ArchivedEvent]:
+        """Return events inside the box defined by its corners, newest first.
+
+        If the western longitude is greater than the eastern longitude, the
+        box crosses the antimeridian.
+        """
+        where, params = self._area(south_west, north_east)
+        # The unary plus keeps SQLite from scanning the whole origin time
+        # index for the order, instead of searching the grid cells.
+        return await self._events(where, params, "+origin_time DESC", limit)
+
+    async def events_within_radius(
+        self, coordinates: tuple[float, float], radius: float
+    ) -> list[tuple[ArchivedEvent, float]]:
+        """Return events within the radius in km, with their distance.
+
+        The result is sorted by distance, nearest first.
+        """
+        min_latitude, max_latitude, delta_longitude = bounding_box(coordinates, radius)
+        if delta_longitude is None or delta_longitude >= 180.0:
+            west, east = -180.0, 180.0
+        else:
+            west = _wrap(coordinates[1] - delta_longitude)
+            east = _wrap(coordinates[1] + delta_longitude)
+        where, params = self._area((min_latitude, west), (max_latitude, east))
+        candidates: list[ArchivedEvent] = await self._events(where, params, None, None)
+        distances: list[float] = haversine_distances(
+            coordinates, [event.coordinates for event in candidates]
+        )
+        return sorted(
+            (
+                (event, distance)
+                for event, distance in zip(candidates, distances, strict=True)
+                if distance <= radius
+            ),
+            key=lambda item: item[1],
+        )
+
+    def _area(
+        self, south_west: tuple[float, float], north_east: tuple[float, float]
+    ) -> tuple[str, tuple]:
+        """Return the condition selecting events inside the box.
+
+        The grid cells narrow down the candidates using the index, the
+        coordinates then select the events precisely.
+        """
+        min_latitude, west = south_west
+        max_latitude, east = north_east
+        if west <= east:
+            column_ranges = [(self._column(west), self._column(east))]
+            longitude_condition = "longitude BETWEEN ? AND ?"
+        else:
+            # Crossing the antimeridian, ranges in ascending order for merging.
+            column_ranges = [
+                (0, self._column(east)),
+                (self._column(west), self._columns - 1),
+            ]
+            longitude_condition = "(longitude >= ? OR longitude <= ?)"
+        cell_ranges: list[list[int]] = []
+        for row in range(self._row(min_latitude), self._row(max_latitude) + 1):
+            for first, last in column_ranges:
+                first_cell = row * self._columns + first
+                last_cell = row * self._columns + last
+                if cell_ranges and cell_ranges[-1][1] + 1 >= first_cell:
+                    # Merge adjacent ranges, for example across full rows.
+                    cell_ranges[-1][1] = max(cell_ranges[-1][1], last_cell)
+                else:
+                    cell_ranges.append([first_cell, last_cell])
+        cells_condition: str = " OR ".join("cell BETWEEN ? AND ?" for _ in cell_ranges)
+        condition: str = (
+            f"({cells_condition}) AND latitude BETWEEN ? AND ? "
+            f"AND {longitude_condition}"
+        )
+        return (
+            condition,
+            (
+                *(cell for cell_range in cell_ranges for cell in cell_range),
+                min_latitude,
+                max_latitude,
+                west,
+                east,
+            ),
+        )
+
+
+def _range(
+    column: str, minimum: float | None, maximum: float | None
+) -> tuple[str, tuple]:
+    """Return the condition selecting values of the column in the range."""
+    conditions: list[str] = [f"{column} IS NOT NULL"]
+    params: list[float] = []
+    if minimum is not None:
+        conditions.append(f"{column} >= ?")
+        params.append(minimum)
+    if maximum is not None:
+        conditions.append(f"{column} <= ?")
+        params.append(maximum)
+    return " AND ".join(conditions), tuple(params)
+
+
+def _wrap(longitude: float) -> float:
+    """Return the longitude within -180 and 180 degrees."""
+    return (longitude + 180.0) % 360.0 - 180.0
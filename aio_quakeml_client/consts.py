@@ -4,13 +4,29 @@ from typing import Final
 
 ATTR_ATTRIBUTION: Final = "attribution"
 
+CIRCUIT_CLOSED: Final = "closed"
+CIRCUIT_HALF_OPEN: Final = "half_open"
+CIRCUIT_OPEN: Final = "open"
+
 CUSTOM_ATTRIBUTE: Final = "custom_attribute"
 
 DEFAULT_REQUEST_TIMEOUT: Final = 10
 
+STREAM_CHUNK_SIZE: Final = 65536
+
+FDSN_PARAM_UPDATEDAFTER: Final = "updatedafter"
+
+HTTP_HEADER_ETAG: Final = "ETag"
+HTTP_HEADER_IF_MODIFIED_SINCE: Final = "If-Modified-Since"
+HTTP_HEADER_IF_NONE_MATCH: Final = "If-None-Match"
+HTTP_HEADER_LAST_MODIFIED: Final = "Last-Modified"
+
 UPDATE_OK: Final = "OK"
 UPDATE_OK_NO_DATA: Final = "OK_NO_DATA"
+UPDATE_OK_NO_CHANGE: Final = "OK_NO_CHANGE"
 UPDATE_ERROR: Final = "ERROR"
+# No request was made, for example because the host asked to wait.
+UPDATE_SKIPPED: Final = "SKIPPED"
 
 XML_ATTR_PUBLICID: Final = "@publicID"
 
@@ -0,0 +1,116 @@
+"""Batched great-circle distance calculations."""
+
+from __future__ import annotations
+
+from collections.abc import Sequence
+import logging
+from math import asin, cos, degrees, radians, sin, sqrt
+
+_LOGGER = logging.getLogger(__name__)
+
+# Same mean earth radius as used by the haversine library.
+EARTH_RADIUS_KM = 6371.0088
+# Widen the bounding box slightly, so that rounding never rejects a point
+# right on the edge of the radius.
+BOUNDING_BOX_MARGIN = 1e-6
+# Below this number of points, the overhead of NumPy outweighs its benefits.
+NUMPY_THRESHOLD = 256
+
+_numpy = None
+_numpy_checked = False
+
+
+def _load_numpy():
+    """Return the numpy module if it is installed."""
+    global _numpy, _numpy_checked  # noqa: PLW0603
+    if not _numpy_checked:
+        _numpy_checked = True
+        try:
+            import numpy  # noqa: ICN001, PLC0415
+
+            _numpy = numpy
+        except ImportError:
+            _LOGGER.debug("NumPy not available, using pure Python distances")
+    return _numpy
+
+
+def bounding_box(
+    home_coordinates: tuple[float, float], radius: float
+) -> tuple[float, float, float | None]:
+    """Return minimum and maximum latitude, and maximum longitude difference.
+
+    All points within the radius (in km) of the home coordinates are inside
+    this box. The longitude difference is None if the box covers all
+    longitudes, for example if it includes one of the poles.
+    """
+    latitude: float = home_coordinates[0]
+    angular_radius: float = radius / EARTH_RADIUS_KM
+    delta_latitude: float = degrees(angular_radius) + BOUNDING_BOX_MARGIN
+    min_latitude: float = latitude - delta_latitude
+    max_latitude: float = latitude + delta_latitude
+    if min_latitude <= -90.0 or max_latitude >= 90.0:
+        return max(min_latitude, -90.0), min(max_latitude, 90.0), None
+    ratio: float = sin(angular_radius) / cos(radians(latitude))
+    if ratio >= 1.0:
+        return min_latitude, max_latitude, None
+    return min_latitude, max_latitude, degrees(asin(ratio)) + BOUNDING_BOX_MARGIN
+
+
+def in_bounding_box(
+    box: tuple[float, float, float | None],
+    home_longitude: float,
+    coordinates: tuple[float, float],
+) -> bool:
+    """Return True if the coordinates are inside the bounding box."""
+    min_latitude, max_latitude, delta_longitude = box
+    latitude, longitude = coordinates
+    if not min_latitude <= latitude <= max_latitude:
+        return False
+    if delta_longitude is None:
+        return True
+    # Difference in longitude, taking the antimeridian into account.
+    return abs((longitude - home_longitude + 180.0) % 360.0 - 180.0) <= delta_longitude
+
+
+def haversine_distances(
+    home_coordinates: tuple[float, float],
+    coordinates: Sequence[tuple[float, float]],
+) -> list[float]:
+    """Return the distances in km from the home coordinates to all points."""
+    if len(coordinates) >= NUMPY_THRESHOLD and (numpy := _load_numpy()):
+        return _haversine_distances_numpy(numpy, home_coordinates, coordinates)
+    home_latitude: float = radians(home_coordinates[0])
+    home_longitude: float = radians(home_coordinates[1])
+    cos_home_latitude: float = cos(home_latitude)
+    distances: list[float] = []
+    append = distances.append
+    for latitude, longitude in coordinates:
+        point_latitude: float = radians(latitude)
+        d = (
+            sin((point_latitude - home_latitude) * 0.5) ** 2
+            + cos_home_latitude
+            * cos(point_latitude)
+            * sin((radians(longitude) - home_longitude) * 0.5) ** 2
+        )
+        # Rounding may push antipodal points slightly out of range.
+        append(2 * EARTH_RADIUS_KM * asin(min(sqrt(d), 1.0)))
+    return distances
+
+
+def _haversine_distances_numpy(
+    numpy,
+    home_coordinates: tuple[float, float],
+    coordinates: Sequence[tuple[float, float]],
+) -> list[float]:
+    """Return the distances in km from the home coordinates, using NumPy."""
+    points = numpy.radians(numpy.asarray(coordinates, dtype=float))
+    home_latitude, home_longitude = numpy.radians(home_coordinates)
+    d = (
+        numpy.sin((points[:, 0] - home_latitude) * 0.5) ** 2
+        + numpy.cos(home_latitude)
+        * numpy.cos(points[:, 0])
+        * numpy.sin((points[:, 1] - home_longitude) * 0.5) ** 2
+    )
+    return (
+        2 * EARTH_RADIUS_KM * numpy.arcsin(numpy.minimum(numpy.sqrt(d), 1.0))
+    ).tolist()
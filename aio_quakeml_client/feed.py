@@ -5,23 +5,68 @@ from __future__ import annotations
 from abc import ABC, abstractmethod
 import asyncio
 import codecs
-from datetime import datetime
+from collections.abc import AsyncIterator, Callable
+from datetime import UTC, datetime
+import hashlib
+from http import HTTPStatus
 import logging
 from pyexpat import ExpatError
-from typing import Generic, TypeVar
+import time
+from typing import TYPE_CHECKING, Any, Generic, TypeVar
 
-import aiohttp
-from aiohttp import ClientSession, client_exceptions
-
-from .consts import DEFAULT_REQUEST_TIMEOUT, UPDATE_ERROR, UPDATE_OK, UPDATE_OK_NO_DATA
+from .consts import (
+    DEFAULT_REQUEST_TIMEOUT,
+    FDSN_PARAM_UPDATEDAFTER,
+    HTTP_HEADER_ETAG,
+    HTTP_HEADER_IF_MODIFIED_SINCE,
+    HTTP_HEADER_IF_NONE_MATCH,
+    HTTP_HEADER_LAST_MODIFIED,
+    STREAM_CHUNK_SIZE,
+    UPDATE_ERROR,
+    UPDATE_OK,
+    UPDATE_OK_NO_CHANGE,
+    UPDATE_OK_NO_DATA,
+    UPDATE_SKIPPED,
+)
+from .distance import bounding_box, haversine_distances, in_bounding_box
 from .feed_entry import FeedEntry
-from .xml_parser import EventParameters, XmlParser
+from .feed_source import FeedSource, FetchState
+from .rate_limit import RateLimiter
+from .retry import CircuitBreaker, CircuitBreakers, RetryPolicy
+from .single_flight import SingleFlight
+from .xml_parser import EventParameters, IncrementalXmlParser, XmlParser
 from .xml_parser.event import Event
 
+if TYPE_CHECKING:
+    from aiohttp import ClientSession
+
 _LOGGER = logging.getLogger(__name__)
 
 T_FEED_ENTRY = TypeVar("T_FEED_ENTRY", bound=FeedEntry)
 
+DIGEST_SIZE = 16
+
+
+def _aiohttp():
+    """Return the aiohttp module.
+
+    Importing aiohttp takes about 300 ms, more than the rest of the package,
+    so it is deferred until data is requested.
+    """
+    import aiohttp  # noqa: PLC0415
+
+    return aiohttp
+
+
+def _isoformat(timestamp: datetime | None) -> str | None:
+    """Return the timestamp in ISO format, for serialisation."""
+    return timestamp.isoformat() if timestamp else None
+
+
+def _fromisoformat(timestamp: str | None) -> datetime | None:
+    """Return the timestamp in ISO format as datetime."""
+    return datetime.fromisoformat(timestamp) if timestamp else None
+
 
 class QuakeMLFeed(Generic[T_FEED_ENTRY], ABC):
     """QuakeML feed base class."""
@@ -33,14 +78,64 @@ class QuakeMLFeed(Generic[T_FEED_ENTRY], ABC):
         url: str | None = None,
         filter_radius: float | None = None,
         filter_minimum_magnitude: float | None = None,
+        *,
+        incremental: bool = False,
+        compact_events: bool = False,
+        source: FeedSource | None = None,
+        retry_policy: RetryPolicy | None = None,
+        circuit_breakers: CircuitBreakers | None = None,
+        rate_limiter: RateLimiter | None = None,
     ):
-        """Initialise this service."""
+        """Initialise this service.
+
+        In incremental mode, only events updated since the newest creation
+        time seen so far are requested from the FDSN event service, and each
+        response only contains the changes since the previous update.
+
+        With compact events, each parsed event only keeps the values used by
+        feed entries, see CompactEvent.
+
+        Feeds sharing the same source only download and parse the data once
+        if they make the same request, see FeedSource.
+
+        Failed requests are retried according to the retry policy. Circuit
+        breakers, which can be shared by several feeds, stop requests to URLs
+        that keep failing.
+
+        A rate limiter limits the requests per host, and is usually shared by
+        all feeds, see shared_rate_limiter().
+        """
         self._websession: ClientSession = websession
         self._home_coordinates: tuple[float, float] = home_coordinates
         self._url: str | None = url
         self._filter_radius: float | None = filter_radius
         self._filter_minimum_magnitude: float | None = filter_minimum_magnitude
+        self._incremental: bool = incremental
+        self._compact_events: bool = compact_events
         self._last_timestamp: datetime | None = None
+        # Newest creation time of all (unfiltered) entries, for incremental mode.
+        self._watermark: datetime | None = None
+        # External ids in the last delta of entries that did not pass the filter.
+        self._rejected_external_ids: set[str] = set()
+        self._source: FeedSource | None = source
+        self._retry_policy: RetryPolicy | None = retry_policy
+        self._circuit_breakers: CircuitBreakers | None = circuit_breakers
+        self._rate_limiter: RateLimiter | None = rate_limiter
+        # Failed attempts since the last successful request.
+        self._failed_attempts: int = 0
+        # Outcome of the last finished stream.
+        self._stream_status: str | None = None
+        # Key and version of the source's data that the last entries were
+        # built from.
+        self._source_key_in_use: tuple | None = None
+        self._source_version: int | None = None
+        # Conditional request headers and digest of the last parsed payload.
+        self._fetch_state: FetchState = FetchState()
+        # Entries built from the last parsed payload.
+        self._last_entries: list[T_FEED_ENTRY] | None = None
+        self._update_flight: SingleFlight[tuple[str, list[T_FEED_ENTRY] | None]] = (
+            SingleFlight()
+        )
 
     def __repr__(self):
         """Return string representation of this feed."""
@@ -62,9 +157,35 @@ class QuakeMLFeed(Generic[T_FEED_ENTRY], ABC):
     def _additional_namespaces(self) -> dict | None:
         """Provide additional namespaces, relevant for this feed."""
 
+    def _additional_conversions(
+        self,
+    ) -> dict[tuple[str, ...], Callable[[str], Any]] | None:
+        """Provide additional typed paths, relevant for this feed.
+
+        Each key is the full chain of element names from the document root,
+        for example ``(XML_TAG_Q_QUAKEML, XML_TAG_EVENTPARAMETERS, XML_TAG_EVENT,
+        "origin", "quality", "usedPhaseCount")``, mapped to the conversion
+        function that is applied to the element's text.
+        """
+
+    def _xml_parser(self) -> XmlParser:
+        """Create the XML parser for this feed."""
+        return XmlParser(
+            self._additional_namespaces(),
+            self._additional_conversions(),
+            compact=self._compact_events,
+        )
+
     async def update(self) -> tuple[str, list[T_FEED_ENTRY] | None]:
-        """Update from external source and return filtered entries."""
-        status, quakeml_data = await self._fetch()
+        """Update from external source and return filtered entries.
+
+        Concurrent calls share the same update, and all get the same result.
+        """
+        return await self._update_flight.run(self._update)
+
+    async def _update(self) -> tuple[str, list[T_FEED_ENTRY] | None]:
+        """Fetch data, and create and filter entries."""
+        status, quakeml_data = await self._fetch_data(self._fetch_params())
         if status == UPDATE_OK:
             if quakeml_data:
                 global_data: dict | None = self._extract_from_feed(quakeml_data)
@@ -74,103 +195,436 @@ class QuakeMLFeed(Generic[T_FEED_ENTRY], ABC):
                     for event in quakeml_data.events
                 ]
                 filtered_entries: list[T_FEED_ENTRY] = self._filter_entries(entries)
-                self._last_timestamp = self._extract_last_timestamp(filtered_entries)
+                last_timestamp = self._extract_last_timestamp(filtered_entries)
+                if self._incremental:
+                    # A delta may not contain any entries at all.
+                    self._watermark = self._newest(
+                        self._watermark, self._extract_last_timestamp(entries)
+                    )
+                    # Events may have changed so that they do not pass the
+                    # filter anymore.
+                    self._rejected_external_ids = {
+                        entry.external_id for entry in entries
+                    }.difference(entry.external_id for entry in filtered_entries)
+                    last_timestamp = self._newest(self._last_timestamp, last_timestamp)
+                self._last_timestamp = last_timestamp
+                self._last_entries = filtered_entries
                 return UPDATE_OK, filtered_entries
             # Should not happen.
+            self._last_entries = None
             return UPDATE_OK, None
+        if status == UPDATE_OK_NO_CHANGE:
+            # Payload is identical to the last one, re-use the entries.
+            return UPDATE_OK_NO_CHANGE, self._last_entries
         if status == UPDATE_OK_NO_DATA:
             # Happens for example if the server returns 304
             return UPDATE_OK_NO_DATA, None
+        if status == UPDATE_SKIPPED:
+            # No request was made, keep everything for the next update.
+            return UPDATE_SKIPPED, None
         # Error happened while fetching the feed.
         self._last_timestamp = None
+        self._watermark = None
+        # Entries are discarded after an error, so the next request must
+        # fetch the full feed again.
+        self._fetch_state.reset()
+        self._source_version = None
+        self._last_entries = None
         return UPDATE_ERROR, None
 
-    def _fetch_url(self) -> str | None:
-        """Return URL to fetch QuakeML data from."""
-        return self._url
+    async def stream(self) -> AsyncIterator[T_FEED_ENTRY]:
+        """Update from external source and yield filtered entries as they arrive.
 
-    async def _fetch(
-        self, method: str = "GET", headers=None, params=None
-    ) -> tuple[str, EventParameters | None]:
-        """Fetch QuakeML data from external source."""
+        The response is parsed while it is being downloaded, and each event is
+        released as soon as its closing tag has been received. The request is
+        subject to the circuit breaker and rate limiter, but not retried, and
+        the outcome is available as stream_status once the stream has ended.
+        """
+        aiohttp = _aiohttp()
         url = self._fetch_url()
+        self._stream_status = await self._stream_allowed(url)
+        if self._stream_status:
+            return
+        circuit_breaker: CircuitBreaker | None = self.circuit_breaker
+        parser = self._xml_parser().incremental()
+        # Global data is kept per stream, so that concurrent streams of the
+        # same feed do not interfere.
+        global_data: dict | None = None
+        global_data_extracted: bool = False
+        last_timestamp: datetime | None = None
         try:
             timeout = aiohttp.ClientTimeout(total=self._client_session_timeout())
             async with self._websession.request(
-                method, url, headers=headers, params=params, timeout=timeout
+                "GET", url, timeout=timeout
             ) as response:
-                try:
-                    response.raise_for_status()
-                    text = await self._read_response(response)
-                    if text:
-                        parser = XmlParser(self._additional_namespaces())
-                        feed_data = parser.parse(text)
-                        self.parser = parser
-                        self.feed_data = feed_data
-                        return UPDATE_OK, feed_data
-                    return UPDATE_OK_NO_DATA, None
-                except client_exceptions.ClientError as client_error:
-                    _LOGGER.warning(
-                        "Fetching data from %s failed with %s", url, client_error
+                if self._rate_limiter:
+                    self._rate_limiter.record_response(
+                        url, response.status, response.headers
                     )
-                    return UPDATE_ERROR, None
-                except ExpatError as expat_error:
-                    _LOGGER.warning(
-                        "Parsing data from %s failed with %s", url, expat_error
-                    )
-                    return UPDATE_OK_NO_DATA, None
-        except client_exceptions.ClientError as client_error:
+                response.raise_for_status()
+                async for events in self._stream_events(parser, response):
+                    if not events:
+                        continue
+                    if not global_data_extracted and parser.event_parameters:
+                        global_data = self._extract_from_feed(parser.event_parameters)
+                        global_data_extracted = True
+                    for entry in self._stream_entries(events, global_data):
+                        last_timestamp = self._latest_timestamp(last_timestamp, entry)
+                        yield entry
+            self._last_timestamp = last_timestamp
+            self._stream_status = UPDATE_OK
+        except (aiohttp.ClientError, TimeoutError) as error:
+            self._stream_failed(url, error, circuit_breaker)
+            return
+        except ExpatError as expat_error:
+            # The host responded, but the entries are incomplete.
+            _LOGGER.warning("Parsing data from %s failed with %s", url, expat_error)
+            self._stream_status = UPDATE_ERROR
+        self._failed_attempts = 0
+        if circuit_breaker:
+            circuit_breaker.record_success()
+
+    async def _stream_allowed(self, url: str) -> str | None:
+        """Wait for the rate limiter, and return a status if no request may be made."""
+        circuit_breaker: CircuitBreaker | None = self.circuit_breaker
+        if circuit_breaker and not circuit_breaker.allow_request():
+            _LOGGER.warning("Circuit breaker for %s is open, skipping request", url)
+            return UPDATE_ERROR
+        if self._rate_limiter and not await self._rate_limiter.acquire(
+            url, timeout=self._client_session_timeout()
+        ):
             _LOGGER.warning(
-                "Requesting data from %s failed with " "client error: %s",
-                url,
-                client_error,
+                "Rate limit of %s does not allow a request in time, skipping", url
             )
+            return UPDATE_SKIPPED
+        return None
+
+    def _stream_failed(
+        self, url: str, error: Exception, circuit_breaker: CircuitBreaker | None
+    ):
+        """Log and record a stream whose request failed."""
+        if isinstance(error, TimeoutError):
+            _LOGGER.warning("Streaming data from %s failed with timeout error", url)
+        else:
+            _LOGGER.warning(
+                "Streaming data from %s failed with client error: %s", url, error
+            )
+        self._last_timestamp = None
+        self._failed_attempts += 1
+        self._stream_status = UPDATE_ERROR
+        if circuit_breaker:
+            circuit_breaker.record_failure()
+
+    @staticmethod
+    async def _stream_events(
+        parser: IncrementalXmlParser, response
+    ) -> AsyncIterator[list[Event]]:
+        """Feed the response to the parser chunk by chunk, yielding completed events."""
+        async for chunk in response.content.iter_chunked(STREAM_CHUNK_SIZE):
+            yield parser.feed(chunk)
+        yield parser.close()
+
+    def _stream_entries(
+        self, events: list[Event], global_data: dict | None
+    ) -> list[T_FEED_ENTRY]:
+        """Generate and filter entries for events emitted by the parser."""
+        return self._filter_entries(
+            [
+                self._new_entry(self._home_coordinates, event, global_data)
+                for event in events
+            ]
+        )
+
+    @staticmethod
+    def _latest_timestamp(
+        last_timestamp: datetime | None, entry: T_FEED_ENTRY
+    ) -> datetime | None:
+        """Return the newer of the provided timestamp and the entry's creation time."""
+        if entry.creation_info and entry.creation_info.creation_time:
+            creation_time: datetime = entry.creation_info.creation_time
+            if last_timestamp is None or creation_time > last_timestamp:
+                return creation_time
+        return last_timestamp
+
+    @staticmethod
+    def _newest(first: datetime | None, second: datetime | None) -> datetime | None:
+        """Return the newer of the two timestamps."""
+        if first is None or second is None:
+            return first or second
+        return max(first, second)
+
+    async def _fetch_data(
+        self, params: dict | None
+    ) -> tuple[str, EventParameters | None]:
+        """Fetch QuakeML data, from the shared source if there is one."""
+        if not self._source:
+            return await self._fetch(params=params)
+        key: tuple = self._source_key(params)
+        if self._source_key_in_use not in (None, key):
+            # Requests with an older updatedafter of an incremental feed are
+            # not made again.
+            self._source.discard(self._source_key_in_use)
+        self._source_key_in_use = key
+        status, quakeml_data, version = await self._source.fetch(
+            key,
+            lambda fetch_state: self._fetch(params=params, fetch_state=fetch_state),
+        )
+        if status == UPDATE_OK:
+            if version == self._source_version and self._last_entries is not None:
+                return UPDATE_OK_NO_CHANGE, None
+            self._source_version = version
+        return status, quakeml_data
+
+    def _source_key(self, params: dict | None) -> tuple:
+        """Return the key identifying requests made by this feed."""
+        return (
+            self.__class__,
+            self._fetch_url(),
+            tuple(sorted((params or {}).items())),
+            self._compact_events,
+        )
+
+    def _fetch_params(self) -> dict | None:
+        """Return query parameters for the next request."""
+        if self._incremental and self._watermark:
+            return {
+                FDSN_PARAM_UPDATEDAFTER: self._watermark.astimezone(UTC)
+                .replace(tzinfo=None)
+                .isoformat()
+            }
+        return None
+
+    def _fetch_url(self) -> str | None:
+        """Return URL to fetch QuakeML data from."""
+        return self._url
+
+    async def _fetch(
+        self,
+        method: str = "GET",
+        headers=None,
+        params=None,
+        *,
+        fetch_state: FetchState | None = None,
+    ) -> tuple[str, EventParameters | None]:
+        """Fetch QuakeML data from external source.
+
+        Failed requests are retried according to the retry policy, and no
+        request is made while the URL's circuit breaker is open. If the rate
+        limiter does not allow a request before the deadline, the update is
+        skipped.
+        """
+        aiohttp = _aiohttp()
+        url = self._fetch_url()
+        fetch_state = fetch_state or self._fetch_state
+        if conditional_headers := fetch_state.conditional_headers(url, params):
+            headers = {**conditional_headers, **(headers or {})}
+        circuit_breaker: CircuitBreaker | None = self.circuit_breaker
+        if circuit_breaker and not circuit_breaker.allow_request():
+            _LOGGER.warning("Circuit breaker for %s is open, skipping request", url)
             return UPDATE_ERROR, None
-        except asyncio.TimeoutError:
-            _LOGGER.warning("Requesting data from %s failed with " "timeout error", url)
-            return UPDATE_ERROR, None
+        deadline: float | None = (
+            time.monotonic() + self._retry_policy.deadline
+            if self._retry_policy
+            else None
+        )
+        attempt: int = 0
+        while True:
+            attempt += 1
+            if self._rate_limiter and not await self._rate_limiter.acquire(
+                url, timeout=self._rate_limit_timeout(deadline)
+            ):
+                _LOGGER.warning(
+                    "Rate limit of %s does not allow a request in time, skipping",
+                    url,
+                )
+                return UPDATE_SKIPPED, None
+            try:
+                result = await self._fetch_attempt(
+                    method, url, headers, params, fetch_state
+                )
+            except ExpatError as expat_error:
+                _LOGGER.warning("Parsing data from %s failed with %s", url, expat_error)
+                result = UPDATE_OK_NO_DATA, None
+            except (aiohttp.ClientError, TimeoutError) as error:
+                self._failed_attempts += 1
+                delay: float | None = self._retry_delay(error, attempt, deadline)
+                if delay is None:
+                    self._log_fetch_error(url, error)
+                    if circuit_breaker:
+                        circuit_breaker.record_failure()
+                    return UPDATE_ERROR, None
+                _LOGGER.debug(
+                    "Attempt %d for %s failed with %r, retrying in %.1fs",
+                    attempt,
+                    url,
+                    error,
+                    delay,
+                )
+                await asyncio.sleep(delay)
+                continue
+            self._failed_attempts = 0
+            if circuit_breaker:
+                circuit_breaker.record_success()
+            return result
+
+    async def _fetch_attempt(
+        self, method: str, url: str, headers, params, fetch_state: FetchState
+    ) -> tuple[str, EventParameters | None]:
+        """Make a single request, and read and parse the response."""
+        aiohttp = _aiohttp()
+        timeout = aiohttp.ClientTimeout(total=self._client_session_timeout())
+        async with self._websession.request(
+            method, url, headers=headers, params=params, timeout=timeout
+        ) as response:
+            if self._rate_limiter:
+                self._rate_limiter.record_response(
+                    url, response.status, response.headers
+                )
+            response.raise_for_status()
+            return await self._process_response(url, params, response, fetch_state)
+
+    def _rate_limit_timeout(self, deadline: float | None) -> float:
+        """Return the time in seconds a request may wait for the rate limiter.
+
+        Without retry policy, the request may wait as long as its own timeout.
+        """
+        if deadline is None:
+            return self._client_session_timeout()
+        return max(0.0, deadline - time.monotonic())
+
+    def _retry_delay(
+        self, error: Exception, attempt: int, deadline: float | None
+    ) -> float | None:
+        """Return the delay before the next attempt, or None to give up."""
+        if (
+            not self._retry_policy
+            or attempt >= self._retry_policy.max_attempts
+            or not self._retryable(error)
+        ):
+            return None
+        delay: float = self._retry_policy.backoff(attempt)
+        if time.monotonic() + delay > deadline:
+            return None
+        return delay
+
+    @staticmethod
+    def _retryable(error: Exception) -> bool:
+        """Return True for timeouts, throttling, server errors and broken connections."""
+        aiohttp = _aiohttp()
+        if isinstance(error, aiohttp.ClientResponseError):
+            return (
+                error.status == HTTPStatus.TOO_MANY_REQUESTS
+                or error.status >= HTTPStatus.INTERNAL_SERVER_ERROR
+            )
+        return isinstance(
+            error,
+            TimeoutError | aiohttp.ClientConnectionError | aiohttp.ClientPayloadError,
+        )
+
+    @staticmethod
+    def _log_fetch_error(url: str, error: Exception):
+        """Log the error of the last attempt to fetch data."""
+        aiohttp = _aiohttp()
+        if isinstance(error, aiohttp.ClientResponseError):
+            _LOGGER.warning("Fetching data from %s failed with %s", url, error)
+        elif isinstance(error, TimeoutError):
+            _LOGGER.warning("Requesting data from %s failed with timeout error", url)
+        else:
+            _LOGGER.warning(
+                "Requesting data from %s failed with client error: %s", url, error
+            )
 
-    async def _read_response(self, response):
-        """Pre-process the response."""
+    async def _process_response(
+        self, url: str, params: dict | None, response, fetch_state: FetchState
+    ) -> tuple[str, EventParameters | None]:
+        """Read and parse a successful response."""
+        if response.status == HTTPStatus.NOT_MODIFIED:
+            _LOGGER.debug("Data from %s not modified", url)
+            return UPDATE_OK_NO_DATA, None
+        data = await self._read_response(response)
+        if data:
+            fetch_state.store_validators(url, params, self._validators(response))
+            digest: bytes = hashlib.blake2b(data, digest_size=DIGEST_SIZE).digest()
+            if digest == fetch_state.digest:
+                _LOGGER.debug("Data from %s unchanged", url)
+                return UPDATE_OK_NO_CHANGE, None
+            parser = self._xml_parser()
+            feed_data = parser.parse(data)
+            self.parser = parser
+            self.feed_data = feed_data
+            fetch_state.digest = digest
+            return UPDATE_OK, feed_data
+        return UPDATE_OK_NO_DATA, None
+
+    @staticmethod
+    def _validators(response) -> dict[str, str]:
+        """Return the response's validators for the next conditional request."""
+        validators: dict[str, str] = {}
+        if etag := response.headers.get(HTTP_HEADER_ETAG):
+            validators[HTTP_HEADER_IF_NONE_MATCH] = etag
+        if last_modified := response.headers.get(HTTP_HEADER_LAST_MODIFIED):
+            validators[HTTP_HEADER_IF_MODIFIED_SINCE] = last_modified
+        return validators
+
+    async def _read_response(self, response) -> bytes | memoryview | None:
+        """Pre-process the response.
+
+        The raw bytes are handed to the parser as they are, so that the
+        encoding declared in the XML document is honoured without decoding
+        the whole document into a string first.
+        """
         if response:
-            raw_response = await response.read()
-            _LOGGER.debug("Response encoding %s", response.get_encoding())
+            raw_response: bytes = await response.read()
             if raw_response.startswith(codecs.BOM_UTF8):
-                return await response.text("utf-8-sig")
-            return await response.text()
+                return memoryview(raw_response)[len(codecs.BOM_UTF8) :]
+            return raw_response
         return None
 
     def _filter_entries(self, entries: list[T_FEED_ENTRY]) -> list[T_FEED_ENTRY]:
-        """Filter the provided entries."""
-        filtered_entries: list[T_FEED_ENTRY] = entries
-        _LOGGER.debug("Entries before filtering %s", filtered_entries)
-        # Always remove entries without geometry.
-        filtered_entries = list(
-            filter(
-                lambda entry: entry.coordinates is not None,
-                filtered_entries,
-            )
+        """Filter the provided entries.
+
+        Entries are checked in a single pass: entries without geometry, with
+        a too small magnitude or outside the bounding box of the radius are
+        rejected first, and distances are then calculated in one batch for the
+        remaining entries only.
+        """
+        _LOGGER.debug("Entries before filtering %s", entries)
+        minimum_magnitude: float | None = self._filter_minimum_magnitude
+        box = (
+            bounding_box(self._home_coordinates, self._filter_radius)
+            if self._filter_radius
+            else None
         )
+        home_longitude: float = self._home_coordinates[1]
+        candidates: list[T_FEED_ENTRY] = []
+        candidate_coordinates: list[tuple[float, float]] = []
+        for entry in entries:
+            if minimum_magnitude:
+                # Keep only entries that have an actual magnitude value, and
+                # the value is equal or above the defined threshold.
+                mag: float | None = entry.mag
+                if not mag or mag < minimum_magnitude:
+                    continue
+            # Always remove entries without geometry.
+            coordinates: tuple[float, float] | None = entry.coordinates
+            if coordinates is None:
+                continue
+            if box:
+                if not in_bounding_box(box, home_longitude, coordinates):
+                    continue
+                candidate_coordinates.append(coordinates)
+            candidates.append(entry)
+        filtered_entries: list[T_FEED_ENTRY] = candidates
         # Filter by distance.
-        if self._filter_radius:
-            filtered_entries = list(
-                filter(
-                    lambda entry: entry.distance_to_home <= self._filter_radius,
-                    filtered_entries,
-                )
-            )
-        # # Filter by category.
-        if self._filter_minimum_magnitude:
-            # Return only entries that have an actual magnitude value, and
-            # the value is equal or above the defined threshold.
-            filtered_entries = list(
-                filter(
-                    lambda entry: entry.magnitude
-                    and entry.magnitude.mag
-                    and entry.magnitude.mag >= self._filter_minimum_magnitude,
-                    filtered_entries,
-                )
+        if box:
+            filtered_entries = []
+            distances: list[float] = haversine_distances(
+                self._home_coordinates, candidate_coordinates
             )
+            for entry, distance in zip(candidates, distances, strict=True):
+                entry.distance_to_home = distance
+                if distance <= self._filter_radius:
+                    filtered_entries.append(entry)
         _LOGGER.debug("Entries after filtering %s", filtered_entries)
         return filtered_entries
 
@@ -182,21 +636,63 @@ class QuakeMLFeed(Generic[T_FEED_ENTRY], ABC):
         self, feed_entries: list[T_FEED_ENTRY]
     ) -> datetime | None:
         """Determine latest (newest) entry from the filtered feed."""
-        if feed_entries:
-            dates: list[datetime] = sorted(
-                [
-                    entry.creation_info.creation_time
-                    for entry in feed_entries
-                    if entry.creation_info and entry.creation_info.creation_time
-                ],
-                reverse=True,
-            )
-            if dates:
-                last_timestamp: datetime = dates[0]
-                _LOGGER.debug("Last timestamp: %s", last_timestamp)
-                return last_timestamp
+        dates: list[datetime] = [
+            entry.creation_info.creation_time
+            for entry in feed_entries
+            if entry.creation_info and entry.creation_info.creation_time
+        ]
+        if dates:
+            last_timestamp: datetime = max(dates)
+            _LOGGER.debug("Last timestamp: %s", last_timestamp)
+            return last_timestamp
         return None
 
+    def snapshot_state(self) -> dict:
+        """Return the state needed to resume fetching after a restart.
+
+        The state can be serialised as JSON. Validators, the digest of the
+        last payload and the watermark of incremental feeds are not included:
+        entries are not persisted, so the first request after a restart must
+        fetch and parse the full payload to build them again.
+        """
+        return {"last_timestamp": _isoformat(self._last_timestamp)}
+
+    def restore_state(self, state: dict):
+        """Restore the state returned by snapshot_state()."""
+        self._last_timestamp = _fromisoformat(state.get("last_timestamp"))
+
+    @property
+    def url(self) -> str | None:
+        """Return the URL this feed fetches data from."""
+        return self._fetch_url()
+
+    @property
+    def failed_attempts(self) -> int:
+        """Return the number of failed attempts since the last successful one."""
+        return self._failed_attempts
+
+    @property
+    def stream_status(self) -> str | None:
+        """Return the outcome of the last stream, UPDATE_OK if it was complete."""
+        return self._stream_status
+
+    @property
+    def circuit_breaker(self) -> CircuitBreaker | None:
+        """Return the circuit breaker for this feed's URL, if any."""
+        if self._circuit_breakers:
+            return self._circuit_breakers.get(self._fetch_url())
+        return None
+
+    @property
+    def incremental(self) -> bool:
+        """Return True if this feed only fetches changes since the last update."""
+        return self._incremental
+
+    @property
+    def rejected_external_ids(self) -> set[str]:
+        """Return the ids in the last delta of entries that did not pass the filter."""
+        return self._rejected_external_ids
+
     @property
     def last_timestamp(self) -> datetime | None:
         """Return the last timestamp extracted from this feed."""
@@ -24,6 +24,7 @@ class FeedEntry(ABC):
         """Initialise this feed entry."""
         self._home_coordinates: tuple[float, float] = home_coordinates
         self._quakeml_event: Event = quakeml_event
+        self._distance_to_home: float | None = None
 
     def __repr__(self):
         """Return string representation of this entry."""
@@ -32,8 +33,8 @@ class FeedEntry(ABC):
     @property
     def coordinates(self) -> tuple[float, float] | None:
         """Return the coordinates (latitude, longitude) of this entry."""
-        if self.origin and self.origin.latitude and self.origin.longitude:
-            return self.origin.latitude, self.origin.longitude
+        if self._quakeml_event:
+            return self._quakeml_event.coordinates
         return None
 
     @property
@@ -64,12 +65,21 @@ class FeedEntry(ABC):
     @property
     def distance_to_home(self) -> float:
         """Return the distance in km of this entry to the home coordinates."""
+        if self._distance_to_home is not None:
+            return self._distance_to_home
         distance: float = float("inf")
-        if self.coordinates:
+        coordinates: tuple[float, float] | None = self.coordinates
+        if coordinates:
             # Expecting coordinates in format: (latitude, longitude).
-            return haversine(self.coordinates, self._home_coordinates)
+            distance = haversine(coordinates, self._home_coordinates)
+            self._distance_to_home = distance
         return distance
 
+    @distance_to_home.setter
+    def distance_to_home(self, distance: float):
+        """Store the distance in km, for example after a batched calculation."""
+        self._distance_to_home = distance
+
     @property
     def type(self) -> str | None:
         """Return entry's type."""
@@ -86,6 +96,32 @@ class FeedEntry(ABC):
             return self._quakeml_event.description.text
         return None
 
+    @property
+    def fingerprint(self) -> dict[str, tuple]:
+        """Return the values of this entry's fields, to detect changes."""
+        origin: Origin | None = self.origin
+        magnitude: Magnitude | None = self.magnitude
+        creation_info: CreationInfo | None = self.creation_info
+        return {
+            "origin": (
+                (origin.time, origin.latitude, origin.longitude, origin.depth)
+                if origin
+                else ()
+            ),
+            "evaluation_status": (origin.evaluation_status,) if origin else (),
+            "magnitude": (magnitude.mag, magnitude.type) if magnitude else (),
+            "creation_info": (
+                (
+                    creation_info.agency_id,
+                    creation_info.author,
+                    creation_info.creation_time,
+                )
+                if creation_info
+                else ()
+            ),
+            "description": (self.description,),
+        }
+
     @property
     def creation_info(self) -> CreationInfo | None:
         """Return creation info."""
@@ -100,6 +136,13 @@ class FeedEntry(ABC):
             return self._quakeml_event.magnitude
         return None
 
+    @property
+    def mag(self) -> float | None:
+        """Return the value of the magnitude."""
+        if self._quakeml_event:
+            return self._quakeml_event.mag
+        return None
+
     @property
     def origin(self) -> Origin | None:
         """Return origin."""
@@ -2,39 +2,137 @@
 
 from __future__ import annotations
 
-from datetime import datetime
+import asyncio
+from collections.abc import Iterable
+from datetime import UTC, datetime, timedelta
+import hashlib
 import logging
-from typing import Awaitable, Callable
+from typing import TYPE_CHECKING, Awaitable, Callable, TypeVar
 
-from .consts import UPDATE_OK, UPDATE_OK_NO_DATA
+from .consts import UPDATE_OK, UPDATE_OK_NO_CHANGE, UPDATE_OK_NO_DATA, UPDATE_SKIPPED
 from .feed import QuakeMLFeed
 from .feed_entry import FeedEntry
+from .polling_policy import PollingPolicy
+from .single_flight import SingleFlight
+from .sorted_index import SortedIndex
+from .spatial_index import SpatialIndex
 from .status_update import StatusUpdate
 
+if TYPE_CHECKING:
+    from .archive import EventArchive
+    from .state_store import StateStore
+
 _LOGGER = logging.getLogger(__name__)
 
+T = TypeVar("T")
+
+FINGERPRINT_DIGEST_SIZE = 8
+# Receives the entries by external id, and for updates optionally the names
+# of the changed fields by external id.
+BatchCallback = Callable[..., Awaitable[None]]
+
 
 class QuakeMLFeedManagerBase:
-    """Generic Feed manager."""
+    """Generic Feed manager.
+
+    Keyword options:
+
+    - entry_max_age: remove entries with an older origin time, entries
+      without one are kept. Required for incremental feeds, where a missing
+      event has not been removed.
+    - polling_policy: is told about each update, and sets the interval
+      until the next one.
+    - stale_max_failures, stale_max_age: keep the last good entries, marked
+      as stale, for up to this many failed updates in a row, or this long
+      after the last successful update.
+    - changed_fields: pass the names of changed fields to the update
+      callback. It is only invoked if the entry's fingerprint has changed.
+    - callback_concurrency, callback_timeout: run the callbacks of each step
+      concurrently, each within the timeout. Failing callbacks do not abort
+      the update.
+    - generate/update/remove_batch_async_callback, batch_size: invoked
+      instead of the per-id callback with the entries of up to batch size
+      external ids. Removed entities get their last stored entry, or None.
+    - state_store: save the managed entities and the feed's state after
+      each update, and restore them before the first one, so that known
+      entities are not generated again. The first request after a restart
+      is always a full one.
+    - archive: upsert new and changed entries in one transaction per
+      update, before any entity callbacks.
+    """
 
     def __init__(
         self,
         feed: QuakeMLFeed,
         generate_async_callback: Callable[[str], Awaitable[None]] | None = None,
-        update_async_callback: Callable[[str], Awaitable[None]] | None = None,
+        update_async_callback: Callable[..., Awaitable[None]] | None = None,
         remove_async_callback: Callable[[str], Awaitable[None]] | None = None,
         status_async_callback: Callable[[StatusUpdate], Awaitable[None]] | None = None,
+        *,
+        entry_max_age: timedelta | None = None,
+        polling_policy: PollingPolicy | None = None,
+        stale_max_failures: int | None = None,
+        stale_max_age: timedelta | None = None,
+        changed_fields: bool = False,
+        callback_concurrency: int | None = None,
+        callback_timeout: timedelta | None = None,
+        generate_batch_async_callback: BatchCallback | None = None,
+        update_batch_async_callback: BatchCallback | None = None,
+        remove_batch_async_callback: BatchCallback | None = None,
+        batch_size: int | None = None,
+        state_store: StateStore | None = None,
+        archive: EventArchive | None = None,
     ):
         """Initialise feed manager."""
+        if feed.incremental and entry_max_age is None:
+            _LOGGER.warning(
+                "Entries of incremental feed %s are never evicted without a "
+                "maximum age, and will keep growing",
+                feed,
+            )
         self._feed: QuakeMLFeed = feed
         self.feed_entries: dict = {}
+        self._spatial_index: SpatialIndex = SpatialIndex()
+        self._origin_time_index: SortedIndex = SortedIndex()
+        self._creation_time_index: SortedIndex = SortedIndex()
+        self._magnitude_index: SortedIndex = SortedIndex()
         self._managed_external_ids: set = set()
+        self._fingerprints: dict[str, dict[str, str]] = {}
+        # Restored external ids without a stored entry yet, with origin time.
+        self._restored_external_ids: dict[str, datetime | None] = {}
+        # Last stored entries of entities that are yet to be removed.
+        self._removed_entries: dict[str, FeedEntry] = {}
+        self._state_store: StateStore | None = state_store
+        self._state_restored: bool = False
+        self._archive: EventArchive | None = archive
+        # Fingerprints of the stored entries as they were last archived.
+        self._archived_fingerprints: dict[str, dict[str, str]] = {}
+        self._changed_fields: bool = changed_fields
+        self._callback_concurrency: int | None = callback_concurrency
+        self._callback_timeout: timedelta | None = callback_timeout
+        self._generate_batch_async_callback: BatchCallback | None = (
+            generate_batch_async_callback
+        )
+        self._update_batch_async_callback: BatchCallback | None = (
+            update_batch_async_callback
+        )
+        self._remove_batch_async_callback: BatchCallback | None = (
+            remove_batch_async_callback
+        )
+        self._batch_size: int | None = batch_size
+        self._entry_max_age: timedelta | None = entry_max_age
+        self._polling_policy: PollingPolicy | None = polling_policy
+        self._stale_max_failures: int | None = stale_max_failures
+        self._stale_max_age: timedelta | None = stale_max_age
+        self._failed_updates: int = 0
+        self._stale: bool = False
         self._last_update: datetime | None = None
         self._last_update_successful: datetime | None = None
+        self._update_flight: SingleFlight[None] = SingleFlight()
         self._generate_async_callback: Callable[[str], Awaitable[None]] = (
             generate_async_callback
         )
-        self._update_async_callback: Callable[[str], Awaitable[None]] = (
+        self._update_async_callback: Callable[..., Awaitable[None]] = (
             update_async_callback
         )
         self._remove_async_callback: Callable[[str], Awaitable[None]] = (
@@ -49,89 +147,569 @@ class QuakeMLFeedManagerBase:
         return f"<{self.__class__.__name__}(feed={self._feed})>"
 
     async def update(self):
-        """Update the feed and then update connected entities."""
+        """Update the feed and then update connected entities.
+
+        Concurrent calls share the same update.
+        """
+        await self._update_flight.run(self._update)
+
+    async def _update(self):
+        """Update the feed, stored entries and connected entities."""
+        if self._state_store and not self._state_restored:
+            self._state_restored = True
+            if state := await self._state_store.load():
+                self.restore_state(state)
         status, feed_entries = await self._feed.update()
         # Record current time of update.
         self._last_update = datetime.now()
+        if status == UPDATE_SKIPPED:
+            # No request was made, keep all entries as they are.
+            _LOGGER.debug("Update of %s skipped", self._feed)
+            await self._status_update(status, 0, 0, 0, 0)
+            return
         count_created: int = 0
         count_updated: int = 0
+        count_unchanged: int = 0
         count_removed: int = 0
-        await self._store_feed_entries(status, feed_entries)
+        self._record_failed_updates(status)
+        if not self._stale:
+            await self._store_feed_entries(status, feed_entries)
         if status == UPDATE_OK:
             _LOGGER.debug("Data retrieved %s", feed_entries)
             # Record current time of update.
             self._last_update_successful = self._last_update
-            # For entity management the external ids from the feed are used.
-            feed_external_ids = {entry.external_id for entry in feed_entries}
-            count_removed = await self._update_feed_remove_entries(feed_external_ids)
-            count_updated = await self._update_feed_update_entries(feed_external_ids)
-            count_created = await self._update_feed_create_entries(feed_external_ids)
-        elif status == UPDATE_OK_NO_DATA:
-            _LOGGER.debug("Update successful, but no data received from %s", self._feed)
+            (
+                count_created,
+                count_updated,
+                count_unchanged,
+                count_removed,
+            ) = await self._update_feed_entities(feed_entries)
+        elif status in (UPDATE_OK_NO_DATA, UPDATE_OK_NO_CHANGE):
+            _LOGGER.debug(
+                "Update successful, but no new data received from %s", self._feed
+            )
             # Record current time of update.
             self._last_update_successful = self._last_update
+            # Remove evicted entries.
+            count_removed = await self._update_feed_remove_entries(
+                self._current_external_ids()
+            )
+        elif self._stale:
+            _LOGGER.warning(
+                "Update not successful, keeping stale entries from %s", self._feed
+            )
         else:
             _LOGGER.warning(
                 "Update not successful, no data received from %s", self._feed
             )
             # Remove all entities.
             count_removed = await self._update_feed_remove_entries(set())
+        if self._polling_policy:
+            self._polling_policy.record(
+                status, count_created, count_updated, count_removed
+            )
         # Send status update to subscriber.
-        await self._status_update(status, count_created, count_updated, count_removed)
+        await self._status_update(
+            status, count_created, count_updated, count_removed, count_unchanged
+        )
+        if self._state_store:
+            await self._state_store.save(self.snapshot_state())
+
+    def _record_failed_updates(self, status: str) -> None:
+        """Count consecutive failed updates and decide whether entries are stale."""
+        if status in (UPDATE_OK, UPDATE_OK_NO_DATA, UPDATE_OK_NO_CHANGE):
+            self._failed_updates = 0
+            self._stale = False
+        else:
+            self._failed_updates += 1
+            self._stale = self._keep_stale_entries()
+
+    def _current_external_ids(self) -> set[str]:
+        """Return the external ids of all entries that are still current."""
+        return set(self.feed_entries).union(self._restored_external_ids)
+
+    def snapshot_state(self) -> dict:
+        """Return the state needed to resume managing entities after a restart.
+
+        The state can be serialised as JSON.
+        """
+        entries: dict[str, dict] = {}
+        for external_id in self._managed_external_ids:
+            if external_id in self.feed_entries:
+                origin_time = self._origin_time_index.value(external_id)
+            else:
+                origin_time = self._restored_external_ids.get(external_id)
+            entries[external_id] = {
+                "fingerprint": self._fingerprints.get(external_id, {}),
+                "origin_time": origin_time.isoformat() if origin_time else None,
+            }
+        return {"entries": entries, "feed": self._feed.snapshot_state()}
+
+    def restore_state(self, state: dict):
+        """Restore the state returned by snapshot_state().
+
+        Restored entities are considered current until the feed says otherwise.
+        """
+        entries: dict[str, dict] = state.get("entries") or {}
+        _LOGGER.debug("Restoring %d entities for %s", len(entries), self._feed)
+        self._managed_external_ids = set(entries)
+        self._fingerprints = {
+            external_id: entry.get("fingerprint") or {}
+            for external_id, entry in entries.items()
+        }
+        self._restored_external_ids = {
+            external_id: datetime.fromisoformat(entry["origin_time"])
+            if entry.get("origin_time")
+            else None
+            for external_id, entry in entries.items()
+            if external_id not in self.feed_entries
+        }
+        if feed_state := state.get("feed"):
+            self._feed.restore_state(feed_state)
+
+    async def _update_feed_entities(
+        self, feed_entries: list[FeedEntry]
+    ) -> tuple[int, int, int, int]:
+        """Create, update and remove entities after a successful update.
+
+        Return the number of created, changed, unchanged and removed entities.
+        """
+        # For entity management the external ids from the feed are used.
+        # Incremental feeds only contain changes, so entries which are
+        # missing from the feed are only removed once they are evicted.
+        current_external_ids = self._current_external_ids()
+        feed_external_ids = current_external_ids.intersection(
+            entry.external_id for entry in feed_entries
+        )
+        if self._archive:
+            await self._archive_feed_entries(feed_external_ids)
+        count_removed = await self._update_feed_remove_entries(current_external_ids)
+        count_updated, count_unchanged = await self._update_feed_update_entries(
+            feed_external_ids
+        )
+        count_created = await self._update_feed_create_entries(feed_external_ids)
+        return count_created, count_updated, count_unchanged, count_removed
+
+    async def _archive_feed_entries(self, external_ids: set[str]):
+        """Archive the stored entries that changed since they were last archived."""
+        fingerprints: dict[str, dict[str, str]] = {
+            external_id: self._fingerprint(external_id) for external_id in external_ids
+        }
+        changed: list[str] = [
+            external_id
+            for external_id, fingerprint in fingerprints.items()
+            if self._archived_fingerprints.get(external_id) != fingerprint
+        ]
+        if changed and await self._archive.upsert(
+            self.feed_entries[external_id] for external_id in changed
+        ):
+            for external_id in changed:
+                self._archived_fingerprints[external_id] = fingerprints[external_id]
+        for external_id in (
+            self._archived_fingerprints.keys() - self.feed_entries.keys()
+        ):
+            del self._archived_fingerprints[external_id]
+
+    def _keep_stale_entries(self) -> bool:
+        """Return True if the entries are kept after a failed update."""
+        if (
+            self._stale_max_failures is None and self._stale_max_age is None
+        ) or not self._last_update_successful:
+            return False
+        if (
+            self._stale_max_failures is not None
+            and self._failed_updates > self._stale_max_failures
+        ):
+            return False
+        return not (
+            self._stale_max_age is not None
+            and self._last_update - self._last_update_successful > self._stale_max_age
+        )
 
     async def _store_feed_entries(
         self, status: str, feed_entries: list[FeedEntry] | None
     ):
         """Keep a copy of all feed entries for future lookups."""
-        if feed_entries or status == UPDATE_OK_NO_DATA:
+        if feed_entries is not None or status in (
+            UPDATE_OK_NO_DATA,
+            UPDATE_OK_NO_CHANGE,
+        ):
             if status == UPDATE_OK:
-                self.feed_entries = {entry.external_id: entry for entry in feed_entries}
+                entries: dict = {entry.external_id: entry for entry in feed_entries}
+                if self._feed.incremental:
+                    self._merge_feed_entries(entries)
+                else:
+                    self._restored_external_ids.clear()
+                    for external_id in self.feed_entries.keys() - entries.keys():
+                        self._keep_removed_entry(external_id)
+                        self._unindex_feed_entry(external_id)
+                    self.feed_entries = entries
+                for external_id, entry in entries.items():
+                    self._removed_entries.pop(external_id, None)
+                    self._index_feed_entry(external_id, entry)
+            self._evict_feed_entries()
         else:
+            for external_id in self.feed_entries:
+                self._keep_removed_entry(external_id)
             self.feed_entries.clear()
+            self._restored_external_ids.clear()
+            for index in self._indexes():
+                index.clear()
+
+    def _merge_feed_entries(self, entries: dict[str, FeedEntry]):
+        """Merge the entries of a delta into the entries already known.
+
+        Entries that changed so that they do not pass the filter anymore are
+        removed.
+        """
+        for external_id in self._feed.rejected_external_ids:
+            self._restored_external_ids.pop(external_id, None)
+            if external_id in self.feed_entries:
+                self._keep_removed_entry(external_id)
+                del self.feed_entries[external_id]
+                self._unindex_feed_entry(external_id)
+        self.feed_entries.update(entries)
+        for external_id in entries:
+            self._restored_external_ids.pop(external_id, None)
+
+    def _indexes(self) -> tuple[SpatialIndex | SortedIndex, ...]:
+        """Return all indexes over the stored entries."""
+        return (
+            self._spatial_index,
+            self._origin_time_index,
+            self._creation_time_index,
+            self._magnitude_index,
+        )
+
+    def _index_feed_entry(self, external_id: str, entry: FeedEntry):
+        """Add the stored entry to all indexes."""
+        self._spatial_index.add(external_id, entry.coordinates)
+        origin = entry.origin
+        self._origin_time_index.add(external_id, origin.time if origin else None)
+        creation_info = entry.creation_info
+        self._creation_time_index.add(
+            external_id, creation_info.creation_time if creation_info else None
+        )
+        magnitude = entry.magnitude
+        self._magnitude_index.add(external_id, magnitude.mag if magnitude else None)
+
+    def _keep_removed_entry(self, external_id: str):
+        """Keep the entry that is not stored anymore until its entity is removed."""
+        if external_id in self._managed_external_ids:
+            self._removed_entries[external_id] = self.feed_entries[external_id]
+
+    def _unindex_feed_entry(self, external_id: str):
+        """Remove the entry from all indexes."""
+        for index in self._indexes():
+            index.remove(external_id)
+
+    def _evict_feed_entries(self):
+        """Remove entries that are older than the maximum age."""
+        if self._entry_max_age:
+            oldest: datetime = datetime.now(UTC) - self._entry_max_age
+            for external_id in self._origin_time_index.before(oldest):
+                _LOGGER.debug("Evicting entry %s", external_id)
+                self._keep_removed_entry(external_id)
+                del self.feed_entries[external_id]
+                self._unindex_feed_entry(external_id)
+            for external_id, origin_time in list(self._restored_external_ids.items()):
+                if origin_time and origin_time < oldest:
+                    del self._restored_external_ids[external_id]
+
+    def entries_within_radius(
+        self, coordinates: tuple[float, float], radius: float
+    ) -> list[tuple[FeedEntry, float]]:
+        """Return entries within the radius in km, with their distance.
+
+        The result is sorted by distance, nearest first.
+        """
+        return [
+            (self.feed_entries[external_id], distance)
+            for external_id, distance in self._spatial_index.within_radius(
+                coordinates, radius
+            )
+        ]
+
+    def entries_within_bounding_box(
+        self, south_west: tuple[float, float], north_east: tuple[float, float]
+    ) -> list[FeedEntry]:
+        """Return entries inside the box defined by its corners."""
+        return [
+            self.feed_entries[external_id]
+            for external_id in self._spatial_index.within_bounding_box(
+                south_west, north_east
+            )
+        ]
+
+    def entries_by_origin_time(
+        self, start: datetime | None = None, end: datetime | None = None
+    ) -> list[FeedEntry]:
+        """Return entries with an origin time in the range, oldest first."""
+        return [
+            self.feed_entries[external_id]
+            for external_id in self._origin_time_index.between(start, end)
+        ]
+
+    def entries_by_creation_time(
+        self, start: datetime | None = None, end: datetime | None = None
+    ) -> list[FeedEntry]:
+        """Return entries with a creation time in the range, oldest first."""
+        return [
+            self.feed_entries[external_id]
+            for external_id in self._creation_time_index.between(start, end)
+        ]
+
+    def entries_by_magnitude(
+        self, minimum: float | None = None, maximum: float | None = None
+    ) -> list[FeedEntry]:
+        """Return entries with a magnitude in the range, smallest first."""
+        return [
+            self.feed_entries[external_id]
+            for external_id in self._magnitude_index.between(minimum, maximum)
+        ]
+
+    def recent_entries(
+        self, period: timedelta, minimum_magnitude: float | None = None
+    ) -> list[FeedEntry]:
+        """Return entries that occurred within the period, oldest first.
+
+        Optionally only entries with at least the minimum magnitude.
+        """
+        external_ids: list[str] = self._origin_time_index.between(
+            datetime.now(UTC) - period
+        )
+        if minimum_magnitude is not None:
+            magnitude_index: SortedIndex = self._magnitude_index
+            external_ids = [
+                external_id
+                for external_id in external_ids
+                if (magnitude := magnitude_index.value(external_id)) is not None
+                and magnitude >= minimum_magnitude
+            ]
+        return [self.feed_entries[external_id] for external_id in external_ids]
+
+    def nearest_entries(
+        self, coordinates: tuple[float, float], count: int
+    ) -> list[tuple[FeedEntry, float]]:
+        """Return the nearest entries, with their distance in km."""
+        return [
+            (self.feed_entries[external_id], distance)
+            for external_id, distance in self._spatial_index.nearest(coordinates, count)
+        ]
 
     async def _update_feed_create_entries(self, feed_external_ids: set[str]) -> int:
         """Create entities after feed update."""
         create_external_ids = feed_external_ids.difference(self._managed_external_ids)
-        count_created: int = len(create_external_ids)
-        await self._generate_new_entities(create_external_ids)
-        return count_created
+        return await self._generate_new_entities(create_external_ids)
+
+    async def _update_feed_update_entries(
+        self, feed_external_ids: set[str]
+    ) -> tuple[int, int]:
+        """Update entities that have changed after feed update.
+
+        Return the number of changed and unchanged entities.
+        """
+        current_external_ids = self._managed_external_ids.intersection(
+            feed_external_ids
+        )
+        changes: dict[str, tuple[dict[str, str], set[str]]] = {}
+        for external_id in current_external_ids:
+            fingerprint, changed_fields = self._fingerprint_changes(external_id)
+            if changed_fields:
+                changes[external_id] = fingerprint, changed_fields
+        count_updated: int = await self._update_entities(changes)
+        return count_updated, len(current_external_ids) - len(changes)
 
-    async def _update_feed_update_entries(self, feed_external_ids: set[str]) -> int:
-        """Update entities after feed update."""
-        update_external_ids = self._managed_external_ids.intersection(feed_external_ids)
-        count_updated: int = len(update_external_ids)
-        await self._update_entities(update_external_ids)
-        return count_updated
+    def _fingerprint(self, external_id: str) -> dict[str, str]:
+        """Return the digests of the stored entry's fields, see FeedEntry.fingerprint."""
+        return {
+            field: hashlib.blake2b(
+                repr(values).encode(), digest_size=FINGERPRINT_DIGEST_SIZE
+            ).hexdigest()
+            for field, values in self.feed_entries[external_id].fingerprint.items()
+        }
+
+    def _fingerprint_changes(self, external_id: str) -> tuple[dict[str, str], set[str]]:
+        """Return the entry's new fingerprint, and the changed fields."""
+        fingerprint: dict[str, str] = self._fingerprint(external_id)
+        previous: dict[str, str] = self._fingerprints.get(external_id, {})
+        return fingerprint, {
+            field
+            for field, values in fingerprint.items()
+            if previous.get(field) != values
+        }
 
     async def _update_feed_remove_entries(self, feed_external_ids: set[str]) -> int:
         """Remove entities after feed update."""
         remove_external_ids = self._managed_external_ids.difference(feed_external_ids)
-        count_removed: int = len(remove_external_ids)
-        await self._remove_entities(remove_external_ids)
-        return count_removed
+        return await self._remove_entities(remove_external_ids)
 
-    async def _generate_new_entities(self, external_ids: set[str]):
+    async def _generate_new_entities(self, external_ids: set[str]) -> int:
         """Generate new entities for events."""
-        for external_id in external_ids:
-            await self._generate_async_callback(external_id)
+
+        def _generated(external_id: str):
+            """Start managing the generated entity."""
             _LOGGER.debug("New entity added %s", external_id)
             self._managed_external_ids.add(external_id)
+            self._fingerprints[external_id] = self._fingerprint(external_id)
 
-    async def _update_entities(self, external_ids: set[str]):
-        """Update entities."""
-        for external_id in external_ids:
-            _LOGGER.debug("Existing entity found %s", external_id)
-            await self._update_async_callback(external_id)
+        if self._generate_batch_async_callback:
+
+            async def _generate_batch(batch: list[str]):
+                """Generate a batch of entities."""
+                await self._generate_batch_async_callback(self._batch_entries(batch))
+                for external_id in batch:
+                    _generated(external_id)
+
+            return await self._dispatch_batches(
+                "generate", external_ids, _generate_batch
+            )
 
-    async def _remove_entities(self, external_ids: set[str]):
+        async def _generate(external_id: str):
+            """Generate the entity."""
+            await self._generate_async_callback(external_id)
+            _generated(external_id)
+
+        return len(await self._dispatch("generate", external_ids, _generate))
+
+    async def _update_entities(
+        self, changes: dict[str, tuple[dict[str, str], set[str]]]
+    ) -> int:
+        """Update entities, with the names of their changed fields."""
+        if self._update_batch_async_callback:
+
+            async def _update_batch(batch: list[str]):
+                """Update a batch of entities."""
+                if self._changed_fields:
+                    await self._update_batch_async_callback(
+                        self._batch_entries(batch),
+                        {external_id: changes[external_id][1] for external_id in batch},
+                    )
+                else:
+                    await self._update_batch_async_callback(self._batch_entries(batch))
+                for external_id in batch:
+                    self._fingerprints[external_id] = changes[external_id][0]
+
+            return await self._dispatch_batches("update", changes, _update_batch)
+
+        async def _update(external_id: str):
+            """Update the entity, and remember its new fingerprint."""
+            fingerprint, changed_fields = changes[external_id]
+            _LOGGER.debug("Existing entity changed %s: %s", external_id, changed_fields)
+            if self._changed_fields:
+                await self._update_async_callback(external_id, changed_fields)
+            else:
+                await self._update_async_callback(external_id)
+            self._fingerprints[external_id] = fingerprint
+
+        return len(await self._dispatch("update", changes, _update))
+
+    async def _remove_entities(self, external_ids: set[str]) -> int:
         """Remove entities."""
-        for external_id in external_ids:
+
+        def _removed(external_id: str):
+            """Stop managing the removed entity."""
             _LOGGER.debug("Entity not current anymore %s", external_id)
-            self._managed_external_ids.remove(external_id)
+            self._managed_external_ids.discard(external_id)
+            self._fingerprints.pop(external_id, None)
+            self._removed_entries.pop(external_id, None)
+
+        if self._remove_batch_async_callback:
+
+            async def _remove_batch(batch: list[str]):
+                """Remove a batch of entities."""
+                await self._remove_batch_async_callback(self._batch_entries(batch))
+                for external_id in batch:
+                    _removed(external_id)
+
+            return await self._dispatch_batches("remove", external_ids, _remove_batch)
+
+        async def _remove(external_id: str):
+            """Remove the entity."""
             await self._remove_async_callback(external_id)
+            _removed(external_id)
+
+        return len(await self._dispatch("remove", external_ids, _remove))
+
+    def _batch_entries(self, batch: list[str]) -> dict[str, FeedEntry | None]:
+        """Return the entries of the batch.
+
+        Entities being removed get their last stored entry, or None if there
+        never was one, for example for entities restored after a restart.
+        """
+        return {
+            external_id: self.feed_entries.get(external_id)
+            or self._removed_entries.get(external_id)
+            for external_id in batch
+        }
+
+    async def _dispatch_batches(
+        self,
+        action: str,
+        external_ids: Iterable[str],
+        callback: Callable[[list[str]], Awaitable[None]],
+    ) -> int:
+        """Invoke the callback for batches of external ids, and return the successes."""
+        external_ids = list(external_ids)
+        if not external_ids:
+            return 0
+        size: int = self._batch_size or len(external_ids)
+        batches: list[list[str]] = [
+            external_ids[index : index + size]
+            for index in range(0, len(external_ids), size)
+        ]
+        return sum(
+            len(batch) for batch in await self._dispatch(action, batches, callback)
+        )
+
+    async def _dispatch(
+        self,
+        action: str,
+        items: Iterable[T],
+        callback: Callable[[T], Awaitable[None]],
+    ) -> list[T]:
+        """Invoke the callback for each external id or batch, and return the successes.
+
+        Without a concurrency limit, callbacks run one after the other and
+        exceptions are raised. Otherwise callbacks run concurrently, and
+        those failing or timing out are logged and skipped; their entities
+        are then created, updated or removed again in the next update.
+        """
+        if not self._callback_concurrency:
+            succeeded: list[T] = []
+            for item in items:
+                await callback(item)
+                succeeded.append(item)
+            return succeeded
+        items = list(items)
+        semaphore = asyncio.Semaphore(self._callback_concurrency)
+        timeout: float | None = (
+            self._callback_timeout.total_seconds() if self._callback_timeout else None
+        )
+
+        async def _isolated(item: T) -> bool:
+            """Invoke the callback, and return True if it succeeded."""
+            async with semaphore:
+                try:
+                    await asyncio.wait_for(callback(item), timeout)
+                except TimeoutError:
+                    _LOGGER.warning("Callback to %s %s timed out", action, item)
+                    return False
+                except Exception:
+                    _LOGGER.exception("Callback to %s %s failed", action, item)
+                    return False
+                return True
+
+        results: list[bool] = await asyncio.gather(*(_isolated(item) for item in items))
+        return [item for item, result in zip(items, results, strict=True) if result]
 
     async def _status_update(
-        self, status: str, count_created: int, count_updated: int, count_removed: int
+        self,
+        status: str,
+        count_created: int,
+        count_updated: int,
+        count_removed: int,
+        count_unchanged: int = 0,
     ):
         """Provide status update."""
         if self._status_async_callback:
@@ -145,14 +723,44 @@ class QuakeMLFeedManagerBase:
                     count_created,
                     count_updated,
                     count_removed,
+                    interval=self.polling_interval,
+                    stale=self._stale,
+                    unchanged=count_unchanged,
                 )
             )
 
+    @property
+    def feed(self) -> QuakeMLFeed:
+        """Return the managed feed."""
+        return self._feed
+
     @property
     def last_timestamp(self) -> datetime | None:
         """Return the last timestamp extracted from this feed."""
         return self._feed.last_timestamp
 
+    @property
+    def newest_origin_time(self) -> datetime | None:
+        """Return the newest origin time of all stored entries."""
+        return self._origin_time_index.maximum
+
+    @property
+    def newest_creation_time(self) -> datetime | None:
+        """Return the newest creation time of all stored entries."""
+        return self._creation_time_index.maximum
+
+    @property
+    def stale(self) -> bool:
+        """Return True if the entries have been kept after a failed update."""
+        return self._stale
+
+    @property
+    def polling_interval(self) -> timedelta | None:
+        """Return the interval until the next update, if a policy defines it."""
+        if self._polling_policy:
+            return self._polling_policy.interval
+        return None
+
     @property
     def last_update(self) -> datetime | None:
         """Return the last update of this feed."""
@@ -0,0 +1,194 @@
+"""Feed source, sharing fetched and parsed data between feeds."""
+
+from __future__ import annotations
+
+from collections.abc import Awaitable, Callable, Hashable
+from datetime import timedelta
+from functools import partial
+from itertools import count
+import logging
+import time
+from urllib.parse import urlencode
+
+from .consts import (
+    UPDATE_ERROR,
+    UPDATE_OK,
+    UPDATE_OK_NO_CHANGE,
+    UPDATE_OK_NO_DATA,
+    UPDATE_SKIPPED,
+)
+from .single_flight import SingleFlight
+from .xml_parser import EventParameters
+
+_LOGGER = logging.getLogger(__name__)
+
+DEFAULT_SOURCE_MAX_AGE = timedelta(seconds=30)
+# Results of requests that have not been made for this long are discarded.
+SOURCE_RETENTION = timedelta(hours=1)
+
+
+class FetchState:
+    """Validators and payload digest of the last response, per request."""
+
+    __slots__ = ("digest", "validators")
+
+    def __init__(self):
+        """Initialise the fetch state."""
+        # Validators by URL, and query parameters if there are any.
+        self.validators: dict[str, dict[str, str]] = {}
+        self.digest: bytes | None = None
+
+    def reset(self):
+        """Forget the last response, so that the next fetch is a full one."""
+        self.validators.clear()
+        self.digest = None
+
+    @staticmethod
+    def _validators_key(url: str, params: dict | None) -> str:
+        """Return the key of the validators for the request."""
+        if not params:
+            return url
+        # URLs cannot contain spaces, so the key never collides with a URL.
+        return f"{url} {urlencode(sorted(params.items()))}"
+
+    def conditional_headers(self, url: str, params: dict | None) -> dict[str, str]:
+        """Return the headers for a conditional request, if validators exist."""
+        return self.validators.get(self._validators_key(url, params), {})
+
+    def store_validators(
+        self, url: str, params: dict | None, validators: dict[str, str]
+    ):
+        """Keep the validators of the response to the request.
+
+        Validators of requests to the same URL with other parameters, for
+        example with an older updatedafter of an incremental feed, are
+        discarded.
+        """
+        key: str = self._validators_key(url, params)
+        for other_key in [
+            other_key
+            for other_key in self.validators
+            if other_key != key and other_key.split(" ", 1)[0] == url
+        ]:
+            del self.validators[other_key]
+        if validators:
+            self.validators[key] = validators
+        else:
+            self.validators.pop(key, None)
+
+
+class _SharedResult:
+    """Latest result of one request, shared by all feeds making it."""
+
+    __slots__ = ("data", "fetch_state", "fetched_at", "flight", "status", "version")
+
+    def __init__(self):
+        """Initialise the shared result."""
+        self.status: str = UPDATE_OK_NO_DATA
+        self.data: EventParameters | None = None
+        self.version: int = 0
+        self.fetched_at: float | None = None
+        self.fetch_state: FetchState = FetchState()
+        self.flight: SingleFlight[tuple[str, EventParameters | None, int]] = (
+            SingleFlight()
+        )
+
+
+class FeedSource:
+    """Fetch and parse QuakeML data once for all feeds making the same request.
+
+    Feeds are grouped by a key that identifies the request, made up of feed
+    class, URL and request parameters. Concurrent fetches for the same key
+    share a single request, and a result is re-used by all feeds until it is
+    older than the maximum age. Each feed then only creates and filters its
+    own entries from the shared data.
+
+    With a maximum age of zero, only concurrent fetches are coalesced.
+    """
+
+    def __init__(self, max_age: timedelta = DEFAULT_SOURCE_MAX_AGE):
+        """Initialise the feed source."""
+        self._max_age: float = max_age.total_seconds()
+        self._results: dict[Hashable, _SharedResult] = {}
+        # Versions are unique across all keys, so that data fetched for a new
+        # key never has the version of data fetched for another key.
+        self._versions = count(1)
+
+    def __repr__(self):
+        """Return string representation of this source."""
+        return f"<{self.__class__.__name__}(max_age={self._max_age}, requests={len(self._results)})>"
+
+    async def fetch(
+        self,
+        key: Hashable,
+        fetch: Callable[[FetchState], Awaitable[tuple[str, EventParameters | None]]],
+    ) -> tuple[str, EventParameters | None, int]:
+        """Return status, data and version of the latest result for the key.
+
+        The provided function is only called if no recent result exists and
+        no other fetch for the same key is in progress. The version changes
+        whenever new data has been parsed, and is unique across all keys.
+        """
+        shared: _SharedResult | None = self._results.get(key)
+        if shared is None:
+            self._prune()
+            shared = self._results[key] = _SharedResult()
+        if (
+            not shared.flight.running
+            and shared.fetched_at is not None
+            and time.monotonic() - shared.fetched_at < self._max_age
+        ):
+            return shared.status, shared.data, shared.version
+        return await shared.flight.run(partial(self._refresh, shared, fetch))
+
+    async def _refresh(
+        self,
+        shared: _SharedResult,
+        fetch: Callable[[FetchState], Awaitable[tuple[str, EventParameters | None]]],
+    ) -> tuple[str, EventParameters | None, int]:
+        """Fetch new data for the shared result."""
+        status, data = await fetch(shared.fetch_state)
+        self._store(shared, status, data)
+        return shared.status, shared.data, shared.version
+
+    def _store(self, shared: _SharedResult, status: str, data: EventParameters | None):
+        """Store the outcome of a fetch."""
+        if status == UPDATE_SKIPPED:
+            # No request was made, the latest data, if any, is still valid.
+            if shared.data is None:
+                shared.status = UPDATE_SKIPPED
+            return
+        shared.fetched_at = time.monotonic()
+        if status == UPDATE_OK:
+            shared.data = data
+            shared.version = next(self._versions)
+        elif status not in (UPDATE_OK_NO_DATA, UPDATE_OK_NO_CHANGE):
+            # Discard everything after an error, same as a single feed does.
+            shared.data = None
+            shared.fetch_state.reset()
+            shared.status = UPDATE_ERROR
+            return
+        # Unchanged or not modified data is still the latest data.
+        shared.status = UPDATE_OK if shared.data is not None else UPDATE_OK_NO_DATA
+
+    def _prune(self):
+        """Discard results of requests that have not been made for a while."""
+        oldest: float = time.monotonic() - SOURCE_RETENTION.total_seconds()
+        for key in [
+            key
+            for key, shared in self._results.items()
+            if not shared.flight.running
+            and shared.fetched_at is not None
+            and shared.fetched_at < oldest
+        ]:
+            del self._results[key]
+
+    def discard(self, key: Hashable):
+        """Discard the result for the key, for example once it is superseded."""
+        self._results.pop(key, None)
+
+    def invalidate(self, key: Hashable | None = None):
+        """Force the next fetch for the key, or for all keys, to be a new request."""
+        for shared_key, shared in self._results.items():
+            if key is None or key == shared_key:
+                shared.fetched_at = None
@@ -0,0 +1,76 @@
+"""Polling policies, deciding how often a feed is updated."""
+
+from __future__ import annotations
+
+from datetime import timedelta
+import logging
+
+from .consts import UPDATE_OK, UPDATE_OK_NO_CHANGE, UPDATE_OK_NO_DATA
+
+_LOGGER = logging.getLogger(__name__)
+
+DEFAULT_SPEED_UP_FACTOR = 0.5
+DEFAULT_BACK_OFF_FACTOR = 1.5
+
+
+class PollingPolicy:
+    """Polling at a fixed interval."""
+
+    def __init__(self, interval: timedelta):
+        """Initialise the polling policy."""
+        self._interval: timedelta = interval
+
+    def __repr__(self):
+        """Return string representation of this policy."""
+        return f"<{self.__class__.__name__}(interval={self._interval})>"
+
+    @property
+    def interval(self) -> timedelta:
+        """Return the interval until the next update."""
+        return self._interval
+
+    def record(self, status: str, created: int, updated: int, removed: int):
+        """Record the outcome of an update."""
+
+
+class AdaptivePollingPolicy(PollingPolicy):
+    """Polling faster while new events arrive, and slower while quiet.
+
+    After an update that created new entries, the interval is shortened by
+    the speed-up factor. After an update without any new or removed entries,
+    or without new data at all, the interval is extended by the back-off
+    factor. The interval always stays within the minimum and maximum, and
+    remains unchanged after a failed update.
+    """
+
+    def __init__(
+        self,
+        interval: timedelta,
+        minimum_interval: timedelta,
+        maximum_interval: timedelta,
+        *,
+        speed_up_factor: float = DEFAULT_SPEED_UP_FACTOR,
+        back_off_factor: float = DEFAULT_BACK_OFF_FACTOR,
+    ):
+        """Initialise the adaptive polling policy."""
+        super().__init__(interval)
+        self._minimum_interval: timedelta = minimum_interval
+        self._maximum_interval: timedelta = maximum_interval
+        self._speed_up_factor: float = speed_up_factor
+        self._back_off_factor: float = back_off_factor
+        self._interval = self._bounded(interval)
+
+    def _bounded(self, interval: timedelta) -> timedelta:
+        """Return the interval, limited to the minimum and maximum."""
+        return min(max(interval, self._minimum_interval), self._maximum_interval)
+
+    def record(self, status: str, created: int, updated: int, removed: int):
+        """Record the outcome of an update, and adjust the interval."""
+        if status == UPDATE_OK and created:
+            self._interval = self._bounded(self._interval * self._speed_up_factor)
+        elif (status == UPDATE_OK and not removed) or status in (
+            UPDATE_OK_NO_DATA,
+            UPDATE_OK_NO_CHANGE,
+        ):
+            self._interval = self._bounded(self._interval * self._back_off_factor)
+        _LOGGER.debug("Next update in %s", self._interval)
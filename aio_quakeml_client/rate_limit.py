@@ -0,0 +1,205 @@
+"""Per-host rate limiting of requests, shared by many feeds."""
+
+from __future__ import annotations
+
+import asyncio
+from collections.abc import Awaitable, Callable, Mapping
+from datetime import UTC, datetime
+from email.utils import parsedate_to_datetime
+from http import HTTPStatus
+import logging
+import math
+import time
+from urllib.parse import urlsplit
+
+_LOGGER = logging.getLogger(__name__)
+
+DEFAULT_RATE = 1.0
+DEFAULT_BURST = 5
+# X-RateLimit-Reset values above this are epoch timestamps, not delays.
+EPOCH_THRESHOLD = 1_000_000_000
+# Tolerance for rounding errors when counting tokens.
+TOKEN_EPSILON = 1e-9
+
+
+class TokenBucket:
+    """Token bucket for one host, refilled at a constant rate."""
+
+    def __init__(self, rate: float, burst: int, clock: Callable[[], float]):
+        """Initialise a full token bucket."""
+        self._rate: float = rate
+        self._burst: int = burst
+        self._clock: Callable[[], float] = clock
+        self._tokens: float = float(burst)
+        self._updated: float = clock()
+        # Time until which the host asked not to send any requests.
+        self.blocked_until: float | None = None
+        # Requests are served in order of arrival.
+        self.lock: asyncio.Lock = asyncio.Lock()
+
+    def __repr__(self):
+        """Return string representation of this token bucket."""
+        return f"<{self.__class__.__name__}(rate={self._rate}, burst={self._burst}, tokens={self.tokens:.1f})>"
+
+    @property
+    def tokens(self) -> float:
+        """Return the number of tokens currently available."""
+        self._refill()
+        return self._tokens
+
+    def _refill(self):
+        """Add the tokens accumulated since the last refill, but not while blocked."""
+        now: float = self._clock()
+        start: float = max(self._updated, self.blocked_until or self._updated)
+        if now > start:
+            self._tokens = min(
+                float(self._burst), self._tokens + (now - start) * self._rate
+            )
+        self._updated = max(now, self._updated)
+
+    def wait_time(self) -> float:
+        """Return the time in seconds until a request may be made."""
+        now: float = self._clock()
+        if self.blocked_until is not None and self.blocked_until > now:
+            return self.blocked_until - now
+        self._refill()
+        if self._tokens >= 1.0 - TOKEN_EPSILON:
+            return 0.0
+        return (1.0 - self._tokens) / self._rate
+
+    def consume(self):
+        """Take a token for a request."""
+        self._refill()
+        self._tokens -= 1.0
+
+    def drain(self):
+        """Remove all available tokens."""
+        self._refill()
+        self._tokens = min(self._tokens, 0.0)
+
+
+class RateLimiter:
+    """Limit the rate of requests per host, with a token bucket each.
+
+    Requests wait for a token instead of failing, and are served in order
+    of arrival. Responses asking clients to slow down (429 or 503 with
+    Retry-After, or X-RateLimit headers with no requests remaining) stop all
+    requests to the host until the indicated time.
+    """
+
+    def __init__(
+        self,
+        *,
+        rate: float = DEFAULT_RATE,
+        burst: int = DEFAULT_BURST,
+        clock: Callable[[], float] = time.monotonic,
+        sleep: Callable[[float], Awaitable] = asyncio.sleep,
+    ):
+        """Initialise the rate limiter, with the rate in requests per second.
+
+        Clock and sleep can be replaced, for example to run with a fake clock.
+        """
+        self._rate: float = rate
+        self._burst: int = burst
+        self._clock: Callable[[], float] = clock
+        self._sleep: Callable[[float], Awaitable] = sleep
+        self._buckets: dict[str, TokenBucket] = {}
+
+    def __repr__(self):
+        """Return string representation of this rate limiter."""
+        return f"<{self.__class__.__name__}(rate={self._rate}, burst={self._burst}, hosts={len(self._buckets)})>"
+
+    def bucket(self, url: str) -> TokenBucket:
+        """Return the token bucket for the URL's host."""
+        host: str = urlsplit(url).netloc
+        if host not in self._buckets:
+            self._buckets[host] = TokenBucket(self._rate, self._burst, self._clock)
+        return self._buckets[host]
+
+    async def acquire(self, url: str, *, timeout: float | None = None) -> bool:
+        """Wait until a request to the URL may be made.
+
+        Return False instead of waiting if the request may not be made within
+        the timeout in seconds, for example while the host is blocked. Time
+        spent queueing behind earlier requests does not count.
+        """
+        bucket: TokenBucket = self.bucket(url)
+        async with bucket.lock:
+            end: float | None = None if timeout is None else self._clock() + timeout
+            while (delay := bucket.wait_time()) > 0.0:
+                if end is not None and self._clock() + delay > end:
+                    _LOGGER.debug("Unable to request %s within the timeout", url)
+                    return False
+                _LOGGER.debug("Waiting %.1fs before requesting %s", delay, url)
+                await self._sleep(delay)
+            bucket.consume()
+        return True
+
+    def record_response(self, url: str, status: int, headers: Mapping[str, str]):
+        """Honour rate limiting headers of a response from the URL."""
+        delay: float | None = None
+        if status in (HTTPStatus.TOO_MANY_REQUESTS, HTTPStatus.SERVICE_UNAVAILABLE):
+            delay = _parse_retry_after(headers.get("Retry-After"))
+        if delay is None and headers.get("X-RateLimit-Remaining") == "0":
+            delay = _parse_rate_limit_reset(headers.get("X-RateLimit-Reset"))
+        if delay is None and status == HTTPStatus.TOO_MANY_REQUESTS:
+            # Throttled without indication for how long, start over slowly.
+            self.bucket(url).drain()
+        if delay is not None and delay > 0.0:
+            _LOGGER.warning("Rate limited by %s for %.1fs", url, delay)
+            bucket: TokenBucket = self.bucket(url)
+            blocked_until: float = self._clock() + delay
+            bucket.blocked_until = max(bucket.blocked_until or 0.0, blocked_until)
+            bucket.drain()
+
+
+def _parse_retry_after(value: str | None) -> float | None:
+    """Return the delay in seconds of a Retry-After header."""
+    if not value:
+        return None
+    try:
+        delay: float = float(value)
+    except ValueError:
+        pass
+    else:
+        if math.isfinite(delay):
+            return delay
+        _LOGGER.debug("Ignoring Retry-After %s", value)
+        return None
+    try:
+        retry_at: datetime = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        _LOGGER.debug("Unable to parse Retry-After %s", value)
+        return None
+    if retry_at.tzinfo is None:
+        # HTTP dates are always in GMT.
+        retry_at = retry_at.replace(tzinfo=UTC)
+    return (retry_at - datetime.now(UTC)).total_seconds()
+
+
+def _parse_rate_limit_reset(value: str | None) -> float | None:
+    """Return the delay in seconds of an X-RateLimit-Reset header."""
+    if not value:
+        return None
+    try:
+        reset: float = float(value)
+    except ValueError:
+        _LOGGER.debug("Unable to parse X-RateLimit-Reset %s", value)
+        return None
+    if not math.isfinite(reset):
+        _LOGGER.debug("Ignoring X-RateLimit-Reset %s", value)
+        return None
+    if reset > EPOCH_THRESHOLD:
+        return reset - time.time()
+    return reset
+
+
+_shared_rate_limiter: RateLimiter | None = None
+
+
+def shared_rate_limiter() -> RateLimiter:
+    """Return the rate limiter shared by all feeds in this process."""
+    global _shared_rate_limiter  # noqa: PLW0603
+    if _shared_rate_limiter is None:
+        _shared_rate_limiter = RateLimiter()
+    return _shared_rate_limiter
@@ -0,0 +1,172 @@
+"""Retry policy and circuit breakers for fetching data."""
+
+from __future__ import annotations
+
+from collections.abc import Callable
+from datetime import timedelta
+import logging
+import random
+import time
+
+from .consts import CIRCUIT_CLOSED, CIRCUIT_HALF_OPEN, CIRCUIT_OPEN
+
+_LOGGER = logging.getLogger(__name__)
+
+DEFAULT_MAX_ATTEMPTS = 3
+DEFAULT_INITIAL_BACKOFF = timedelta(seconds=1)
+DEFAULT_MAX_BACKOFF = timedelta(seconds=30)
+DEFAULT_BACKOFF_MULTIPLIER = 2.0
+# Maximum deviation from the backoff, as a fraction of the backoff.
+DEFAULT_BACKOFF_JITTER = 0.2
+DEFAULT_DEADLINE = timedelta(seconds=60)
+DEFAULT_FAILURE_THRESHOLD = 5
+DEFAULT_RESET_TIMEOUT = timedelta(seconds=60)
+
+
+class RetryPolicy:
+    """Retry failed requests with exponential backoff and jitter.
+
+    No new attempt is started if it would begin after the deadline, counted
+    from the start of the first attempt.
+    """
+
+    def __init__(
+        self,
+        *,
+        max_attempts: int = DEFAULT_MAX_ATTEMPTS,
+        initial_backoff: timedelta = DEFAULT_INITIAL_BACKOFF,
+        max_backoff: timedelta = DEFAULT_MAX_BACKOFF,
+        multiplier: float = DEFAULT_BACKOFF_MULTIPLIER,
+        jitter: float = DEFAULT_BACKOFF_JITTER,
+        deadline: timedelta = DEFAULT_DEADLINE,
+        rng: random.Random | None = None,
+    ):
+        """Initialise the retry policy."""
+        self.max_attempts: int = max_attempts
+        self._initial_backoff: float = initial_backoff.total_seconds()
+        self._max_backoff: float = max_backoff.total_seconds()
+        self._multiplier: float = multiplier
+        self._jitter: float = jitter
+        self.deadline: float = deadline.total_seconds()
+        self._rng: random.Random = rng or random.Random()
+
+    def __repr__(self):
+        """Return string representation of this policy."""
+        return f"<{self.__class__.__name__}(max_attempts={self.max_attempts}, deadline={self.deadline})>"
+
+    def backoff(self, attempt: int) -> float:
+        """Return the delay in seconds after the provided failed attempt."""
+        delay: float = min(
+            self._max_backoff,
+            self._initial_backoff * self._multiplier ** (attempt - 1),
+        )
+        return delay * (1.0 + self._rng.uniform(-self._jitter, self._jitter))
+
+
+class CircuitBreaker:
+    """Stop requesting data from an upstream that keeps failing.
+
+    After the failure threshold has been reached, the circuit opens and all
+    requests are rejected. Once the reset timeout has passed, a single probe
+    request is let through (half-open); its success closes the circuit, and
+    its failure opens it again.
+    """
+
+    def __init__(
+        self,
+        *,
+        failure_threshold: int = DEFAULT_FAILURE_THRESHOLD,
+        reset_timeout: timedelta = DEFAULT_RESET_TIMEOUT,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        """Initialise the circuit breaker."""
+        self._failure_threshold: int = failure_threshold
+        self._reset_timeout: float = reset_timeout.total_seconds()
+        self._clock: Callable[[], float] = clock
+        self._state: str = CIRCUIT_CLOSED
+        self._failures: int = 0
+        self._opened_at: float | None = None
+        self._probe_started_at: float | None = None
+
+    def __repr__(self):
+        """Return string representation of this circuit breaker."""
+        return f"<{self.__class__.__name__}(state={self._state}, failures={self._failures})>"
+
+    @property
+    def state(self) -> str:
+        """Return the state: closed, open or half-open."""
+        return self._state
+
+    @property
+    def failures(self) -> int:
+        """Return the number of failures in a row."""
+        return self._failures
+
+    def allow_request(self) -> bool:
+        """Return True if a request may be made now."""
+        now: float = self._clock()
+        if self._state == CIRCUIT_OPEN:
+            if now - self._opened_at < self._reset_timeout:
+                return False
+            self._state = CIRCUIT_HALF_OPEN
+        elif self._state == CIRCUIT_CLOSED:
+            return True
+        # Half-open: only one probe at a time, unless the last one got lost.
+        if (
+            self._probe_started_at is not None
+            and now - self._probe_started_at < self._reset_timeout
+        ):
+            return False
+        self._probe_started_at = now
+        return True
+
+    def record_success(self):
+        """Record a successful request, closing the circuit."""
+        self._failures = 0
+        self._state = CIRCUIT_CLOSED
+        self._opened_at = None
+        self._probe_started_at = None
+
+    def record_failure(self):
+        """Record a failed request, opening the circuit if necessary."""
+        self._failures += 1
+        if (
+            self._state == CIRCUIT_HALF_OPEN
+            or self._failures >= self._failure_threshold
+        ):
+            if self._state != CIRCUIT_OPEN:
+                _LOGGER.warning("Opening circuit after %d failures", self._failures)
+            self._state = CIRCUIT_OPEN
+            self._opened_at = self._clock()
+            self._probe_started_at = None
+
+
+class CircuitBreakers:
+    """Circuit breakers per URL, which can be shared by several feeds."""
+
+    def __init__(
+        self,
+        *,
+        failure_threshold: int = DEFAULT_FAILURE_THRESHOLD,
+        reset_timeout: timedelta = DEFAULT_RESET_TIMEOUT,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        """Initialise the circuit breakers."""
+        self._failure_threshold: int = failure_threshold
+        self._reset_timeout: timedelta = reset_timeout
+        self._clock: Callable[[], float] = clock
+        self._breakers: dict[str, CircuitBreaker] = {}
+
+    def __repr__(self):
+        """Return string representation of these circuit breakers."""
+        return f"<{self.__class__.__name__}(urls={len(self._breakers)})>"
+
+    def get(self, url: str) -> CircuitBreaker:
+        """Return the circuit breaker for the URL."""
+        if url not in self._breakers:
+            self._breakers[url] = CircuitBreaker(
+                failure_threshold=self._failure_threshold,
+                reset_timeout=self._reset_timeout,
+                clock=self._clock,
+            )
+        return self._breakers[url]
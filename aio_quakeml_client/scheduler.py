@@ -0,0 +1,240 @@
+"""Scheduler driving the updates of many feed managers."""
+
+from __future__ import annotations
+
+import asyncio
+from collections.abc import Awaitable, Callable
+from datetime import timedelta
+from functools import partial
+import logging
+import random
+import time
+from urllib.parse import urlsplit
+
+from .feed_manager import QuakeMLFeedManagerBase
+
+_LOGGER = logging.getLogger(__name__)
+
+DEFAULT_MAX_CONCURRENCY = 10
+DEFAULT_MAX_CONCURRENCY_PER_HOST = 2
+# Maximum deviation from the interval, as a fraction of the interval.
+DEFAULT_JITTER = 0.1
+
+
+class ScheduledManager:
+    """Feed manager registered with the scheduler, and its statistics.
+
+    Lag is the time between the scheduled start of an update and its actual
+    start, for example while waiting for a free concurrency slot.
+    """
+
+    def __init__(
+        self, manager: QuakeMLFeedManagerBase, interval: float, host: str | None
+    ):
+        """Initialise the scheduled manager."""
+        self.manager: QuakeMLFeedManagerBase = manager
+        self.interval: float = interval
+        self.host: str | None = host
+        self.runs: int = 0
+        self.skipped: int = 0
+        self.failed: int = 0
+        self.last_lag: float | None = None
+        self.max_lag: float = 0.0
+        self.total_lag: float = 0.0
+
+    def __repr__(self):
+        """Return string representation of this scheduled manager."""
+        return f"<{self.__class__.__name__}(manager={self.manager}, interval={self.interval}, runs={self.runs}, skipped={self.skipped})>"
+
+    @property
+    def mean_lag(self) -> float | None:
+        """Return the mean lag in seconds of all updates."""
+        if self.runs:
+            return self.total_lag / self.runs
+        return None
+
+    def record_lag(self, lag: float):
+        """Record the lag of an update that has just started."""
+        self.runs += 1
+        self.last_lag = lag
+        self.total_lag += lag
+        self.max_lag = max(self.max_lag, lag)
+
+
+class FeedScheduler:
+    """Update feed managers periodically.
+
+    Each manager is first updated at a random point within its interval, and
+    every following update is shifted by a random jitter, so that managers
+    with the same interval do not all poll at the same time. The number of
+    concurrent updates is limited overall and per host. A tick is skipped if
+    the previous update of the same manager is still running.
+    """
+
+    def __init__(
+        self,
+        *,
+        max_concurrency: int = DEFAULT_MAX_CONCURRENCY,
+        max_concurrency_per_host: int = DEFAULT_MAX_CONCURRENCY_PER_HOST,
+        jitter: float = DEFAULT_JITTER,
+        clock: Callable[[], float] = time.monotonic,
+        sleep: Callable[[float], Awaitable] = asyncio.sleep,
+        rng: random.Random | None = None,
+    ):
+        """Initialise the scheduler.
+
+        Clock and sleep can be replaced, for example to run with a fake clock.
+        """
+        self._max_concurrency_per_host: int = max_concurrency_per_host
+        self._jitter: float = jitter
+        self._clock: Callable[[], float] = clock
+        self._sleep: Callable[[float], Awaitable] = sleep
+        self._rng: random.Random = rng or random.Random()
+        self._semaphore: asyncio.Semaphore = asyncio.Semaphore(max_concurrency)
+        self._host_semaphores: dict[str, asyncio.Semaphore] = {}
+        self._scheduled: dict[int, ScheduledManager] = {}
+        self._loop_tasks: dict[int, asyncio.Task] = {}
+        self._update_tasks: dict[int, asyncio.Task] = {}
+        self._started: bool = False
+
+    def __repr__(self):
+        """Return string representation of this scheduler."""
+        return f"<{self.__class__.__name__}(managers={len(self._scheduled)}, started={self._started})>"
+
+    def add(
+        self, manager: QuakeMLFeedManagerBase, interval: timedelta | None = None
+    ) -> ScheduledManager:
+        """Register a feed manager to be updated at the provided interval.
+
+        If the manager has a polling policy, its interval is used instead.
+        """
+        url: str | None = manager.feed.url
+        interval = manager.polling_interval or interval
+        if interval is None:
+            raise ValueError(f"No interval defined for {manager}")
+        scheduled = ScheduledManager(
+            manager,
+            interval.total_seconds(),
+            urlsplit(url).hostname if url else None,
+        )
+        self.remove(manager)
+        self._scheduled[id(manager)] = scheduled
+        if self._started:
+            self._start(scheduled)
+        return scheduled
+
+    def remove(self, manager: QuakeMLFeedManagerBase):
+        """Stop updating the feed manager; an update in progress is completed."""
+        self._scheduled.pop(id(manager), None)
+        # An update in progress is kept, so that stop() waits for it.
+        if not self.running(manager):
+            self._update_tasks.pop(id(manager), None)
+        if loop_task := self._loop_tasks.pop(id(manager), None):
+            loop_task.cancel()
+
+    def start(self):
+        """Start updating all registered feed managers."""
+        if not self._started:
+            self._started = True
+            for scheduled in self._scheduled.values():
+                self._start(scheduled)
+
+    async def stop(self):
+        """Stop updating, and wait for all updates in progress to complete."""
+        self._started = False
+        loop_tasks: list[asyncio.Task] = list(self._loop_tasks.values())
+        self._loop_tasks.clear()
+        for loop_task in loop_tasks:
+            loop_task.cancel()
+        await asyncio.gather(
+            *loop_tasks, *self._update_tasks.values(), return_exceptions=True
+        )
+
+    def _start(self, scheduled: ScheduledManager):
+        """Start the loop updating the scheduled manager."""
+        # Random phase, to spread managers across their interval.
+        first_run: float = self._clock() + self._rng.uniform(0.0, scheduled.interval)
+        self._loop_tasks[id(scheduled.manager)] = asyncio.ensure_future(
+            self._loop(scheduled, first_run)
+        )
+
+    def running(self, manager: QuakeMLFeedManagerBase) -> bool:
+        """Return True if an update of the feed manager is in progress."""
+        update_task: asyncio.Task | None = self._update_tasks.get(id(manager))
+        return update_task is not None and not update_task.done()
+
+    def _next_interval(self, scheduled: ScheduledManager) -> float:
+        """Return the time in seconds until the next update, including jitter."""
+        if polling_interval := scheduled.manager.polling_interval:
+            scheduled.interval = polling_interval.total_seconds()
+        return scheduled.interval * (
+            1.0 + self._rng.uniform(-self._jitter, self._jitter)
+        )
+
+    async def _loop(self, scheduled: ScheduledManager, next_run: float):
+        """Trigger updates of the scheduled manager, until cancelled."""
+        while True:
+            await self._sleep(max(0.0, next_run - self._clock()))
+            if self.running(scheduled.manager):
+                _LOGGER.debug("Previous update still running, skipping %s", scheduled)
+                scheduled.skipped += 1
+            else:
+                update_task: asyncio.Task = asyncio.ensure_future(
+                    self._update(scheduled, next_run)
+                )
+                update_task.add_done_callback(
+                    partial(self._update_done, id(scheduled.manager))
+                )
+                self._update_tasks[id(scheduled.manager)] = update_task
+            next_run += self._next_interval(scheduled)
+
+    def _update_done(self, key: int, update_task: asyncio.Task):
+        """Forget the completed update of a manager that has been removed."""
+        if key not in self._scheduled and self._update_tasks.get(key) is update_task:
+            del self._update_tasks[key]
+
+    async def _update(self, scheduled: ScheduledManager, scheduled_time: float):
+        """Update the manager, once concurrency limits allow it.
+
+        The host's slot is acquired first, so that updates waiting for a busy
+        host do not hold on to global slots needed by other hosts.
+        """
+        async with self._host_semaphore(scheduled.host), self._semaphore:
+            scheduled.record_lag(max(0.0, self._clock() - scheduled_time))
+            try:
+                await scheduled.manager.update()
+            except Exception:
+                scheduled.failed += 1
+                _LOGGER.exception("Updating %s failed", scheduled.manager)
+
+    def _host_semaphore(self, host: str | None) -> asyncio.Semaphore:
+        """Return the semaphore limiting concurrent updates for the host."""
+        key: str = host or ""
+        if key not in self._host_semaphores:
+            self._host_semaphores[key] = asyncio.Semaphore(
+                self._max_concurrency_per_host
+            )
+        return self._host_semaphores[key]
+
+    @property
+    def scheduled(self) -> list[ScheduledManager]:
+        """Return all registered feed managers, with their statistics."""
+        return list(self._scheduled.values())
+
+    @property
+    def max_lag(self) -> float:
+        """Return the maximum lag in seconds of all updates."""
+        return max(
+            (scheduled.max_lag for scheduled in self._scheduled.values()), default=0.0
+        )
+
+    @property
+    def mean_lag(self) -> float | None:
+        """Return the mean lag in seconds of all updates."""
+        runs: int = sum(scheduled.runs for scheduled in self._scheduled.values())
+        if runs:
+            return (
+                sum(scheduled.total_lag for scheduled in self._scheduled.values())
+                / runs
+            )
+        return None
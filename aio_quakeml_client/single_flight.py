@@ -0,0 +1,46 @@
+"""Single-flight execution of coroutines."""
+
+from __future__ import annotations
+
+import asyncio
+from collections.abc import Awaitable, Callable
+import logging
+from typing import Generic, TypeVar
+
+_LOGGER = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+
+class SingleFlight(Generic[T]):
+    """Share one in-flight call among all concurrent callers.
+
+    The call runs in its own task, so that a cancelled caller does not
+    cancel the call for everybody else waiting for its result.
+    """
+
+    def __init__(self):
+        """Initialise single-flight execution."""
+        self._task: asyncio.Task[T] | None = None
+
+    def __repr__(self):
+        """Return string representation of this single-flight execution."""
+        return f"<{self.__class__.__name__}(running={self.running})>"
+
+    @property
+    def running(self) -> bool:
+        """Return True if a call is in progress."""
+        return self._task is not None and not self._task.done()
+
+    async def run(self, func: Callable[[], Awaitable[T]]) -> T:
+        """Call the function, or join the call already in progress."""
+        if not self.running:
+            self._task = asyncio.ensure_future(func())
+            self._task.add_done_callback(self._done)
+        return await asyncio.shield(self._task)
+
+    @staticmethod
+    def _done(task: asyncio.Task):
+        """Retrieve the exception, in case all callers have been cancelled."""
+        if not task.cancelled():
+            task.exception()
@@ -0,0 +1,98 @@
+"""Sorted index for range queries over values of entries."""
+
+from __future__ import annotations
+
+from bisect import bisect_left, bisect_right
+from collections.abc import Hashable
+import logging
+from typing import Any
+
+_LOGGER = logging.getLogger(__name__)
+
+
+class SortedIndex:
+    """Keys kept in the order of an associated, comparable value."""
+
+    def __init__(self):
+        """Initialise the sorted index."""
+        # Sorted values, and the keys in the same order.
+        self._values: list[Any] = []
+        self._keys: list[Hashable] = []
+        self._key_values: dict[Hashable, Any] = {}
+
+    def __repr__(self):
+        """Return string representation of this index."""
+        return f"<{self.__class__.__name__}(keys={len(self._keys)})>"
+
+    def __len__(self) -> int:
+        """Return the number of keys in this index."""
+        return len(self._keys)
+
+    def __contains__(self, key: Hashable) -> bool:
+        """Return True if the key is in this index."""
+        return key in self._key_values
+
+    def add(self, key: Hashable, value: Any | None):
+        """Add the key, or move it to its new value.
+
+        Keys without a value are removed from the index.
+        """
+        if value is None:
+            self.remove(key)
+            return
+        if key in self._key_values:
+            if self._key_values[key] == value:
+                return
+            self.remove(key)
+        position: int = bisect_right(self._values, value)
+        self._values.insert(position, value)
+        self._keys.insert(position, key)
+        self._key_values[key] = value
+
+    def remove(self, key: Hashable):
+        """Remove the key, if it exists."""
+        if key not in self._key_values:
+            return
+        value = self._key_values.pop(key)
+        position: int = bisect_left(self._values, value)
+        # Several keys may share the same value.
+        while self._keys[position] != key:
+            position += 1
+        del self._values[position]
+        del self._keys[position]
+
+    def clear(self):
+        """Remove all keys."""
+        self._values.clear()
+        self._keys.clear()
+        self._key_values.clear()
+
+    def value(self, key: Hashable) -> Any | None:
+        """Return the value of the key."""
+        return self._key_values.get(key)
+
+    def between(
+        self, minimum: Any | None = None, maximum: Any | None = None
+    ) -> list[Hashable]:
+        """Return keys with values in the range (inclusive), in ascending order."""
+        start: int = 0 if minimum is None else bisect_left(self._values, minimum)
+        end: int = (
+            len(self._values)
+            if maximum is None
+            else bisect_right(self._values, maximum)
+        )
+        return self._keys[start:end]
+
+    def before(self, value: Any) -> list[Hashable]:
+        """Return keys with values less than the provided value."""
+        return self._keys[: bisect_left(self._values, value)]
+
+    @property
+    def minimum(self) -> Any | None:
+        """Return the smallest value."""
+        return self._values[0] if self._values else None
+
+    @property
+    def maximum(self) -> Any | None:
+        """Return the largest value."""
+        return self._values[-1] if self._values else None
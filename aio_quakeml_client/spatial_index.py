@@ -0,0 +1,187 @@
+"""Spatial index for locating entries by their coordinates."""
+
+from __future__ import annotations
+
+from collections.abc import Hashable, Iterable
+import logging
+from math import floor, pi
+
+from .distance import (
+    EARTH_RADIUS_KM,
+    bounding_box,
+    haversine_distances,
+    in_bounding_box,
+)
+
+_LOGGER = logging.getLogger(__name__)
+
+DEFAULT_CELL_SIZE = 1.0
+# Half the circumference of the earth; no two points are further apart.
+MAX_DISTANCE_KM = pi * EARTH_RADIUS_KM
+
+
+class SpatialIndex:
+    """Grid of latitude/longitude cells, each holding the points inside it.
+
+    Queries only look at the cells overlapping the area of interest, and
+    calculate exact distances for the points in those cells.
+    """
+
+    def __init__(self, cell_size: float = DEFAULT_CELL_SIZE):
+        """Initialise the spatial index, with the cell size in degrees."""
+        self._cell_size: float = cell_size
+        self._rows: int = max(1, round(180.0 / cell_size))
+        self._columns: int = max(1, round(360.0 / cell_size))
+        self._cells: dict[tuple[int, int], dict[Hashable, tuple[float, float]]] = {}
+        self._locations: dict[
+            Hashable, tuple[tuple[int, int], tuple[float, float]]
+        ] = {}
+
+    def __repr__(self):
+        """Return string representation of this index."""
+        return f"<{self.__class__.__name__}(points={len(self._locations)}, cells={len(self._cells)})>"
+
+    def __len__(self) -> int:
+        """Return the number of points in this index."""
+        return len(self._locations)
+
+    def __contains__(self, key: Hashable) -> bool:
+        """Return True if the key is in this index."""
+        return key in self._locations
+
+    def _row(self, latitude: float) -> int:
+        """Return the row of cells containing the latitude."""
+        return min(max(floor((latitude + 90.0) / self._cell_size), 0), self._rows - 1)
+
+    def _column(self, longitude: float) -> int:
+        """Return the column of cells containing the longitude."""
+        return floor((longitude + 180.0) / self._cell_size) % self._columns
+
+    def add(self, key: Hashable, coordinates: tuple[float, float] | None):
+        """Add or move the point with the provided key.
+
+        Points without coordinates are removed from the index.
+        """
+        if coordinates is None:
+            self.remove(key)
+            return
+        location = self._locations.get(key)
+        if location and location[1] == coordinates:
+            return
+        cell: tuple[int, int] = (
+            self._row(coordinates[0]),
+            self._column(coordinates[1]),
+        )
+        if location and location[0] != cell:
+            self.remove(key)
+        self._cells.setdefault(cell, {})[key] = coordinates
+        self._locations[key] = (cell, coordinates)
+
+    def remove(self, key: Hashable):
+        """Remove the point with the provided key, if it exists."""
+        location = self._locations.pop(key, None)
+        if location:
+            cell_points = self._cells[location[0]]
+            del cell_points[key]
+            if not cell_points:
+                del self._cells[location[0]]
+
+    def clear(self):
+        """Remove all points."""
+        self._cells.clear()
+        self._locations.clear()
+
+    def _columns_between(
+        self, min_longitude: float, max_longitude: float
+    ) -> Iterable[int]:
+        """Return all columns overlapping the range of longitudes."""
+        first: int = floor((min_longitude + 180.0) / self._cell_size)
+        last: int = floor((max_longitude + 180.0) / self._cell_size)
+        if last - first + 1 >= self._columns:
+            return range(self._columns)
+        return [column % self._columns for column in range(first, last + 1)]
+
+    def _points(
+        self, rows: Iterable[int], columns: Iterable[int]
+    ) -> Iterable[tuple[Hashable, tuple[float, float]]]:
+        """Return all points in the cells of the provided rows and columns."""
+        cells = self._cells
+        for row in rows:
+            for column in columns:
+                cell_points = cells.get((row, column))
+                if cell_points:
+                    yield from cell_points.items()
+
+    def within_radius(
+        self, coordinates: tuple[float, float], radius: float
+    ) -> list[tuple[Hashable, float]]:
+        """Return keys and distances of all points within the radius in km.
+
+        The result is sorted by distance, nearest first.
+        """
+        box = bounding_box(coordinates, radius)
+        min_latitude, max_latitude, delta_longitude = box
+        if delta_longitude is None:
+            columns: Iterable[int] = range(self._columns)
+        else:
+            columns = self._columns_between(
+                coordinates[1] - delta_longitude, coordinates[1] + delta_longitude
+            )
+        rows = range(self._row(min_latitude), self._row(max_latitude) + 1)
+        keys: list[Hashable] = []
+        points: list[tuple[float, float]] = []
+        for key, point in self._points(rows, columns):
+            if in_bounding_box(box, coordinates[1], point):
+                keys.append(key)
+                points.append(point)
+        matches: list[tuple[Hashable, float]] = [
+            (key, distance)
+            for key, distance in zip(
+                keys, haversine_distances(coordinates, points), strict=True
+            )
+            if distance <= radius
+        ]
+        matches.sort(key=lambda match: match[1])
+        return matches
+
+    def within_bounding_box(
+        self,
+        south_west: tuple[float, float],
+        north_east: tuple[float, float],
+    ) -> list[Hashable]:
+        """Return keys of all points inside the box.
+
+        If the western longitude is greater than the eastern longitude, the
+        box crosses the antimeridian.
+        """
+        min_latitude, west = south_west
+        max_latitude, east = north_east
+        if west > east:
+            # Crossing the antimeridian.
+            east += 360.0
+        rows = range(self._row(min_latitude), self._row(max_latitude) + 1)
+        keys: list[Hashable] = []
+        for key, (latitude, longitude) in self._points(
+            rows, self._columns_between(west, east)
+        ):
+            if longitude < west:
+                # Points east of the antimeridian.
+                longitude += 360.0  # noqa: PLW2901
+            if min_latitude <= latitude <= max_latitude and west <= longitude <= east:
+                keys.append(key)
+        return keys
+
+    def nearest(
+        self, coordinates: tuple[float, float], count: int
+    ) -> list[tuple[Hashable, float]]:
+        """Return keys and distances of the nearest points, nearest first."""
+        if count <= 0 or not self._locations:
+            return []
+        count = min(count, len(self._locations))
+        # Widen the search radius until enough points have been found.
+        radius: float = self._cell_size * EARTH_RADIUS_KM * pi / 180.0
+        while True:
+            matches = self.within_radius(coordinates, radius)
+            if len(matches) >= count or radius >= MAX_DISTANCE_KM:
+                return matches[:count]
+            radius = min(radius * 2, MAX_DISTANCE_KM)
@@ -0,0 +1,129 @@
+"""Stores persisting the state of feed managers across restarts."""
+
+from __future__ import annotations
+
+from abc import ABC, abstractmethod
+import asyncio
+from contextlib import closing
+import json
+import logging
+import os
+from pathlib import Path
+import sqlite3
+
+_LOGGER = logging.getLogger(__name__)
+
+DEFAULT_STATE_KEY = "default"
+
+
+class StateStore(ABC):
+    """Store for the state of a feed manager.
+
+    Errors are logged, so that a broken store never stops updates.
+    """
+
+    @abstractmethod
+    async def load(self) -> dict | None:
+        """Return the stored state, or None if there is none."""
+
+    @abstractmethod
+    async def save(self, state: dict):
+        """Store the state, replacing the previous one."""
+
+
+class JsonFileStateStore(StateStore):
+    """Store the state in a JSON file, replaced atomically on each save."""
+
+    def __init__(self, path: str | os.PathLike):
+        """Initialise the store."""
+        self._path: Path = Path(path)
+
+    def __repr__(self):
+        """Return string representation of this store."""
+        return f"<{self.__class__.__name__}(path={self._path})>"
+
+    async def load(self) -> dict | None:
+        """Return the stored state, or None if there is none."""
+        try:
+            return await asyncio.to_thread(self._read)
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError) as error:
+            _LOGGER.warning("Loading state from %s failed with %s", self._path, error)
+            return None
+
+    def _read(self) -> dict:
+        """Read the state from the file."""
+        with self._path.open(encoding="utf-8") as state_file:
+            return json.load(state_file)
+
+    async def save(self, state: dict):
+        """Store the state, replacing the previous one."""
+        try:
+            await asyncio.to_thread(self._write, state)
+        except (OSError, ValueError) as error:
+            _LOGGER.warning("Saving state to %s failed with %s", self._path, error)
+
+    def _write(self, state: dict):
+        """Write the state to a temporary file, then replace the file."""
+        temporary_path: Path = self._path.with_name(f"{self._path.name}.tmp")
+        with temporary_path.open("w", encoding="utf-8") as state_file:
+            json.dump(state, state_file)
+        temporary_path.replace(self._path)
+
+
+class SqliteStateStore(StateStore):
+    """Store the state in an SQLite database, by key.
+
+    Several managers can share one database, each with its own key.
+    """
+
+    def __init__(self, path: str | os.PathLike, key: str = DEFAULT_STATE_KEY):
+        """Initialise the store."""
+        self._path: str = os.fspath(path)
+        self._key: str = key
+
+    def __repr__(self):
+        """Return string representation of this store."""
+        return f"<{self.__class__.__name__}(path={self._path}, key={self._key})>"
+
+    async def load(self) -> dict | None:
+        """Return the stored state, or None if there is none."""
+        try:
+            return await asyncio.to_thread(self._read)
+        except (sqlite3.Error, ValueError) as error:
+            _LOGGER.warning("Loading state from %s failed with %s", self._path, error)
+            return None
+
+    def _read(self) -> dict | None:
+        """Read the state from the database."""
+        with closing(self._connect()) as connection:
+            row = connection.execute(
+                "SELECT state FROM manager_state WHERE key = ?", (self._key,)
+            ).fetchone()
+        return json.loads(row[0]) if row else None
+
+    async def save(self, state: dict):
+        """Store the state, replacing the previous one."""
+        try:
+            await asyncio.to_thread(self._write, json.dumps(state))
+        except (sqlite3.Error, ValueError) as error:
+            _LOGGER.warning("Saving state to %s failed with %s", self._path, error)
+
+    def _write(self, state: str):
+        """Write the state to the database, in one transaction."""
+        with closing(self._connect()) as connection, connection:
+            connection.execute(
+                "INSERT OR REPLACE INTO manager_state (key, state) VALUES (?, ?)",
+                (self._key, state),
+            )
+
+    def _connect(self):
+        """Open the database, creating the table if necessary."""
+        connection = sqlite3.connect(self._path)
+        with connection:
+            connection.execute(
+                "CREATE TABLE IF NOT EXISTS manager_state "
+                "(key TEXT PRIMARY KEY, state TEXT NOT NULL)"
+            )
+        return connection
@@ -2,7 +2,7 @@
 
 from __future__ import annotations
 
-from datetime import datetime
+from datetime import datetime, timedelta
 
 
 class StatusUpdate:
@@ -18,6 +18,10 @@ class StatusUpdate:
         created: int,
         updated: int,
         removed: int,
+        *,
+        interval: timedelta | None = None,
+        stale: bool = False,
+        unchanged: int = 0,
     ):
         """Initialise this status update."""
         self._status: str = status
@@ -28,6 +32,9 @@ class StatusUpdate:
         self._created: int = created
         self._updated: int = updated
         self._removed: int = removed
+        self._interval: timedelta | None = interval
+        self._stale: bool = stale
+        self._unchanged: int = unchanged
 
     def __repr__(self):
         """Return string representation of this entry."""
@@ -65,10 +72,25 @@ class StatusUpdate:
 
     @property
     def updated(self) -> int:
-        """Return the number of updated entries."""
+        """Return the number of entries that have changed."""
         return self._updated
 
+    @property
+    def unchanged(self) -> int:
+        """Return the number of entries that are still current, but unchanged."""
+        return self._unchanged
+
     @property
     def removed(self) -> int:
         """Return the number of removed entries."""
         return self._removed
+
+    @property
+    def interval(self) -> timedelta | None:
+        """Return the interval until the next update, if a policy defines it."""
+        return self._interval
+
+    @property
+    def stale(self) -> bool:
+        """Return True if the entries are kept from an earlier update."""
+        return self._stale
@@ -2,11 +2,11 @@
 
 from __future__ import annotations
 
-from datetime import datetime
+from collections.abc import Callable
+from datetime import UTC, datetime
+from functools import lru_cache
 import logging
-
-import dateparser
-import xmltodict
+from typing import Any
 
 from ..consts import (
     XML_TAG_CREATIONINFO,
@@ -24,7 +24,11 @@ from ..consts import (
     XML_TAG_TIME,
     XML_TAG_VALUE,
 )
+from .compact_event import CompactEvent
+from .conversion_schema import ConversionSchema
+from .event import Event
 from .event_parameters import EventParameters
+from .incremental_parser import IncrementalXmlParser
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -32,6 +36,7 @@ DEFAULT_NAMESPACES = {
     "http://quakeml.org/xmlns/bed/1.2": None,
     "http://quakeml.org/xmlns/quakeml/1.2": "q",
 }
+DATETIME_CACHE_SIZE = 4096
 KEYS_CHAINS_DATE: list[list[str]] = [
     [
         XML_TAG_Q_QUAKEML,
@@ -94,57 +99,95 @@ KEY_CHAINS_FLOAT: list[list[str]] = [
 ]
 
 
+@lru_cache(maxsize=DATETIME_CACHE_SIZE)
+def _parse_datetime(value: str) -> datetime | None:
+    """Convert the provided value into a timezone-aware datetime in UTC."""
+    try:
+        # QuakeML timestamps are ISO 8601, which covers fractional seconds
+        # and a trailing "Z".
+        timestamp: datetime = datetime.fromisoformat(value)
+    except ValueError:
+        _LOGGER.debug("Falling back to generic date parser for %s", value)
+        # Deferred import: dateparser takes about 400 ms to import, and is
+        # only needed for timestamps which are not ISO 8601.
+        import dateparser  # noqa: PLC0415
+
+        return dateparser.parse(
+            value,
+            settings={"TIMEZONE": "UTC", "RETURN_AS_TIMEZONE_AWARE": True},
+        )
+    if timestamp.tzinfo is None:
+        return timestamp.replace(tzinfo=UTC)
+    return timestamp.astimezone(UTC)
+
+
+DEFAULT_CONVERSION_SCHEMA = ConversionSchema()
+DEFAULT_CONVERSION_SCHEMA.register_all(KEY_CHAINS_FLOAT, float)
+DEFAULT_CONVERSION_SCHEMA.register_all(KEYS_CHAINS_INT, int)
+DEFAULT_CONVERSION_SCHEMA.register_all(KEYS_CHAINS_DATE, _parse_datetime)
+
+
 class XmlParser:
     """Built-in XML parser."""
 
-    def __init__(self, additional_namespaces: dict | None = None):
-        """Initialise the XML parser."""
-        self._namespaces: dict = DEFAULT_NAMESPACES
+    def __init__(
+        self,
+        additional_namespaces: dict | None = None,
+        additional_conversions: dict[tuple[str, ...], Callable[[str], Any]]
+        | None = None,
+        compact: bool = False,
+    ):
+        """Initialise the XML parser.
+
+        In compact mode each event is turned into a CompactEvent as soon as
+        it has been parsed, and its full dict tree is discarded.
+        """
+        self._namespaces: dict = dict(DEFAULT_NAMESPACES)
         if additional_namespaces:
             self._namespaces.update(additional_namespaces)
+        self._schema: ConversionSchema = DEFAULT_CONVERSION_SCHEMA
+        if additional_conversions:
+            self._schema = DEFAULT_CONVERSION_SCHEMA.extend(additional_conversions)
+        self._compact: bool = compact
 
     @staticmethod
     def postprocessor(
-        path: list[str], key: str, value: str
+        path: list[tuple], key: str, value: str
     ) -> tuple[str, str | float | int | datetime]:
-        """Conduct type conversion for selected keys."""
-        try:
-            if XmlParser._is_path_in(path, KEY_CHAINS_FLOAT):
-                return key, float(value)
-            if XmlParser._is_path_in(path, KEYS_CHAINS_INT):
-                return key, int(value)
-            if XmlParser._is_path_in(path, KEYS_CHAINS_DATE):
-                return key, dateparser.parse(
-                    value,
-                    settings={"TIMEZONE": "UTC", "RETURN_AS_TIMEZONE_AWARE": True},
-                )
-        except (ValueError, TypeError) as error:
-            _LOGGER.warning("Unable to process (%s/%s): %s", key, value, error)
-        return key, value
+        """Conduct type conversion for selected keys, using the default schema.
 
-    @staticmethod
-    def _is_path_in(path: list[str], chains: list[list[str]]) -> bool:
-        """Test if the path is in any of the provided chains."""
-        if path and chains:
-            new_path: list = [element[0] for element in path]
-            for chain in chains:
-                if chain == new_path:
-                    return True
-        return False
-
-    def parse(self, xml: str) -> EventParameters | None:
+        Parsers with additional conversions use their own schema instead.
+        """
+        return DEFAULT_CONVERSION_SCHEMA.postprocessor(path, key, value)
+
+    def parse(self, xml: str | bytes | memoryview) -> EventParameters | None:
         """Parse the provided xml."""
+        if xml and self._compact:
+            # Events are compacted one by one, the full tree is never built.
+            return self.incremental().parse(xml)
         if xml:
+            # Deferred import: xmltodict takes about 70 ms to import, as it
+            # pulls in urllib.
+            import xmltodict  # noqa: PLC0415
+
             parsed_dict: dict = xmltodict.parse(
                 xml,
                 process_namespaces=True,
                 namespaces=self._namespaces,
-                postprocessor=XmlParser.postprocessor,
+                postprocessor=self._schema.postprocessor,
             )
             if XML_TAG_Q_QUAKEML in parsed_dict:
                 return XmlParser._create_feed_from_quakeml(parsed_dict)
         return None
 
+    def incremental(self) -> IncrementalXmlParser:
+        """Create an incremental parser for streaming the provided xml."""
+        return IncrementalXmlParser(
+            self._namespaces,
+            self._schema.postprocessor,
+            CompactEvent.from_source if self._compact else Event,
+        )
+
     @staticmethod
     def _create_feed_from_quakeml(parsed_dict: dict) -> EventParameters | None:
         """Create feed from provided RSS data."""
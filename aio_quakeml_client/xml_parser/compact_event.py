@@ -0,0 +1,234 @@
+"""Compact event."""
+
+from __future__ import annotations
+
+from datetime import UTC, datetime
+
+from .event import Event
+
+
+def to_epoch(timestamp: datetime | None) -> float | None:
+    """Convert the provided datetime into seconds since the epoch."""
+    if isinstance(timestamp, datetime):
+        return timestamp.timestamp()
+    return None
+
+
+def from_epoch(epoch: float | None) -> datetime | None:
+    """Convert the provided seconds since the epoch into a datetime in UTC."""
+    if epoch is not None:
+        return datetime.fromtimestamp(epoch, UTC)
+    return None
+
+
+class CompactEvent:
+    """Compact record of an event, holding only the commonly used values.
+
+    Provides the same accessors as Event for these values, so that feed
+    entries work unchanged on top of it.
+    """
+
+    __slots__ = (
+        "agency_id",
+        "author",
+        "creation_time_epoch",
+        "depth",
+        "description_text",
+        "description_type",
+        "evaluation_status",
+        "latitude",
+        "longitude",
+        "mag",
+        "magnitude_type",
+        "public_id",
+        "time_epoch",
+        "type",
+    )
+
+    def __init__(self, event: Event):
+        """Initialise this compact event from a full event."""
+        self.public_id: str | None = event.public_id
+        self.type: str | None = event.type
+        description = event.description
+        self.description_type: str | None = description.type if description else None
+        self.description_text: str | None = description.text if description else None
+        origin = event.origin
+        self.latitude: float | None = origin.latitude if origin else None
+        self.longitude: float | None = origin.longitude if origin else None
+        self.depth: float | None = origin.depth if origin else None
+        self.time_epoch: float | None = to_epoch(origin.time) if origin else None
+        self.evaluation_status: str | None = (
+            origin.evaluation_status if origin else None
+        )
+        magnitude = event.magnitude
+        self.mag: float | None = magnitude.mag if magnitude else None
+        self.magnitude_type: str | None = magnitude.type if magnitude else None
+        creation_info = event.creation_info
+        self.creation_time_epoch: float | None = (
+            to_epoch(creation_info.creation_time) if creation_info else None
+        )
+        self.agency_id: str | None = creation_info.agency_id if creation_info else None
+        self.author: str | None = creation_info.author if creation_info else None
+
+    @classmethod
+    def from_source(cls, source: dict) -> CompactEvent:
+        """Create a compact event from the parsed source of an event."""
+        return cls(Event(source))
+
+    def __repr__(self):
+        """Return string representation of this event."""
+        return f"<{self.__class__.__name__}({self.public_id})>"
+
+    @property
+    def description(self) -> CompactDescription | None:
+        """Event description."""
+        if self.description_type is not None or self.description_text is not None:
+            return CompactDescription(self)
+        return None
+
+    @property
+    def origin(self) -> CompactOrigin | None:
+        """Origin of this event."""
+        if (
+            self.latitude is not None
+            or self.longitude is not None
+            or self.depth is not None
+            or self.time_epoch is not None
+        ):
+            return CompactOrigin(self)
+        return None
+
+    @property
+    def coordinates(self) -> tuple[float, float] | None:
+        """Coordinates (latitude, longitude) of this event."""
+        if self.latitude and self.longitude:
+            return self.latitude, self.longitude
+        return None
+
+    @property
+    def origins(self) -> list[CompactOrigin]:
+        """Origins of this event."""
+        origin = self.origin
+        return [origin] if origin else []
+
+    @property
+    def magnitude(self) -> CompactMagnitude | None:
+        """Magnitude of this event."""
+        if self.mag is not None or self.magnitude_type is not None:
+            return CompactMagnitude(self)
+        return None
+
+    @property
+    def magnitudes(self) -> list[CompactMagnitude]:
+        """Magnitudes of this event."""
+        magnitude = self.magnitude
+        return [magnitude] if magnitude else []
+
+    @property
+    def creation_info(self) -> CompactCreationInfo | None:
+        """Creation info about this event."""
+        if (
+            self.creation_time_epoch is not None
+            or self.agency_id is not None
+            or self.author is not None
+        ):
+            return CompactCreationInfo(self)
+        return None
+
+
+class _CompactView:
+    """View on parts of a compact event."""
+
+    __slots__ = ("_event",)
+
+    def __init__(self, event: CompactEvent):
+        """Initialise this view."""
+        self._event = event
+
+    def __repr__(self):
+        """Return string representation of this view."""
+        return f"<{self.__class__.__name__}({self._event.public_id})>"
+
+
+class CompactDescription(_CompactView):
+    """Description of a compact event."""
+
+    __slots__ = ()
+
+    @property
+    def type(self) -> str | None:
+        """Return description's type."""
+        return self._event.description_type
+
+    @property
+    def text(self) -> str | None:
+        """Return description's text."""
+        return self._event.description_text
+
+
+class CompactOrigin(_CompactView):
+    """Origin of a compact event."""
+
+    __slots__ = ()
+
+    @property
+    def latitude(self) -> float | None:
+        """Return the hypocenter latitude."""
+        return self._event.latitude
+
+    @property
+    def longitude(self) -> float | None:
+        """Return the hypocenter longitude."""
+        return self._event.longitude
+
+    @property
+    def depth(self) -> float | None:
+        """Return depth of hypocenter with respect to the nominal sea level."""
+        return self._event.depth
+
+    @property
+    def time(self) -> datetime | None:
+        """Return focal time."""
+        return from_epoch(self._event.time_epoch)
+
+    @property
+    def evaluation_status(self) -> str | None:
+        """Return status of evaluation."""
+        return self._event.evaluation_status
+
+
+class CompactMagnitude(_CompactView):
+    """Magnitude of a compact event."""
+
+    __slots__ = ()
+
+    @property
+    def mag(self) -> float | None:
+        """Return magnitude value."""
+        return self._event.mag
+
+    @property
+    def type(self) -> str | None:
+        """Return magnitude type."""
+        return self._event.magnitude_type
+
+
+class CompactCreationInfo(_CompactView):
+    """Creation info of a compact event."""
+
+    __slots__ = ()
+
+    @property
+    def agency_id(self) -> str | None:
+        """Return designation of agency that published a resource."""
+        return self._event.agency_id
+
+    @property
+    def author(self) -> str | None:
+        """Return name describing the author of a resource."""
+        return self._event.author
+
+    @property
+    def creation_time(self) -> datetime | None:
+        """Return time of creation of a resource."""
+        return from_epoch(self._event.creation_time_epoch)
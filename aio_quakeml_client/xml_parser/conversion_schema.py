@@ -0,0 +1,67 @@
+"""Conversion schema."""
+
+from __future__ import annotations
+
+from collections.abc import Callable, Iterable
+import logging
+from typing import Any
+
+_LOGGER = logging.getLogger(__name__)
+
+
+class ConversionSchema:
+    """Precompiled mapping of element paths to type conversions."""
+
+    def __init__(
+        self,
+        conversions: dict[tuple[str, ...], Callable[[str], Any]] | None = None,
+    ):
+        """Initialise the conversion schema."""
+        self._conversions: dict[tuple[str, ...], Callable[[str], Any]] = {}
+        # Element names that terminate any of the paths; used to reject the
+        # vast majority of nodes without building their path.
+        self._keys: set[str] = set()
+        if conversions:
+            for path, conversion in conversions.items():
+                self.register(path, conversion)
+
+    def __repr__(self):
+        """Return string representation of this schema."""
+        return f"<{self.__class__.__name__}(paths={len(self._conversions)})>"
+
+    def register(self, path: Iterable[str], conversion: Callable[[str], Any]):
+        """Register a conversion for values found under the provided path."""
+        path = tuple(path)
+        if path:
+            self._conversions[path] = conversion
+            self._keys.add(path[-1])
+
+    def register_all(self, paths: Iterable[Iterable[str]], conversion: Callable):
+        """Register the same conversion for all provided paths."""
+        for path in paths:
+            self.register(path, conversion)
+
+    def extend(
+        self, conversions: dict[tuple[str, ...], Callable[[str], Any]]
+    ) -> ConversionSchema:
+        """Return a new schema with the additional conversions registered."""
+        schema = ConversionSchema(self._conversions)
+        for path, conversion in conversions.items():
+            schema.register(path, conversion)
+        return schema
+
+    def lookup(self, path: list[tuple], key: str) -> Callable[[str], Any] | None:
+        """Return the conversion for the node at the provided path, if any."""
+        if key not in self._keys:
+            return None
+        return self._conversions.get(tuple([element[0] for element in path]))
+
+    def postprocessor(self, path: list[tuple], key: str, value: str) -> tuple[str, Any]:
+        """Conduct type conversion for the node, for use as xmltodict postprocessor."""
+        conversion = self.lookup(path, key)
+        if conversion is not None:
+            try:
+                return key, conversion(value)
+            except (ValueError, TypeError) as error:
+                _LOGGER.warning("Unable to process (%s/%s): %s", key, value, error)
+        return key, value
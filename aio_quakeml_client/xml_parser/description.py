@@ -3,13 +3,15 @@
 from __future__ import annotations
 
 from ..consts import XML_TAG_TEXT
-from .element import Element
+from .element import Element, memoized_property
 
 
 class Description(Element):
     """Event description."""
 
-    @property
+    __slots__ = ()
+
+    @memoized_property
     def text(self) -> str | None:
         """Return description's text."""
         return self.attribute_with_text([XML_TAG_TEXT])
@@ -2,19 +2,48 @@
 
 from __future__ import annotations
 
+from collections.abc import Callable
+from functools import wraps
 import logging
+from typing import Any, TypeVar
 
 from ..consts import XML_ATTR_PUBLICID, XML_CDATA, XML_TAG_TYPE
 
 _LOGGER = logging.getLogger(__name__)
 
+T = TypeVar("T")
+
+
+def memoized_property(func: Callable[[Any], T]) -> property:
+    """Turn the method into a property which is only computed once.
+
+    The source of an element never changes after parsing, so any value
+    derived from it can be kept for subsequent accesses.
+    """
+    name: str = func.__name__
+
+    @wraps(func)
+    def _wrapper(self):
+        cache: dict | None = self._cache
+        if cache is None:
+            cache = self._cache = {}
+        elif name in cache:
+            return cache[name]
+        value = cache[name] = func(self)
+        return value
+
+    return property(_wrapper)
+
 
 class Element:
     """Element."""
 
+    __slots__ = ("_cache", "_source")
+
     def __init__(self, source: dict):
         """Initialise feed."""
         self._source = source
+        self._cache: dict | None = None
 
     def __repr__(self):
         """Return string representation of this feed item."""
@@ -46,12 +75,12 @@ class Element:
             return Element.attribute_in_structure(obj[key], keys) if keys else obj[key]
         return ""
 
-    @property
+    @memoized_property
     def public_id(self) -> str | None:
         """Return the public id of this element."""
         return self.attribute([XML_ATTR_PUBLICID])
 
-    @property
+    @memoized_property
     def type(self) -> str | None:
         """Return element's type."""
         return self.attribute_with_text([XML_TAG_TYPE])
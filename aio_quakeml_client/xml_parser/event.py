@@ -12,7 +12,7 @@ from ..consts import (
 )
 from .creation_info import CreationInfo
 from .description import Description
-from .element import Element
+from .element import Element, memoized_property
 from .magnitude import Magnitude
 from .origin import Origin
 
@@ -22,7 +22,9 @@ _LOGGER = logging.getLogger(__name__)
 class Event(Element):
     """Event."""
 
-    @property
+    __slots__ = ()
+
+    @memoized_property
     def description(self) -> Description | None:
         """Event description."""
         description: dict | None = self.attribute([XML_TAG_DESCRIPTION])
@@ -30,14 +32,14 @@ class Event(Element):
             return Description(description)
         return None
 
-    @property
+    @memoized_property
     def origin(self) -> Origin | None:
         """First defined origin."""
         if self.origins:
             return self.origins[0]
         return None
 
-    @property
+    @memoized_property
     def origins(self) -> list[Origin] | None:
         """Origins defined for this event."""
         origins: dict = self.attribute([XML_TAG_ORIGIN])
@@ -49,14 +51,28 @@ class Event(Element):
                 entries.append(Origin(origins))
         return entries
 
-    @property
+    @memoized_property
+    def coordinates(self) -> tuple[float, float] | None:
+        """Coordinates (latitude, longitude) of the first origin."""
+        origin: Origin | None = self.origin
+        if origin and origin.latitude and origin.longitude:
+            return origin.latitude, origin.longitude
+        return None
+
+    @memoized_property
+    def mag(self) -> float | None:
+        """Value of the first magnitude."""
+        magnitude: Magnitude | None = self.magnitude
+        return magnitude.mag if magnitude else None
+
+    @memoized_property
     def magnitude(self) -> Magnitude | None:
         """First defined magnitude."""
         if self.magnitudes:
             return self.magnitudes[0]
         return None
 
-    @property
+    @memoized_property
     def magnitudes(self) -> list[Magnitude] | None:
         """Magnitudes defined for this event."""
         magnitudes: dict | None = self.attribute([XML_TAG_MAGNITUDE])
@@ -68,7 +84,7 @@ class Event(Element):
                 entries.append(Magnitude(magnitudes))
         return entries
 
-    @property
+    @memoized_property
     def creation_info(self) -> CreationInfo | None:
         """Creation info about this event."""
         creation_info: dict | None = self.attribute([XML_TAG_CREATIONINFO])
@@ -5,7 +5,7 @@ from __future__ import annotations
 import logging
 
 from ..consts import XML_TAG_EVENT
-from .element import Element
+from .element import Element, memoized_property
 from .event import Event
 
 _LOGGER = logging.getLogger(__name__)
@@ -14,7 +14,15 @@ _LOGGER = logging.getLogger(__name__)
 class EventParameters(Element):
     """Represents event parameters."""
 
-    @property
+    __slots__ = ()
+
+    def __init__(self, source: dict, events: list | None = None):
+        """Initialise event parameters, optionally with already parsed events."""
+        super().__init__(source)
+        if events is not None:
+            self._cache = {"events": events}
+
+    @memoized_property
     def events(self) -> list[Event]:
         """Return the events of this feed."""
         items: dict | None = self.attribute([XML_TAG_EVENT])
@@ -0,0 +1,219 @@
+"""Incremental XML parser."""
+
+from __future__ import annotations
+
+from collections.abc import Callable
+import logging
+from pyexpat import ParserCreate
+from typing import Any
+
+from ..consts import XML_TAG_EVENT, XML_TAG_EVENTPARAMETERS, XML_TAG_Q_QUAKEML
+from .event import Event
+from .event_parameters import EventParameters
+
+_LOGGER = logging.getLogger(__name__)
+
+# Depth of <eventParameters> elements: q:quakeml > eventParameters
+EVENT_PARAMETERS_DEPTH = 2
+# Depth of <event> elements: q:quakeml > eventParameters > event
+EVENT_ITEM_DEPTH = 3
+NAMESPACE_SEPARATOR = ":"
+
+
+class IncrementalXmlParser:
+    """Parse QuakeML data chunk by chunk, emitting each complete event."""
+
+    def __init__(
+        self,
+        namespaces: dict,
+        postprocessor: Callable | None = None,
+        event_factory: Callable[[dict], Any] = Event,
+    ):
+        """Initialise the incremental XML parser.
+
+        Elements are converted into dicts with the same structure that
+        xmltodict produces for a full parse, so that streamed events are
+        identical to parsed ones.
+        """
+        self._namespaces: dict = namespaces
+        self._postprocessor: Callable | None = postprocessor
+        self._event_factory: Callable[[dict], Any] = event_factory
+        self._events: list[Event] = []
+        self._event_parameters_source: dict | None = None
+        self._event_parameters: EventParameters | None = None
+        # Names and attributes of all open elements.
+        self._path: list[tuple[str, dict | None]] = []
+        # Items and text of the enclosing elements inside <eventParameters>.
+        self._stack: list[tuple[dict | None, list[str]]] = []
+        self._item: dict | None = None
+        self._data: list[str] = []
+        self._namespace_declarations: dict[str, str] = {}
+        self._parser = ParserCreate(None, NAMESPACE_SEPARATOR)
+        self._parser.ordered_attributes = True
+        self._parser.buffer_text = True
+        self._parser.StartNamespaceDeclHandler = self._start_namespace_declaration
+        self._parser.StartElementHandler = self._start_element
+        self._parser.EndElementHandler = self._end_element
+        self._parser.CharacterDataHandler = self._characters
+        self._parser.EntityDeclHandler = self._forbid_entities
+
+    @staticmethod
+    def _forbid_entities(*args, **kwargs):
+        """Reject entity declarations, same as xmltodict does by default."""
+        raise ValueError("entities are disabled")
+
+    def _build_name(self, full_name: str) -> str:
+        """Replace the namespace of the name by its short name, if any."""
+        namespace, separator, name = full_name.rpartition(NAMESPACE_SEPARATOR)
+        if not separator:
+            return full_name
+        short_namespace: str | None = self._namespaces.get(namespace, namespace)
+        if not short_namespace:
+            return name
+        return f"{short_namespace}{NAMESPACE_SEPARATOR}{name}"
+
+    def _postprocess(self, key: str, value: Any) -> tuple[str, Any] | None:
+        """Convert the value, same as for a full parse."""
+        if self._postprocessor:
+            return self._postprocessor(self._path, key, value)
+        return key, value
+
+    def _start_namespace_declaration(self, prefix: str | None, uri: str):
+        """Keep the namespace declaration for the next element."""
+        self._namespace_declarations[prefix or ""] = uri
+
+    def _start_element(self, full_name: str, attributes: list[str]):
+        """Open an element, and start a new item inside event parameters."""
+        attrs: dict = dict(zip(attributes[0::2], attributes[1::2], strict=True))
+        if self._namespace_declarations:
+            attrs["xmlns"] = self._namespace_declarations
+            self._namespace_declarations = {}
+        self._path.append((self._build_name(full_name), attrs or None))
+        depth: int = len(self._path)
+        if depth >= EVENT_PARAMETERS_DEPTH:
+            self._stack.append((self._item, self._data))
+            item: dict = {}
+            for key, value in attrs.items():
+                if entry := self._postprocess(f"@{self._build_name(key)}", value):
+                    item[entry[0]] = entry[1]
+            # The event parameters item is shared with their source, so it
+            # always exists.
+            self._item = item if depth == EVENT_PARAMETERS_DEPTH else item or None
+            self._data = []
+
+    def _end_element(self, full_name: str):
+        """Close an element, and add its item to the enclosing one."""
+        depth: int = len(self._path)
+        if depth == EVENT_PARAMETERS_DEPTH:
+            self._event_parameters_callback(self._path, self._item)
+            self._item, self._data = self._stack.pop()
+        elif depth == EVENT_ITEM_DEPTH and self._is_event(self._path):
+            item: dict | str | None = self._item
+            if item is None:
+                item = "".join(self._data) or None
+            self._item, self._data = self._stack.pop()
+            self._item_callback(item)
+        elif depth > EVENT_PARAMETERS_DEPTH:
+            data: str | None = "".join(self._data).strip() or None
+            item = self._item
+            self._item, self._data = self._stack.pop()
+            if item is not None:
+                if data:
+                    item = self._push(item, "#text", data)
+                self._item = self._push(self._item, self._build_name(full_name), item)
+            else:
+                self._item = self._push(self._item, self._build_name(full_name), data)
+        self._path.pop()
+
+    def _characters(self, data: str):
+        """Collect text inside events, text between events is irrelevant."""
+        if len(self._path) >= EVENT_ITEM_DEPTH:
+            self._data.append(data)
+
+    def _push(self, item: dict | None, key: str, data: Any) -> dict | None:
+        """Add the value to the item, turning repeated keys into lists."""
+        entry = self._postprocess(key, data)
+        if entry is None:
+            return item
+        key, data = entry
+        if item is None:
+            item = {}
+        if key not in item:
+            item[key] = data
+        elif isinstance(item[key], list):
+            item[key].append(data)
+        else:
+            item[key] = [item[key], data]
+        return item
+
+    @staticmethod
+    def _is_event_parameters(path: list) -> bool:
+        """Return True if the path is the one of the <eventParameters> element."""
+        return [name for name, _ in path[:EVENT_PARAMETERS_DEPTH]] == [
+            XML_TAG_Q_QUAKEML,
+            XML_TAG_EVENTPARAMETERS,
+        ]
+
+    @staticmethod
+    def _is_event(path: list) -> bool:
+        """Return True if the path is the one of an <event> element."""
+        return (
+            IncrementalXmlParser._is_event_parameters(path)
+            and path[EVENT_ITEM_DEPTH - 1][0] == XML_TAG_EVENT
+        )
+
+    def _start_event_parameters(self, source: dict):
+        """Create the event parameters, events are collected separately."""
+        if self._event_parameters_source is None:
+            # Elements other than events are added to the source as they
+            # are parsed.
+            self._event_parameters_source = source
+            self._event_parameters = EventParameters(source)
+
+    def _event_parameters_callback(self, path: list, item: dict):
+        """Keep the attributes and other elements of <eventParameters>."""
+        if not self._is_event_parameters(path):
+            _LOGGER.debug("Skipping unexpected element %s", path)
+            return
+        self._start_event_parameters(item)
+
+    def _item_callback(self, item: dict | str | None):
+        """Collect a completed event."""
+        # The enclosing <eventParameters> item is the current one again.
+        self._start_event_parameters(self._item)
+        if item:
+            self._events.append(self._event_factory(item))
+
+    def feed(self, data: bytes | memoryview | str) -> list[Event]:
+        """Parse the next chunk of data and return all events completed by it."""
+        self._parser.Parse(data, False)
+        return self._drain()
+
+    def close(self) -> list[Event]:
+        """Finish parsing and return any remaining events."""
+        self._parser.Parse(b"", True)
+        return self._drain()
+
+    def parse(self, data: bytes | memoryview | str) -> EventParameters | None:
+        """Parse the complete data and return event parameters with all events.
+
+        Return None if the data is not QuakeML with event parameters.
+        """
+        events: list = self.feed(data) + self.close()
+        if self._event_parameters_source is None:
+            _LOGGER.warning(
+                "Invalid structure: Missing element %s", XML_TAG_EVENTPARAMETERS
+            )
+            return None
+        return EventParameters(self._event_parameters_source, events)
+
+    def _drain(self) -> list[Event]:
+        """Hand over collected events, without keeping a reference to them."""
+        events: list[Event] = self._events
+        self._events = []
+        return events
+
+    @property
+    def event_parameters(self) -> EventParameters | None:
+        """Return the event parameters (without any events) seen so far."""
+        return self._event_parameters
@@ -3,13 +3,15 @@
 from __future__ import annotations
 
 from ..consts import XML_TAG_MAG, XML_TAG_STATIONCOUNT, XML_TAG_VALUE
-from .element import Element
+from .element import Element, memoized_property
 
 
 class Magnitude(Element):
     """Event magnitude."""
 
-    @property
+    __slots__ = ()
+
+    @memoized_property
     def mag(self) -> float | None:
         """Return magnitude value."""
         time: dict | None = self.attribute([XML_TAG_MAG])
@@ -17,7 +19,7 @@ class Magnitude(Element):
             return time.get(XML_TAG_VALUE)
         return None
 
-    @property
+    @memoized_property
     def station_count(self) -> int | None:
         """Return number of used stations for this magnitude computation."""
         return self.attribute_with_text([XML_TAG_STATIONCOUNT])
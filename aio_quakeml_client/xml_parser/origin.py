@@ -14,13 +14,15 @@ from ..consts import (
     XML_TAG_TIME,
     XML_TAG_VALUE,
 )
-from .element import Element
+from .element import Element, memoized_property
 
 
 class Origin(Element):
     """Focal time and geographical location of an earthquake hypocenter."""
 
-    @property
+    __slots__ = ()
+
+    @memoized_property
     def latitude(self) -> float | None:
         """Return the hypocenter latitude."""
         latitude: dict | None = self.attribute([XML_TAG_LATITUDE])
@@ -28,7 +30,7 @@ class Origin(Element):
             return latitude.get(XML_TAG_VALUE)
         return None
 
-    @property
+    @memoized_property
     def longitude(self) -> float | None:
         """Return the hypocenter longitude."""
         longitude: dict | None = self.attribute([XML_TAG_LONGITUDE])
@@ -36,7 +38,7 @@ class Origin(Element):
             return longitude.get(XML_TAG_VALUE)
         return None
 
-    @property
+    @memoized_property
     def depth(self) -> float | None:
         """Return depth of hypocenter with respect to the nominal sea level."""
         depth: dict | None = self.attribute([XML_TAG_DEPTH])
@@ -44,12 +46,12 @@ class Origin(Element):
             return depth.get(XML_TAG_VALUE)
         return None
 
-    @property
+    @memoized_property
     def depth_type(self) -> str | None:
         """Return type of depth determination."""
         return self.attribute([XML_TAG_DEPTHTYPE])
 
-    @property
+    @memoized_property
     def time(self) -> datetime | None:
         """Return focal time."""
         time: dict | None = self.attribute([XML_TAG_TIME])
@@ -57,12 +59,12 @@ class Origin(Element):
             return time.get(XML_TAG_VALUE)
         return None
 
-    @property
+    @memoized_property
     def evaluation_mode(self) -> str | None:
         """Return mode of evaluation ."""
         return self.attribute_with_text([XML_TAG_EVALUATIONMODE])
 
-    @property
+    @memoized_property
     def evaluation_status(self) -> str | None:
         """Return status of evaluation ."""
         return self.attribute_with_text([XML_TAG_EVALUATIONSTATUS])
@@ -0,0 +1,100 @@
+"""Benchmark writing to and querying the event archive as it grows.
+
+Run with: python -m benchmarks.bench_archive
+"""
+
+import asyncio
+from datetime import UTC, datetime
+import random
+import statistics
+import tempfile
+import time
+
+from aio_quakeml_client.archive import EventArchive
+from aio_quakeml_client.xml_parser import XmlParser
+from benchmarks.utils import generate_catalog
+from tests import MockFeedEntry
+
+ROWS = 1_000_000
+BATCH_SIZE = 5000
+REPORT_EVERY = 100_000
+QUERY_ROUNDS = 5
+HOME_COORDINATES = (-31.0, 151.0)
+START_EPOCH = 1_600_000_000.0
+
+
+def _scatter(events: list, rng: random.Random, batch: int):
+    """Give the events new ids, and random coordinates, magnitudes and times."""
+    for index, event in enumerate(events):
+        event.public_id = f"event-{batch}-{index}"
+        event.latitude = rng.uniform(-90.0, 90.0)
+        event.longitude = rng.uniform(-180.0, 180.0)
+        event.mag = rng.uniform(0.0, 7.0)
+        event.time_epoch = START_EPOCH + rng.uniform(0.0, 365.0 * 86400.0)
+
+
+async def _best(query) -> tuple[float, int]:
+    """Return the best time of all rounds, and the number of results."""
+    timings = []
+    for _ in range(QUERY_ROUNDS):
+        start = time.perf_counter()
+        result = await query()
+        timings.append(time.perf_counter() - start)
+    return min(timings), len(result)
+
+
+async def _queries(archive: EventArchive):
+    """Print the timings of the queries."""
+    start = datetime.fromtimestamp(START_EPOCH + 100 * 86400.0, UTC)
+    end = datetime.fromtimestamp(START_EPOCH + 101 * 86400.0, UTC)
+    for name, query in (
+        ("1 day", lambda: archive.events_by_origin_time(start, end)),
+        ("mag >= 6.9", lambda: archive.events_by_magnitude(6.9)),
+        (
+            "20x20 box",
+            lambda: archive.events_within_bounding_box((-40.0, 140.0), (-20.0, 160.0)),
+        ),
+        (
+            "antimeridian",
+            lambda: archive.events_within_bounding_box((-20.0, 175.0), (-10.0, -175.0)),
+        ),
+        ("300 km", lambda: archive.events_within_radius(HOME_COORDINATES, 300.0)),
+    ):
+        best, results = await _best(query)
+        print(f"  {name:>12}: {best * 1000:8.2f} ms, {results} events")
+
+
+async def _run(path: str):
+    """Fill the archive in batches, reporting latencies as it grows."""
+    rng = random.Random(0)
+    events = XmlParser(compact=True).parse(generate_catalog(BATCH_SIZE)).events
+    entries = [MockFeedEntry(HOME_COORDINATES, event) for event in events]
+    archive = EventArchive(path)
+    latencies: list[float] = []
+    print(f"{ROWS} rows in batches of {BATCH_SIZE}")
+    for batch in range(ROWS // BATCH_SIZE):
+        _scatter(events, rng, batch)
+        start = time.perf_counter()
+        await archive.upsert(entries)
+        latencies.append(time.perf_counter() - start)
+        rows = (batch + 1) * BATCH_SIZE
+        if rows % REPORT_EVERY == 0:
+            latencies.sort()
+            print(
+                f"{rows:>9} rows: batch p50 {statistics.median(latencies) * 1000:7.2f}"
+                f" ms, p99 {latencies[int(len(latencies) * 0.99)] * 1000:7.2f} ms,"
+                f" max {latencies[-1] * 1000:7.2f} ms"
+            )
+            latencies.clear()
+            await _queries(archive)
+    await archive.close()
+
+
+def main():
+    """Run benchmark."""
+    with tempfile.TemporaryDirectory() as directory:
+        asyncio.run(_run(f"{directory}/archive.db"))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,45 @@
+"""Benchmark memory retained by feed entries with and without compact events.
+
+Run with: python -m benchmarks.bench_compact_events
+"""
+
+import gc
+import tracemalloc
+
+from aio_quakeml_client.xml_parser import XmlParser
+from benchmarks.utils import generate_catalog
+from tests import MockFeedEntry
+
+EVENTS = 10000
+HOME_COORDINATES = (-31.0, 151.0)
+
+
+def _measure(xml: bytes, compact: bool) -> tuple[int, int]:
+    """Return retained and peak memory of the entries built from the xml."""
+    gc.collect()
+    tracemalloc.start()
+    entries = [
+        MockFeedEntry(HOME_COORDINATES, event)
+        for event in XmlParser(compact=compact).parse(xml).events
+    ]
+    gc.collect()
+    retained, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    assert len(entries) == EVENTS
+    return retained, peak
+
+
+def main():
+    """Run benchmark."""
+    xml = generate_catalog(EVENTS).encode("utf-8")
+    print(f"Document size: {len(xml) / 1024 / 1024:.1f} MiB, {EVENTS} events")
+    for name, compact in (("full", False), ("compact", True)):
+        retained, peak = _measure(xml, compact)
+        print(
+            f"{name:>8}: retained {retained / 1024 / 1024:7.1f} MiB, "
+            f"peak {peak / 1024 / 1024:7.1f} MiB"
+        )
+
+
+if __name__ == "__main__":
+    main()
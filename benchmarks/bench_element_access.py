@@ -0,0 +1,65 @@
+"""Benchmark attribute access on feed entries for filtering and diffing.
+
+Run with: python -m benchmarks.bench_element_access
+"""
+
+from functools import partial
+import timeit
+
+from aio_quakeml_client.xml_parser import XmlParser
+from benchmarks.utils import generate_catalog
+from tests import MockFeedEntry
+
+EVENTS = 5000
+HOME_COORDINATES = (-31.0, 151.0)
+REPEAT = 5
+
+
+def _filter_pass(entries):
+    """Access attributes like the feed's filter does."""
+    for entry in entries:
+        if entry.coordinates is not None:
+            _ = entry.distance_to_home
+        _ = entry.magnitude and entry.magnitude.mag
+
+
+def _diff_pass(entries):
+    """Access attributes like the feed manager does when diffing."""
+    return {entry.external_id for entry in entries}
+
+
+def main():
+    """Run benchmark."""
+    xml = generate_catalog(EVENTS)
+    parser = XmlParser()
+
+    def _entries():
+        return [
+            MockFeedEntry(HOME_COORDINATES, event) for event in parser.parse(xml).events
+        ]
+
+    print(f"{EVENTS} entries")
+    for name, function in (("filter", _filter_pass), ("diff", _diff_pass)):
+        # Without memoization, every pass cost as much as the first one.
+        first = min(
+            timeit.repeat(
+                "function(entries)",
+                setup="entries = _entries()",
+                number=1,
+                repeat=REPEAT,
+                globals={"function": function, "_entries": _entries},
+            )
+        )
+        entries = _entries()
+        function(entries)
+        repeated = min(
+            timeit.repeat(partial(function, entries), number=1, repeat=REPEAT)
+        )
+        print(
+            f"{name:>6}: first pass {first * 1e6 / EVENTS:6.2f} us per entry, "
+            f"repeated pass {repeated * 1e6 / EVENTS:6.2f} us per entry"
+        )
+
+
+if __name__ == "__main__":
+    main()
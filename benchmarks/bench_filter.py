@@ -0,0 +1,98 @@
+"""Benchmark filtering entries of a global catalog by distance and magnitude.
+
+Run with: python -m benchmarks.bench_filter
+"""
+
+import random
+import re
+import time
+
+from haversine import haversine
+
+from aio_quakeml_client.distance import haversine_distances
+from aio_quakeml_client.xml_parser import XmlParser
+from benchmarks.utils import generate_catalog
+from tests import MockFeedEntry, MockQuakeMLFeed
+
+EVENTS = 20000
+ROUNDS = 5
+HOME_COORDINATES = (-31.0, 151.0)
+FILTER_RADIUS = 2000.0
+FILTER_MINIMUM_MAGNITUDE = 2.5
+VALUE_PATTERN = re.compile(
+    r"(<(latitude|longitude|mag)>\s*<value>)[^<]*(</value>)", re.DOTALL
+)
+
+
+def _scatter(xml: str) -> str:
+    """Spread the events of the catalog randomly across the globe."""
+    rng = random.Random(0)
+    ranges = {"latitude": (-90.0, 90.0), "longitude": (-180.0, 180.0), "mag": (0, 7)}
+
+    def _replace(match: re.Match) -> str:
+        value = rng.uniform(*ranges[match.group(2)])
+        return f"{match.group(1)}{value:.4f}{match.group(3)}"
+
+    return VALUE_PATTERN.sub(_replace, xml)
+
+
+def _legacy_filter(entries: list[MockFeedEntry]) -> list[MockFeedEntry]:
+    """Filter entries in three passes, with one haversine call per entry."""
+    entries = [entry for entry in entries if entry.coordinates is not None]
+    entries = [
+        entry
+        for entry in entries
+        if haversine(entry.coordinates, HOME_COORDINATES) <= FILTER_RADIUS
+    ]
+    return [
+        entry
+        for entry in entries
+        if entry.magnitude
+        and entry.magnitude.mag
+        and entry.magnitude.mag >= FILTER_MINIMUM_MAGNITUDE
+    ]
+
+
+def _best(events: list, filter_entries) -> tuple[float, int]:
+    """Return the best time of all rounds, and the number of matching entries."""
+    timings = []
+    for _ in range(ROUNDS):
+        entries = [MockFeedEntry(HOME_COORDINATES, event) for event in events]
+        start = time.perf_counter()
+        result = filter_entries(entries)
+        timings.append(time.perf_counter() - start)
+    return min(timings), len(result)
+
+
+def main():
+    """Run benchmark."""
+    xml = _scatter(generate_catalog(EVENTS))
+    feed = MockQuakeMLFeed(
+        None,
+        HOME_COORDINATES,
+        filter_radius=FILTER_RADIUS,
+        filter_minimum_magnitude=FILTER_MINIMUM_MAGNITUDE,
+    )
+    print(f"{EVENTS} events, radius {FILTER_RADIUS} km")
+    for compact in (False, True):
+        events = XmlParser(compact=compact).parse(xml).events
+        print("compact events:" if compact else "full events:")
+        for name, filter_entries in (
+            ("legacy", _legacy_filter),
+            ("batched", feed._filter_entries),  # noqa: SLF001
+        ):
+            best, matches = _best(events, filter_entries)
+            print(f"{name:>8}: {best * 1000:7.2f} ms, {matches} entries")
+    # Distance calculation only, without extracting values from the events.
+    coordinates = [(event.origin.latitude, event.origin.longitude) for event in events]
+    start = time.perf_counter()
+    for point in coordinates:
+        haversine(point, HOME_COORDINATES)
+    print(f"haversine per point: {(time.perf_counter() - start) * 1000:7.2f} ms")
+    start = time.perf_counter()
+    haversine_distances(HOME_COORDINATES, coordinates)
+    print(f"haversine batched:   {(time.perf_counter() - start) * 1000:7.2f} ms")
+
+
+if __name__ == "__main__":
+    main()
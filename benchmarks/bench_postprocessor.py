@@ -0,0 +1,84 @@
+"""Benchmark the per-node cost of the XML postprocessor.
+
+Run with: python -m benchmarks.bench_postprocessor
+"""
+
+import timeit
+
+import xmltodict
+
+from aio_quakeml_client.xml_parser import (
+    DEFAULT_CONVERSION_SCHEMA,
+    DEFAULT_NAMESPACES,
+    KEY_CHAINS_FLOAT,
+    KEYS_CHAINS_DATE,
+    KEYS_CHAINS_INT,
+)
+from benchmarks.utils import generate_catalog
+
+EVENTS = 1000
+REPEAT = 5
+
+
+def _is_path_in(path, chains) -> bool:
+    """Scan all chains, as the postprocessor used to do."""
+    if path and chains:
+        new_path = [element[0] for element in path]
+        for chain in chains:
+            if chain == new_path:
+                return True
+    return False
+
+
+def scanning_postprocessor(path, key, value):
+    """Scan all key chains for every node, as a reference implementation."""
+    if _is_path_in(path, KEY_CHAINS_FLOAT):
+        return key, float(value)
+    if _is_path_in(path, KEYS_CHAINS_INT):
+        return key, int(value)
+    if _is_path_in(path, KEYS_CHAINS_DATE):
+        return key, value
+    return key, value
+
+
+def _collect_calls(xml: str) -> list:
+    """Record all postprocessor invocations of a parse."""
+    calls = []
+
+    def _record(path, key, value):
+        calls.append((list(path), key, value))
+        return key, value
+
+    xmltodict.parse(
+        xml,
+        process_namespaces=True,
+        namespaces=dict(DEFAULT_NAMESPACES),
+        postprocessor=_record,
+    )
+    return calls
+
+
+def main():
+    """Run benchmark."""
+    calls = _collect_calls(generate_catalog(EVENTS))
+    # Exclude the (separately benchmarked) date conversion from both variants.
+    schema = DEFAULT_CONVERSION_SCHEMA.extend(
+        {tuple(chain): str for chain in KEYS_CHAINS_DATE}
+    )
+
+    def _before():
+        for path, key, value in calls:
+            scanning_postprocessor(path, key, value)
+
+    def _after():
+        for path, key, value in calls:
+            schema.postprocessor(path, key, value)
+
+    print(f"{len(calls)} postprocessor calls for {EVENTS} events")
+    for name, function in (("before", _before), ("after", _after)):
+        best = min(timeit.repeat(function, number=1, repeat=REPEAT))
+        print(f"{name:>6}: {best * 1e9 / len(calls):8.1f} ns per node")
+
+
+if __name__ == "__main__":
+    main()
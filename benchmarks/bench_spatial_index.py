@@ -0,0 +1,109 @@
+"""Benchmark spatial index queries against a linear scan.
+
+Run with: python -m benchmarks.bench_spatial_index
+"""
+
+import random
+import time
+
+from aio_quakeml_client.distance import haversine_distances
+from aio_quakeml_client.spatial_index import SpatialIndex
+
+POINTS = 20000
+SITES = 1000
+RADIUS = 300.0
+SOUTH_WEST = (-40.0, 140.0)
+NORTH_EAST = (-20.0, 160.0)
+NEAREST = 10
+
+
+def _random_coordinates(rng: random.Random, count: int) -> list[tuple[float, float]]:
+    """Return random coordinates across the globe."""
+    return [
+        (rng.uniform(-90.0, 90.0), rng.uniform(-180.0, 180.0)) for _ in range(count)
+    ]
+
+
+def _linear_radius(keys: list, coordinates: list, site: tuple) -> list:
+    """Return keys within the radius, calculating the distance to every point."""
+    return [
+        key
+        for key, distance in zip(
+            keys, haversine_distances(site, coordinates), strict=True
+        )
+        if distance <= RADIUS
+    ]
+
+
+def _linear_bounding_box(points: dict) -> list:
+    """Return keys inside the bounding box, checking every point."""
+    return [
+        key
+        for key, (latitude, longitude) in points.items()
+        if SOUTH_WEST[0] <= latitude <= NORTH_EAST[0]
+        and SOUTH_WEST[1] <= longitude <= NORTH_EAST[1]
+    ]
+
+
+def _linear_nearest(keys: list, coordinates: list, site: tuple) -> list:
+    """Return the nearest keys, calculating the distance to every point."""
+    distances = haversine_distances(site, coordinates)
+    return sorted(zip(keys, distances, strict=True), key=lambda match: match[1])[
+        :NEAREST
+    ]
+
+
+def _report(name: str, linear: float, indexed: float):
+    """Print the timings of one type of query."""
+    print(
+        f"{name:>12}: linear {linear * 1000:9.2f} ms, "
+        f"indexed {indexed * 1000:9.2f} ms, {linear / indexed:6.1f}x"
+    )
+
+
+def main():
+    """Run benchmark."""
+    rng = random.Random(0)
+    points = dict(enumerate(_random_coordinates(rng, POINTS)))
+    sites = _random_coordinates(rng, SITES)
+    keys = list(points)
+    coordinates = list(points.values())
+    start = time.perf_counter()
+    index = SpatialIndex()
+    for key, point in points.items():
+        index.add(key, point)
+    print(f"{POINTS} points indexed in {(time.perf_counter() - start) * 1000:.2f} ms")
+    print(f"{SITES} sites, radius {RADIUS} km")
+
+    start = time.perf_counter()
+    linear = [_linear_radius(keys, coordinates, site) for site in sites]
+    linear_time = time.perf_counter() - start
+    start = time.perf_counter()
+    indexed = [index.within_radius(site, RADIUS) for site in sites]
+    indexed_time = time.perf_counter() - start
+    assert [sorted(result) for result in linear] == [
+        sorted(key for key, _ in result) for result in indexed
+    ]
+    _report("radius", linear_time, indexed_time)
+
+    start = time.perf_counter()
+    for _ in range(SITES):
+        _linear_bounding_box(points)
+    linear_time = time.perf_counter() - start
+    start = time.perf_counter()
+    for _ in range(SITES):
+        index.within_bounding_box(SOUTH_WEST, NORTH_EAST)
+    _report("bounding box", linear_time, time.perf_counter() - start)
+
+    start = time.perf_counter()
+    for site in sites[:100]:
+        _linear_nearest(keys, coordinates, site)
+    linear_time = time.perf_counter() - start
+    start = time.perf_counter()
+    for site in sites[:100]:
+        index.nearest(site, NEAREST)
+    _report("nearest", linear_time, time.perf_counter() - start)
+
+
+if __name__ == "__main__":
+    main()
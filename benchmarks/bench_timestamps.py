@@ -0,0 +1,59 @@
+"""Benchmark timestamp conversion over the test fixtures.
+
+The converted timestamps are cached, and the same timestamps recur in
+every run, so the new conversion is measured both with the cache cleared
+before each document and with a warm cache.
+
+Run with: python -m benchmarks.bench_timestamps
+"""
+
+import os
+import timeit
+
+import dateparser
+
+from aio_quakeml_client.xml_parser import KEYS_CHAINS_DATE, XmlParser, _parse_datetime
+from tests.utils import load_fixture
+
+REPEAT = 5
+NUMBER = 200
+
+
+def _dateparser(value):
+    """Convert a timestamp with the generic date parser only."""
+    return dateparser.parse(
+        value, settings={"TIMEZONE": "UTC", "RETURN_AS_TIMEZONE_AWARE": True}
+    )
+
+
+def main():
+    """Run benchmark."""
+    fixtures_path = os.path.join(os.path.dirname(__file__), "..", "tests", "fixtures")
+    fixtures = [
+        load_fixture(filename) for filename in sorted(os.listdir(fixtures_path))
+    ]
+    event_count = sum(len(XmlParser().parse(fixture).events) for fixture in fixtures)
+    before_parser = XmlParser(
+        additional_conversions={tuple(chain): _dateparser for chain in KEYS_CHAINS_DATE}
+    )
+    after_parser = XmlParser()
+
+    print(f"{len(fixtures)} fixtures with {event_count} events")
+    for name, parser, clear_cache in (
+        ("before", before_parser, False),
+        ("after, uncached", after_parser, True),
+        ("after, cached", after_parser, False),
+    ):
+
+        def _parse(parser=parser, clear_cache=clear_cache):
+            for fixture in fixtures:
+                if clear_cache:
+                    _parse_datetime.cache_clear()
+                parser.parse(fixture)
+
+        best = min(timeit.repeat(_parse, number=NUMBER, repeat=REPEAT)) / NUMBER
+        print(f"{name:>15}: {best * 1e6 / event_count:8.1f} us per event")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,18 @@
+"""Benchmark utilities."""
+
+import re
+
+from tests.utils import load_fixture
+
+EVENT_PATTERN = re.compile(r"(\s*<event .*?</event>)", re.DOTALL)
+
+
+def generate_catalog(count: int, fixture: str = "generic_feed_1.xml") -> str:
+    """Generate a catalog by repeating the first event of a fixture."""
+    xml = load_fixture(fixture)
+    match = EVENT_PATTERN.search(xml)
+    event = match.group(1)
+    events = "".join(
+        event.replace("eventId=", f"eventId={index}-", 1) for index in range(count)
+    )
+    return xml[: match.start()] + events + xml[match.end() :]
@@ -0,0 +1,185 @@
+"""Test for the local event archive."""
+
+import asyncio
+from datetime import UTC, datetime
+from http import HTTPStatus
+
+import aiohttp
+import pytest
+
+from aio_quakeml_client.archive import EventArchive
+from aio_quakeml_client.feed_manager import QuakeMLFeedManagerBase
+from aio_quakeml_client.xml_parser import XmlParser
+from tests import MockFeedEntry, MockQuakeMLFeed
+from tests.utils import load_fixture
+
+HOME_COORDINATES = (-31.0, 151.0)
+
+
+def _entries(points: dict[str, tuple[float, float, float]]) -> list[MockFeedEntry]:
+    """Return entries with the provided ids, coordinates and magnitudes."""
+    template = load_fixture("generic_feed_1.xml")
+    entries = []
+    for index, (external_id, (latitude, longitude, mag)) in enumerate(points.items()):
+        event = XmlParser(compact=True).parse(template).events[0]
+        event.public_id = external_id
+        event.latitude = latitude
+        event.longitude = longitude
+        event.mag = mag
+        event.time_epoch = 1_600_000_000.0 + index * 3600
+        entries.append(MockFeedEntry(HOME_COORDINATES, event))
+    return entries
+
+
+@pytest.mark.asyncio
+async def test_archive_queries(tmp_path):
+    """Test querying the archive by time, magnitude and area."""
+    archive = EventArchive(tmp_path / "archive.db")
+    assert repr(archive) == (
+        f"<EventArchive(path={tmp_path / 'archive.db'}, cell_size=1.0)>"
+    )
+    entries = _entries(
+        {
+            "sydney": (-33.87, 151.21, 3.5),
+            "newcastle": (-32.93, 151.78, 2.1),
+            "fiji": (-17.7, 178.1, 5.2),
+            "samoa": (-13.8, -171.8, 4.8),
+            "iceland": (64.1, -21.9, 1.2),
+        }
+    )
+    assert await archive.upsert(entries) == 5
+    assert await archive.upsert([]) == 0
+    assert await archive.count() == 5
+
+    events = await archive.events_by_origin_time(
+        datetime.fromtimestamp(1_600_003_600, UTC),
+        datetime.fromtimestamp(1_600_010_800, UTC),
+    )
+    assert [event.external_id for event in events] == ["newcastle", "fiji", "samoa"]
+    assert events[0].origin_time.tzinfo == UTC
+    assert repr(events[0]) == "<ArchivedEvent(newcastle)>"
+
+    events = await archive.events_by_magnitude(3.0)
+    assert [event.external_id for event in events] == ["sydney", "samoa", "fiji"]
+    events = await archive.events_by_magnitude(maximum=3.0, limit=1)
+    assert [event.external_id for event in events] == ["iceland"]
+
+    # Crossing the antimeridian.
+    events = await archive.events_within_bounding_box((-20.0, 170.0), (-10.0, -170.0))
+    assert sorted(event.external_id for event in events) == ["fiji", "samoa"]
+    events = await archive.events_within_bounding_box((-40.0, 150.0), (-30.0, 152.0))
+    assert [event.external_id for event in events] == ["newcastle", "sydney"]
+
+    results = await archive.events_within_radius(HOME_COORDINATES, 350.0)
+    assert [event.external_id for event, _ in results] == ["newcastle", "sydney"]
+    assert all(distance <= 350.0 for _, distance in results)
+    results = await archive.events_within_radius((-15.0, 179.0), 1200.0)
+    assert [event.external_id for event, _ in results] == ["fiji", "samoa"]
+
+    # Upserts update existing events.
+    await archive.upsert(_entries({"sydney": (-33.87, 151.21, 3.9)}))
+    assert await archive.count() == 5
+    events = await archive.events_by_magnitude(3.8, 4.0)
+    assert [event.external_id for event in events] == ["sydney"]
+    await archive.close()
+
+
+@pytest.mark.asyncio
+async def test_archive_with_feed_manager(mock_aiointercept, tmp_path):
+    """Test the feed manager archives created and changed entries."""
+    mock_aiointercept.get(
+        "http://test.url/testpath",
+        status=HTTPStatus.OK,
+        body=load_fixture("generic_feed_3.xml"),
+    )
+    mock_aiointercept.get(
+        "http://test.url/testpath",
+        status=HTTPStatus.OK,
+        body=load_fixture("generic_feed_4.xml"),
+    )
+    archive = EventArchive(tmp_path / "archive.db")
+    upserted = []
+    upsert = archive.upsert
+
+    async def _upsert(entries):
+        """Record the archived entries."""
+        entries = list(entries)
+        upserted.append(sorted(entry.external_id for entry in entries))
+        return await upsert(entries)
+
+    archive.upsert = _upsert
+
+    async def _callback(external_id):
+        """Ignore entity changes."""
+
+    async with aiohttp.ClientSession(loop=asyncio.get_running_loop()) as websession:
+        feed_manager = QuakeMLFeedManagerBase(
+            MockQuakeMLFeed(websession, HOME_COORDINATES, "http://test.url/testpath"),
+            _callback,
+            _callback,
+            _callback,
+            archive=archive,
+        )
+        await feed_manager.update()
+        await feed_manager.update()
+    assert upserted == [["11", "21", "31"], ["11", "21", "41"]]
+    # Removed events remain in the archive.
+    assert await archive.count() == 4
+    events = await archive.events_by_magnitude(3.7, 3.7)
+    assert [event.external_id for event in events] == ["21"]
+    await archive.close()
+
+
+@pytest.mark.asyncio
+async def test_archive_with_failing_callbacks(mock_aiointercept, tmp_path):
+    """Test entries are archived even if entity callbacks fail."""
+    mock_aiointercept.get(
+        "http://test.url/testpath",
+        status=HTTPStatus.OK,
+        body=load_fixture("generic_feed_3.xml"),
+        repeat=2,
+    )
+    archive = EventArchive(tmp_path / "archive.db")
+    upserted = []
+    upsert = archive.upsert
+
+    async def _upsert(entries):
+        """Record the archived entries."""
+        entries = list(entries)
+        upserted.append(sorted(entry.external_id for entry in entries))
+        return await upsert(entries)
+
+    archive.upsert = _upsert
+
+    async def _failing_callback(external_id):
+        """Fail to handle entity changes."""
+        raise RuntimeError("Callback failed")
+
+    async with aiohttp.ClientSession(loop=asyncio.get_running_loop()) as websession:
+        feed_manager = QuakeMLFeedManagerBase(
+            MockQuakeMLFeed(websession, HOME_COORDINATES, "http://test.url/testpath"),
+            _failing_callback,
+            _failing_callback,
+            _failing_callback,
+            callback_concurrency=2,
+            archive=archive,
+        )
+        await feed_manager.update()
+        assert await archive.count() == 3
+        # Unchanged entries are not archived again.
+        await feed_manager.update()
+    assert upserted == [["11", "21", "31"]]
+    await archive.close()
+
+
+@pytest.mark.asyncio
+async def test_archive_closed(tmp_path):
+    """Test using a closed archive raises a clear error."""
+    archive = EventArchive(tmp_path / "archive.db")
+    await archive.upsert(_entries({"sydney": (-33.87, 151.21, 3.5)}))
+    await archive.close()
+    await archive.close()
+    with pytest.raises(RuntimeError, match="has been closed"):
+        await archive.upsert(_entries({"sydney": (-33.87, 151.21, 3.9)}))
+    with pytest.raises(RuntimeError, match="has been closed"):
+        await archive.count()
@@ -0,0 +1,49 @@
+"""Test for the distance calculations."""
+
+from haversine import haversine
+import pytest
+
+from aio_quakeml_client.distance import (
+    bounding_box,
+    haversine_distances,
+    in_bounding_box,
+)
+
+HOME_COORDINATES = (-31.0, 151.0)
+
+
+def test_haversine_distances():
+    """Test batched distances are the same as from the haversine library."""
+    points = [(-31.0, 151.0), (-33.0, 150.0), (42.5218, 13.3833), (-31.5, -179.5)]
+    distances = haversine_distances(HOME_COORDINATES, points)
+    assert distances == pytest.approx(
+        [haversine(HOME_COORDINATES, point) for point in points]
+    )
+    assert haversine_distances(HOME_COORDINATES, []) == []
+
+
+@pytest.mark.parametrize(
+    ("home_coordinates", "point"),
+    [
+        ((-31.0, 151.0), (-33.0, 150.0)),
+        ((-31.0, 151.0), (-31.0, 157.0)),
+        ((10.0, 179.5), (10.5, -179.5)),
+        ((-10.0, -179.5), (-10.5, 179.5)),
+        ((89.0, 0.0), (88.0, 180.0)),
+    ],
+)
+def test_bounding_box_contains_points_in_radius(home_coordinates, point):
+    """Test the bounding box does not reject any point within the radius."""
+    radius = haversine(home_coordinates, point) + 1.0
+    box = bounding_box(home_coordinates, radius)
+    assert in_bounding_box(box, home_coordinates[1], point)
+
+
+def test_bounding_box_rejects_distant_points():
+    """Test the bounding box rejects points far away."""
+    box = bounding_box(HOME_COORDINATES, 500.0)
+    assert not in_bounding_box(box, HOME_COORDINATES[1], (-31.0, 170.0))
+    assert not in_bounding_box(box, HOME_COORDINATES[1], (-20.0, 151.0))
+    assert not in_bounding_box(box, HOME_COORDINATES[1], (42.5218, 13.3833))
+    # Close to the poles, all longitudes are covered.
+    assert bounding_box((89.0, 0.0), 500.0)[2] is None
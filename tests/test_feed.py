@@ -1,17 +1,30 @@
 """Test for the generic QuakeML feed."""
 
 import asyncio
+import codecs
 import datetime
 from http import HTTPStatus
-from unittest.mock import MagicMock
+from unittest.mock import MagicMock, patch
 
 import aiohttp
 from aiohttp import ClientOSError
 import pytest
 
-from aio_quakeml_client.consts import UPDATE_ERROR, UPDATE_OK, UPDATE_OK_NO_DATA
+from aio_quakeml_client.consts import (
+    CIRCUIT_OPEN,
+    UPDATE_ERROR,
+    UPDATE_OK,
+    UPDATE_OK_NO_CHANGE,
+    UPDATE_OK_NO_DATA,
+    UPDATE_SKIPPED,
+)
+from aio_quakeml_client.feed_source import FeedSource
+from aio_quakeml_client.rate_limit import RateLimiter
+from aio_quakeml_client.retry import CircuitBreakers
+from aio_quakeml_client.xml_parser import XmlParser
+from aio_quakeml_client.xml_parser.compact_event import CompactEvent
 from tests import MockConfigurabelUrlQuakeMLFeed, MockQuakeMLFeed
-from tests.utils import load_fixture
+from tests.utils import FakeClock, load_fixture
 
 
 @pytest.mark.asyncio
@@ -72,6 +85,7 @@ async def test_update_ok(mock_aiointercept):
         )
         assert feed_entry.magnitude.type == "ML"
         assert feed_entry.magnitude.mag == 2.6
+        assert feed_entry.mag == 2.6
         assert feed_entry.magnitude.station_count == 72
         assert (
             repr(feed_entry.magnitude)
@@ -189,6 +203,10 @@ async def test_update_ok_with_radius_filter(mock_aiointercept):
 
         assert round(abs(entries[0].distance_to_home - 66.0), 1) == 0
         assert round(abs(entries[1].distance_to_home - 203.4), 1) == 0
+        # Distances calculated while filtering are kept on the entries.
+        with patch("aio_quakeml_client.feed_entry.haversine") as mock_haversine:
+            assert round(abs(entries[0].distance_to_home - 66.0), 1) == 0
+            mock_haversine.assert_not_called()
 
 
 @pytest.mark.asyncio
@@ -346,6 +364,41 @@ async def test_update_bom(mock_aiointercept):
         assert len(entries) == 1
 
 
+@pytest.mark.asyncio
+@pytest.mark.parametrize("compact_events", [False, True])
+async def test_update_bom_fixture(mock_aiointercept, compact_events):
+    """Test a UTF-8 response with BOM is parsed from the raw bytes."""
+    home_coordinates = (-31.0, 151.0)
+    xml = (
+        load_fixture("generic_feed_1.xml")
+        .replace('encoding="US-ASCII"', 'encoding="UTF-8"')
+        .replace("4 km S Campotosto (AQ)", "4 km S Città Sant'Angelo (PE)")
+    )
+    body = codecs.BOM_UTF8 + xml.encode("utf-8")
+    assert body.startswith(b"\xef\xbb\xbf<?xml")
+    mock_aiointercept.get("http://test.url/testpath", status=HTTPStatus.OK, body=body)
+
+    async with aiohttp.ClientSession(loop=asyncio.get_running_loop()) as websession:
+        feed = MockQuakeMLFeed(
+            websession,
+            home_coordinates,
+            "http://test.url/testpath",
+            compact_events=compact_events,
+        )
+        with patch.object(
+            XmlParser, "parse", autospec=True, side_effect=XmlParser.parse
+        ) as mock_parse:
+            status, entries = await feed.update()
+        # The BOM is skipped without copying or decoding the payload.
+        data = mock_parse.call_args.args[1]
+        assert isinstance(data, memoryview)
+        assert data.tobytes() == xml.encode("utf-8")
+        assert status == UPDATE_OK
+        assert len(entries) == 1
+        assert entries[0].description == "Region name: 4 km S Città Sant'Angelo (PE)"
+        assert entries[0].magnitude.mag == 2.6
+
+
 @pytest.mark.asyncio
 async def test_update_not_xml(mock_aiointercept):
     """Test updating feed where returned payload is not XML."""
@@ -369,3 +422,478 @@ async def test_update_not_xml(mock_aiointercept):
         status, entries = await feed.update()
         assert status == UPDATE_OK_NO_DATA
         assert entries is None
+
+
+@pytest.mark.asyncio
+async def test_stream_ok(mock_aiointercept):
+    """Test streaming feed entries is ok."""
+    home_coordinates = (42.0, 13.0)
+    mock_aiointercept.get(
+        "http://test.url/testpath",
+        status=HTTPStatus.OK,
+        body=load_fixture("generic_feed_2.xml"),
+    )
+
+    async with aiohttp.ClientSession(loop=asyncio.get_running_loop()) as websession:
+        feed = MockQuakeMLFeed(
+            websession,
+            home_coordinates,
+            "http://test.url/testpath",
+            filter_minimum_magnitude=2.7,
+        )
+        entries = [entry async for entry in feed.stream()]
+        assert len(entries) == 2
+        assert entries[0].magnitude.mag == 2.7
+        assert entries[1].magnitude.mag == 2.8
+        assert feed.last_timestamp == datetime.datetime(
+            2022, 4, 28, 11, 0, 0, 0, tzinfo=datetime.UTC
+        )
+        assert feed.stream_status == UPDATE_OK
+
+
+@pytest.mark.asyncio
+async def test_stream_with_parse_error(mock_aiointercept):
+    """Test a stream that breaks off part-way ends with an error status."""
+    xml = load_fixture("generic_feed_3.xml")
+    mock_aiointercept.get(
+        "http://test.url/testpath",
+        status=HTTPStatus.OK,
+        body=xml[: xml.index('<event publicID="31">')] + "<broken",
+    )
+
+    async with aiohttp.ClientSession(loop=asyncio.get_running_loop()) as websession:
+        feed = MockQuakeMLFeed(websession, (42.0, 13.0), "http://test.url/testpath")
+        entries = [entry async for entry in feed.stream()]
+        assert [entry.external_id for entry in entries] == ["11", "21"]
+        assert feed.stream_status == UPDATE_ERROR
+
+
+@pytest.mark.asyncio
+async def test_stream_with_rate_limiter_and_circuit_breaker(mock_aiointercept):
+    """Test streams make no request the rate limiter or circuit breaker refuse."""
+    mock_aiointercept.get(
+        "http://test.url/testpath",
+        status=HTTPStatus.TOO_MANY_REQUESTS,
+        headers={"Retry-After": "3600"},
+    )
+    clock = FakeClock(auto_advance=True)
+    circuit_breakers = CircuitBreakers(failure_threshold=1, clock=clock.time)
+
+    async with aiohttp.ClientSession(loop=asyncio.get_running_loop()) as websession:
+        feed = MockQuakeMLFeed(
+            websession,
+            (42.0, 13.0),
+            "http://test.url/testpath",
+            circuit_breakers=circuit_breakers,
+            rate_limiter=RateLimiter(clock=clock.time, sleep=clock.sleep),
+        )
+        assert [entry async for entry in feed.stream()] == []
+        assert feed.stream_status == UPDATE_ERROR
+        assert feed.failed_attempts == 1
+        assert feed.circuit_breaker.state == CIRCUIT_OPEN
+
+        # The open circuit breaker rejects the next stream.
+        assert [entry async for entry in feed.stream()] == []
+        assert feed.stream_status == UPDATE_ERROR
+        assert len(mock_aiointercept.ordered_requests) == 1
+
+        # The host asked to wait longer than a request may take.
+        feed.circuit_breaker.record_success()
+        assert [entry async for entry in feed.stream()] == []
+        assert feed.stream_status == UPDATE_SKIPPED
+        assert clock.now == 0.0
+        assert len(mock_aiointercept.ordered_requests) == 1
+
+
+@pytest.mark.asyncio
+async def test_concurrent_streams(mock_aiointercept):
+    """Test concurrent streams of the same feed keep their own global data."""
+    home_coordinates = (42.0, 13.0)
+    for public_id in ("first", "second"):
+        mock_aiointercept.get(
+            "http://test.url/testpath",
+            status=HTTPStatus.OK,
+            body=load_fixture("generic_feed_3.xml").replace(
+                "smi:webservices.ingv.it/fdsnws/event/1/query", public_id
+            ),
+        )
+
+    class GlobalDataFeed(MockQuakeMLFeed):
+        """Feed passing the public id of the event parameters to its entries."""
+
+        def _extract_from_feed(self, feed):
+            return {"public_id": feed.public_id}
+
+        def _new_entry(self, home_coordinates, event, global_data):
+            entry = super()._new_entry(home_coordinates, event, global_data)
+            entry.global_data = global_data
+            return entry
+
+    async with aiohttp.ClientSession(loop=asyncio.get_running_loop()) as websession:
+        feed = GlobalDataFeed(websession, home_coordinates, "http://test.url/testpath")
+        first_stream = feed.stream()
+        second_stream = feed.stream()
+        first_entries = [await anext(first_stream)]
+        second_entries = [entry async for entry in second_stream]
+        first_entries.extend([entry async for entry in first_stream])
+        assert [entry.global_data for entry in first_entries] == [
+            {"public_id": "first"}
+        ] * 3
+        assert [entry.global_data for entry in second_entries] == [
+            {"public_id": "second"}
+        ] * 3
+
+
+@pytest.mark.asyncio
+async def test_stream_with_request_exception(mock_aiointercept):
+    """Test streaming feed entries results in error."""
+    home_coordinates = (-31.0, 151.0)
+    mock_aiointercept.get(
+        "http://test.url/badpath",
+        status=HTTPStatus.NOT_FOUND,
+    )
+
+    async with aiohttp.ClientSession(loop=asyncio.get_running_loop()) as websession:
+        feed = MockQuakeMLFeed(websession, home_coordinates, "http://test.url/badpath")
+        entries = [entry async for entry in feed.stream()]
+        assert entries == []
+        assert feed.last_timestamp is None
+        assert feed.stream_status == UPDATE_ERROR
+
+
+@pytest.mark.asyncio
+async def test_update_conditional_request(mock_aiointercept):
+    """Test updating feed sends validators and handles not modified response."""
+    home_coordinates = (-31.0, 151.0)
+    mock_aiointercept.get(
+        "http://test.url/testpath",
+        status=HTTPStatus.OK,
+        body=load_fixture("generic_feed_1.xml"),
+        headers={
+            "ETag": '"abc123"',
+            "Last-Modified": "Tue, 01 Mar 2022 22:55:00 GMT",
+        },
+    )
+    mock_aiointercept.get("http://test.url/testpath", status=HTTPStatus.NOT_MODIFIED)
+
+    async with aiohttp.ClientSession(loop=asyncio.get_running_loop()) as websession:
+        feed = MockQuakeMLFeed(websession, home_coordinates, "http://test.url/testpath")
+        status, entries = await feed.update()
+        assert status == UPDATE_OK
+        assert len(entries) == 1
+        assert "If-None-Match" not in mock_aiointercept.last_request.headers
+
+        status, entries = await feed.update()
+        assert status == UPDATE_OK_NO_DATA
+        assert entries is None
+        request_headers = mock_aiointercept.last_request.headers
+        assert request_headers["If-None-Match"] == '"abc123"'
+        assert request_headers["If-Modified-Since"] == "Tue, 01 Mar 2022 22:55:00 GMT"
+        # Last timestamp is retained as the data has not changed.
+        assert feed.last_timestamp is not None
+
+        # An error discards the validators.
+        mock_aiointercept.get(
+            "http://test.url/testpath", status=HTTPStatus.INTERNAL_SERVER_ERROR
+        )
+        status, entries = await feed.update()
+        assert status == UPDATE_ERROR
+        mock_aiointercept.get(
+            "http://test.url/testpath",
+            status=HTTPStatus.OK,
+            body=load_fixture("generic_feed_1.xml"),
+        )
+        status, entries = await feed.update()
+        assert status == UPDATE_OK
+        assert "If-None-Match" not in mock_aiointercept.last_request.headers
+
+
+@pytest.mark.asyncio
+async def test_update_unchanged_payload(mock_aiointercept):
+    """Test updating feed with identical payload skips parsing."""
+    home_coordinates = (-31.0, 151.0)
+    mock_aiointercept.get(
+        "http://test.url/testpath",
+        status=HTTPStatus.OK,
+        body=load_fixture("generic_feed_3.xml"),
+        repeat=2,
+    )
+
+    async with aiohttp.ClientSession(loop=asyncio.get_running_loop()) as websession:
+        feed = MockQuakeMLFeed(websession, home_coordinates, "http://test.url/testpath")
+        status, entries = await feed.update()
+        assert status == UPDATE_OK
+        assert len(entries) == 3
+
+        with patch("aio_quakeml_client.feed.XmlParser.parse") as mock_parse:
+            status, unchanged_entries = await feed.update()
+            assert mock_parse.call_count == 0
+        assert status == UPDATE_OK_NO_CHANGE
+        assert unchanged_entries is entries
+
+        mock_aiointercept.get(
+            "http://test.url/testpath",
+            status=HTTPStatus.OK,
+            body=load_fixture("generic_feed_4.xml"),
+        )
+        status, entries = await feed.update()
+        assert status == UPDATE_OK
+        assert entries[0].description == "Description 11 UPDATED"
+
+
+@pytest.mark.asyncio
+async def test_update_incremental(mock_aiointercept):
+    """Test incremental feed only requests changes since the last update."""
+    home_coordinates = (-31.0, 151.0)
+    mock_aiointercept.get(
+        "http://test.url/testpath?format=xml",
+        status=HTTPStatus.OK,
+        body=load_fixture("generic_feed_1.xml"),
+    )
+    mock_aiointercept.get(
+        "http://test.url/testpath?format=xml&updatedafter=2022-03-01T22:54:13",
+        status=HTTPStatus.OK,
+        body=load_fixture("generic_feed_3.xml"),
+    )
+
+    async with aiohttp.ClientSession(loop=asyncio.get_running_loop()) as websession:
+        feed = MockQuakeMLFeed(
+            websession,
+            home_coordinates,
+            "http://test.url/testpath?format=xml",
+            incremental=True,
+        )
+        assert feed.incremental
+        status, entries = await feed.update()
+        assert status == UPDATE_OK
+        assert len(entries) == 1
+        last_timestamp = feed.last_timestamp
+        assert last_timestamp == datetime.datetime(
+            2022, 3, 1, 22, 54, 13, tzinfo=datetime.UTC
+        )
+
+        status, entries = await feed.update()
+        assert status == UPDATE_OK
+        assert len(entries) == 3
+        # The delta does not contain newer entries, keep the last timestamp.
+        assert feed.last_timestamp == last_timestamp
+
+
+@pytest.mark.asyncio
+async def test_update_incremental_shared_source(mock_aiointercept):
+    """Test the delta of an incremental feed with a shared source is new data."""
+    mock_aiointercept.get(
+        "http://test.url/testpath",
+        status=HTTPStatus.OK,
+        body=load_fixture("generic_feed_1.xml"),
+    )
+    mock_aiointercept.get(
+        "http://test.url/testpath?updatedafter=2022-03-01T22:54:13",
+        status=HTTPStatus.OK,
+        body=load_fixture("generic_feed_3.xml"),
+    )
+
+    async with aiohttp.ClientSession(loop=asyncio.get_running_loop()) as websession:
+        source = FeedSource(max_age=datetime.timedelta(0))
+        feed = MockQuakeMLFeed(
+            websession,
+            (-31.0, 151.0),
+            "http://test.url/testpath",
+            incremental=True,
+            source=source,
+        )
+        status, entries = await feed.update()
+        assert status == UPDATE_OK
+        assert len(entries) == 1
+
+        status, entries = await feed.update()
+        assert status == UPDATE_OK
+        assert len(entries) == 3
+        # The result of the superseded query is discarded.
+        assert repr(source) == "<FeedSource(max_age=0.0, requests=1)>"
+
+
+@pytest.mark.asyncio
+async def test_update_incremental_conditional_request(mock_aiointercept):
+    """Test validators are only sent with the same incremental query."""
+    home_coordinates = (-31.0, 151.0)
+    mock_aiointercept.get(
+        "http://test.url/testpath",
+        status=HTTPStatus.OK,
+        body=load_fixture("generic_feed_1.xml"),
+        headers={"ETag": '"first"'},
+    )
+    mock_aiointercept.get(
+        "http://test.url/testpath?updatedafter=2022-03-01T22:54:13",
+        status=HTTPStatus.OK,
+        body=load_fixture("generic_feed_3.xml"),
+        headers={"ETag": '"second"'},
+    )
+    mock_aiointercept.get(
+        "http://test.url/testpath?updatedafter=2022-03-01T22:54:13",
+        status=HTTPStatus.NOT_MODIFIED,
+    )
+
+    async with aiohttp.ClientSession(loop=asyncio.get_running_loop()) as websession:
+        feed = MockQuakeMLFeed(
+            websession, home_coordinates, "http://test.url/testpath", incremental=True
+        )
+        status, _ = await feed.update()
+        assert status == UPDATE_OK
+        # The delta is a different query, the validators do not apply.
+        status, _ = await feed.update()
+        assert status == UPDATE_OK
+        assert "If-None-Match" not in mock_aiointercept.last_request.headers
+        # The delta did not advance the watermark, the query is the same.
+        status, _ = await feed.update()
+        assert status == UPDATE_OK_NO_DATA
+        assert mock_aiointercept.last_request.headers["If-None-Match"] == '"second"'
+        # Only the validators of the latest query are kept.
+        assert feed._fetch_state.validators == {  # noqa: SLF001
+            "http://test.url/testpath updatedafter=2022-03-01T22%3A54%3A13": {
+                "If-None-Match": '"second"'
+            }
+        }
+
+
+@pytest.mark.asyncio
+async def test_update_compact_events(mock_aiointercept):
+    """Test updating feed with compact events is ok."""
+    home_coordinates = (-31.0, 151.0)
+    mock_aiointercept.get(
+        "http://test.url/testpath",
+        status=HTTPStatus.OK,
+        body=load_fixture("generic_feed_1.xml"),
+    )
+
+    async with aiohttp.ClientSession(loop=asyncio.get_running_loop()) as websession:
+        feed = MockQuakeMLFeed(
+            websession,
+            home_coordinates,
+            "http://test.url/testpath",
+            compact_events=True,
+        )
+        status, entries = await feed.update()
+        assert status == UPDATE_OK
+        assert len(entries) == 1
+
+        feed_entry = entries[0]
+        assert isinstance(feed.feed_data.events[0], CompactEvent)
+        assert (
+            feed_entry.external_id
+            == "smi:webservices.ingv.it/fdsnws/event/1/query?eventId=30116321"
+        )
+        assert feed_entry.description == "Region name: 4 km S Campotosto (AQ)"
+        assert feed_entry.type == "earthquake"
+        assert feed_entry.coordinates == (42.5218, 13.3833)
+        assert feed_entry.origin.depth == 14500
+        assert feed_entry.origin.time == datetime.datetime(
+            2022, 3, 1, 22, 53, 55, 680000, tzinfo=datetime.UTC
+        )
+        assert feed_entry.origin.evaluation_status == "reviewed"
+        assert round(abs(feed_entry.distance_to_home - 16074.6), 1) == 0
+        assert feed_entry.magnitude.type == "ML"
+        assert feed_entry.magnitude.mag == 2.6
+        assert feed_entry.mag == 2.6
+        assert feed_entry.creation_info.agency_id == "INGV"
+        assert feed_entry.creation_info.creation_time == datetime.datetime(
+            2022, 3, 1, 22, 54, 13, tzinfo=datetime.UTC
+        )
+        assert feed.last_timestamp == feed_entry.creation_info.creation_time
+
+
+@pytest.mark.asyncio
+async def test_update_shared_source(mock_aiointercept):
+    """Test feeds sharing a source only fetch and parse the data once."""
+    mock_aiointercept.get(
+        "http://test.url/testpath",
+        status=HTTPStatus.OK,
+        body=load_fixture("generic_feed_3.xml"),
+    )
+
+    async with aiohttp.ClientSession(loop=asyncio.get_running_loop()) as websession:
+        source = FeedSource()
+        feed_1 = MockQuakeMLFeed(
+            websession,
+            (42.0, 13.0),
+            "http://test.url/testpath",
+            filter_radius=250.0,
+            source=source,
+        )
+        feed_2 = MockQuakeMLFeed(
+            websession, (-31.0, 151.0), "http://test.url/testpath", source=source
+        )
+        (status_1, entries_1), (status_2, entries_2) = await asyncio.gather(
+            feed_1.update(), feed_2.update()
+        )
+        assert len(mock_aiointercept.ordered_requests) == 1
+        assert status_1 == UPDATE_OK
+        assert len(entries_1) == 2
+        assert status_2 == UPDATE_OK
+        assert len(entries_2) == 3
+
+        # Recent data is re-used without a new request.
+        status, entries = await feed_1.update()
+        assert len(mock_aiointercept.ordered_requests) == 1
+        assert status == UPDATE_OK_NO_CHANGE
+        assert entries is entries_1
+
+        mock_aiointercept.get(
+            "http://test.url/testpath",
+            status=HTTPStatus.OK,
+            body=load_fixture("generic_feed_4.xml"),
+        )
+        source.invalidate()
+        status, entries = await feed_2.update()
+        assert len(mock_aiointercept.ordered_requests) == 2
+        assert status == UPDATE_OK
+        assert entries[0].description == "Description 11 UPDATED"
+        status, entries = await feed_1.update()
+        assert len(mock_aiointercept.ordered_requests) == 2
+        assert status == UPDATE_OK
+        assert entries[0].description == "Description 11 UPDATED"
+
+        # An error is shared by all feeds.
+        mock_aiointercept.get(
+            "http://test.url/testpath", status=HTTPStatus.INTERNAL_SERVER_ERROR
+        )
+        source.invalidate()
+        assert (await feed_1.update())[0] == UPDATE_ERROR
+        assert (await feed_2.update())[0] == UPDATE_ERROR
+        assert len(mock_aiointercept.ordered_requests) == 3
+
+
+@pytest.mark.asyncio
+async def test_update_concurrent_calls(mock_aiointercept):
+    """Test concurrent updates of a feed share a single request."""
+    mock_aiointercept.get(
+        "http://test.url/testpath",
+        status=HTTPStatus.OK,
+        body=load_fixture("generic_feed_3.xml"),
+        repeat=True,
+    )
+
+    async with aiohttp.ClientSession(loop=asyncio.get_running_loop()) as websession:
+        feed = MockQuakeMLFeed(websession, (-31.0, 151.0), "http://test.url/testpath")
+        results = await asyncio.gather(*(feed.update() for _ in range(10)))
+        assert len(mock_aiointercept.ordered_requests) == 1
+        assert all(result is results[0] for result in results)
+        assert results[0][0] == UPDATE_OK
+
+        # Later calls make a new request.
+        await feed.update()
+        assert len(mock_aiointercept.ordered_requests) == 2
+
+        # Feeds with the same URL only share concurrent requests.
+        source = FeedSource(max_age=datetime.timedelta(0))
+        feeds = [
+            MockQuakeMLFeed(
+                websession, (-31.0, 151.0), "http://test.url/testpath", source=source
+            )
+            for _ in range(10)
+        ]
+        results = await asyncio.gather(*(feed.update() for feed in feeds))
+        assert len(mock_aiointercept.ordered_requests) == 3
+        assert all(len(entries) == 3 for _, entries in results)
+        await feeds[0].update()
+        assert len(mock_aiointercept.ordered_requests) == 4
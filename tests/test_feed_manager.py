@@ -1,14 +1,18 @@
 """Test for the generic QuakeML feed manager."""
 
 import asyncio
+from datetime import UTC, datetime, timedelta
 from http import HTTPStatus
 
 import aiohttp
 import pytest
 
+from aio_quakeml_client.consts import UPDATE_SKIPPED
 from aio_quakeml_client.feed_manager import QuakeMLFeedManagerBase
+from aio_quakeml_client.polling_policy import AdaptivePollingPolicy
+from aio_quakeml_client.rate_limit import RateLimiter
 from tests import MockQuakeMLFeed
-from tests.utils import load_fixture
+from tests.utils import FakeClock, load_fixture
 
 
 @pytest.mark.asyncio
@@ -212,11 +216,39 @@ async def test_feed_manager_with_status_callback(mock_aiointercept):
         assert status_update[0].created == 3
         assert status_update[0].updated == 0
         assert status_update[0].removed == 0
+        assert status_update[0].interval is None
         assert (
             repr(status_update[0]) == f"<StatusUpdate("
             f"OK@{status_update[0].last_update})>"
         )
 
+        # Simulate an update with unchanged data.
+        generated_entity_external_ids.clear()
+        updated_entity_external_ids.clear()
+        removed_entity_external_ids.clear()
+        status_update.clear()
+
+        mock_aiointercept.get(
+            "http://test.url/testpath",
+            status=HTTPStatus.OK,
+            body=load_fixture("generic_feed_3.xml"),
+        )
+
+        await feed_manager.update()
+        entries = feed_manager.feed_entries
+
+        assert len(entries) == 3
+        assert len(generated_entity_external_ids) == 0
+        assert len(updated_entity_external_ids) == 0
+        assert len(removed_entity_external_ids) == 0
+
+        assert status_update[0].status == "OK_NO_CHANGE"
+        assert status_update[0].last_update_successful > last_update_successful
+        last_update_successful = status_update[0].last_update_successful
+        assert status_update[0].total == 3
+        assert status_update[0].created == 0
+        assert status_update[0].updated == 0
+
         # Simulate an update with no data.
         generated_entity_external_ids.clear()
         updated_entity_external_ids.clear()
@@ -241,3 +273,766 @@ async def test_feed_manager_with_status_callback(mock_aiointercept):
         assert status_update[0].last_update_successful is not None
         assert status_update[0].last_update_successful == last_update_successful
         assert status_update[0].total == 0
+
+
+@pytest.mark.asyncio
+async def test_feed_manager_incremental(mock_aiointercept):
+    """Test the feed manager merges incremental updates."""
+    home_coordinates = (-31.0, 151.0)
+    mock_aiointercept.get(
+        "http://test.url/testpath",
+        status=HTTPStatus.OK,
+        body=load_fixture("generic_feed_3.xml"),
+    )
+    mock_aiointercept.get(
+        "http://test.url/testpath",
+        status=HTTPStatus.OK,
+        body=load_fixture("generic_feed_4.xml"),
+    )
+    mock_aiointercept.get(
+        "http://test.url/testpath",
+        status=HTTPStatus.OK,
+        body=load_fixture("generic_feed_6.xml"),
+    )
+
+    async with aiohttp.ClientSession(loop=asyncio.get_running_loop()) as websession:
+        feed = MockQuakeMLFeed(
+            websession, home_coordinates, "http://test.url/testpath", incremental=True
+        )
+
+        generated_entity_external_ids = []
+        updated_entity_external_ids = []
+        removed_entity_external_ids = []
+
+        async def _generate_entity(external_id):
+            """Generate new entity."""
+            generated_entity_external_ids.append(external_id)
+
+        async def _update_entity(external_id):
+            """Update entity."""
+            updated_entity_external_ids.append(external_id)
+
+        async def _remove_entity(external_id):
+            """Remove entity."""
+            removed_entity_external_ids.append(external_id)
+
+        feed_manager = QuakeMLFeedManagerBase(
+            feed,
+            _generate_entity,
+            _update_entity,
+            _remove_entity,
+            # Origin times before 2022-03-01T12:00 are too old.
+            entry_max_age=datetime.now(UTC) - datetime(2022, 3, 1, 12, tzinfo=UTC),
+        )
+        await feed_manager.update()
+        assert set(feed_manager.feed_entries) == {"11", "21", "31"}
+        assert len(generated_entity_external_ids) == 3
+
+        generated_entity_external_ids.clear()
+        await feed_manager.update()
+        # Entry 31 is missing from the delta, but is kept.
+        assert set(feed_manager.feed_entries) == {"11", "21", "31", "41"}
+        assert feed_manager.feed_entries["11"].description == "Description 11 UPDATED"
+        assert generated_entity_external_ids == ["41"]
+        assert sorted(updated_entity_external_ids) == ["11", "21"]
+        assert len(removed_entity_external_ids) == 0
+
+        # Entries older than the maximum age are evicted, entries without
+        # origin time are kept.
+        generated_entity_external_ids.clear()
+        updated_entity_external_ids.clear()
+        await feed_manager.update()
+        assert set(feed_manager.feed_entries) == {"21", "31", "41"}
+        assert len(generated_entity_external_ids) == 0
+        assert updated_entity_external_ids == ["21"]
+        assert removed_entity_external_ids == ["11"]
+        assert [
+            entry.external_id for entry in feed_manager.entries_by_origin_time()
+        ] == ["21"]
+        entries = feed_manager.entries_within_radius((42.5, 13.4), 20000.0)
+        assert sorted(entry.external_id for entry, _ in entries) == ["21", "31", "41"]
+
+
+@pytest.mark.asyncio
+async def test_feed_manager_incremental_filtered(mock_aiointercept):
+    """Test deltas without entries passing the filter of an incremental feed."""
+    mock_aiointercept.get(
+        "http://test.url/testpath",
+        status=HTTPStatus.OK,
+        body=load_fixture("generic_feed_3.xml"),
+    )
+    mock_aiointercept.get(
+        "http://test.url/testpath",
+        status=HTTPStatus.OK,
+        body=load_fixture("generic_feed_8.xml"),
+    )
+
+    async with aiohttp.ClientSession(loop=asyncio.get_running_loop()) as websession:
+        feed = MockQuakeMLFeed(
+            websession,
+            (42.5, 13.4),
+            "http://test.url/testpath",
+            filter_radius=500.0,
+            incremental=True,
+        )
+        removed_entity_external_ids = []
+
+        async def _callback(external_id):
+            """Ignore entity changes."""
+
+        async def _remove_entity(external_id):
+            """Remove entity."""
+            removed_entity_external_ids.append(external_id)
+
+        feed_manager = QuakeMLFeedManagerBase(
+            feed,
+            _callback,
+            _callback,
+            _remove_entity,
+            entry_max_age=timedelta(days=365 * 100),
+        )
+        await feed_manager.update()
+        assert set(feed_manager.feed_entries) == {"11", "21", "31"}
+
+        # No entry of the delta passes the filter. Entry 21 moved out of the
+        # radius and is removed, the other entries are kept.
+        await feed_manager.update()
+        assert feed.rejected_external_ids == {"21", "51"}
+        assert set(feed_manager.feed_entries) == {"11", "31"}
+        assert removed_entity_external_ids == ["21"]
+        entries = feed_manager.entries_within_radius((42.5, 13.4), 20000.0)
+        assert sorted(entry.external_id for entry, _ in entries) == ["11", "31"]
+        assert [entry.mag for entry in feed_manager.entries_by_magnitude()] == [
+            2.6,
+            4.6,
+        ]
+
+
+def test_feed_manager_incremental_without_max_age(caplog):
+    """Test a warning is logged for incremental feeds without maximum age."""
+    feed = MockQuakeMLFeed(
+        None, (-31.0, 151.0), "http://test.url/testpath", incremental=True
+    )
+    QuakeMLFeedManagerBase(feed)
+    assert "are never evicted without a maximum age" in caplog.text
+    caplog.clear()
+    QuakeMLFeedManagerBase(feed, entry_max_age=timedelta(days=7))
+    QuakeMLFeedManagerBase(MockQuakeMLFeed(None, (-31.0, 151.0)))
+    assert caplog.text == ""
+
+
+@pytest.mark.asyncio
+async def test_feed_manager_spatial_queries(mock_aiointercept):
+    """Test querying the feed manager's entries by location."""
+    home_coordinates = (-31.0, 151.0)
+    mock_aiointercept.get(
+        "http://test.url/testpath",
+        status=HTTPStatus.OK,
+        body=load_fixture("generic_feed_3.xml"),
+    )
+
+    async with aiohttp.ClientSession(loop=asyncio.get_running_loop()) as websession:
+        feed = MockQuakeMLFeed(websession, home_coordinates, "http://test.url/testpath")
+
+        async def _callback(external_id):
+            """Ignore entity changes."""
+
+        feed_manager = QuakeMLFeedManagerBase(feed, _callback, _callback, _callback)
+        await feed_manager.update()
+
+        entries = feed_manager.entries_within_radius((42.5, 13.4), 200.0)
+        assert [entry.external_id for entry, _ in entries] == ["11", "21"]
+        assert round(abs(entries[0][1] - 2.8), 1) == 0
+        entries = feed_manager.entries_within_bounding_box((43.0, 14.0), (45.0, 16.0))
+        assert sorted(entry.external_id for entry in entries) == ["21", "31"]
+        entries = feed_manager.nearest_entries((45.0, 16.0), 2)
+        assert [entry.external_id for entry, _ in entries] == ["31", "21"]
+
+        # Removed and new entries are reflected by the queries.
+        mock_aiointercept.get(
+            "http://test.url/testpath",
+            status=HTTPStatus.OK,
+            body=load_fixture("generic_feed_4.xml"),
+        )
+        await feed_manager.update()
+
+        entries = feed_manager.nearest_entries((45.0, 16.0), 5)
+        assert [entry.external_id for entry, _ in entries] == ["41", "21", "11"]
+
+        # All entries are removed after an error.
+        mock_aiointercept.get(
+            "http://test.url/testpath",
+            status=HTTPStatus.INTERNAL_SERVER_ERROR,
+        )
+        await feed_manager.update()
+
+        assert feed_manager.entries_within_radius((42.5, 13.4), 20000.0) == []
+
+
+@pytest.mark.asyncio
+async def test_feed_manager_time_and_magnitude_queries(mock_aiointercept):
+    """Test querying the feed manager's entries by time and magnitude."""
+    home_coordinates = (-31.0, 151.0)
+    mock_aiointercept.get(
+        "http://test.url/testpath",
+        status=HTTPStatus.OK,
+        body=load_fixture("generic_feed_2.xml"),
+    )
+    mock_aiointercept.get(
+        "http://test.url/testpath",
+        status=HTTPStatus.OK,
+        body=load_fixture("generic_feed_1.xml"),
+    )
+
+    async with aiohttp.ClientSession(loop=asyncio.get_running_loop()) as websession:
+        feed = MockQuakeMLFeed(websession, home_coordinates, "http://test.url/testpath")
+
+        async def _callback(external_id):
+            """Ignore entity changes."""
+
+        feed_manager = QuakeMLFeedManagerBase(feed, _callback, _callback, _callback)
+        await feed_manager.update()
+        assert len(feed_manager.feed_entries) == 3
+
+        entries = feed_manager.entries_by_magnitude()
+        assert [entry.magnitude.mag for entry in entries] == [2.7, 2.8]
+        entries = feed_manager.entries_by_magnitude(minimum=2.75)
+        assert [entry.magnitude.mag for entry in entries] == [2.8]
+        entries = feed_manager.entries_by_creation_time(
+            end=datetime(2022, 4, 28, 10, 30, tzinfo=UTC)
+        )
+        assert [entry.magnitude.mag for entry in entries] == [2.7]
+        assert feed_manager.newest_creation_time == datetime(
+            2022, 4, 28, 11, 0, tzinfo=UTC
+        )
+        assert feed_manager.newest_origin_time is None
+
+        # Entries which are not in the feed anymore are removed from indexes.
+        await feed_manager.update()
+        assert len(feed_manager.feed_entries) == 1
+        origin_time = datetime(2022, 3, 1, 22, 53, 55, 680000, UTC)
+        assert feed_manager.newest_origin_time == origin_time
+        assert feed_manager.newest_creation_time == datetime(
+            2022, 3, 1, 22, 54, 13, tzinfo=UTC
+        )
+        assert len(feed_manager.entries_by_origin_time(start=origin_time)) == 1
+        assert feed_manager.entries_by_magnitude(minimum=2.7) == []
+        period = datetime.now(UTC) - origin_time
+        assert feed_manager.recent_entries(timedelta(days=1)) == []
+        assert len(feed_manager.recent_entries(period + timedelta(days=1))) == 1
+        assert (
+            feed_manager.recent_entries(
+                period + timedelta(days=1), minimum_magnitude=3.0
+            )
+            == []
+        )
+
+
+@pytest.mark.asyncio
+async def test_feed_manager_evicts_from_indexes(mock_aiointercept):
+    """Test entries older than the maximum age are evicted from all indexes."""
+    home_coordinates = (-31.0, 151.0)
+    mock_aiointercept.get(
+        "http://test.url/testpath",
+        status=HTTPStatus.OK,
+        body=load_fixture("generic_feed_7.xml"),
+    )
+
+    async with aiohttp.ClientSession(loop=asyncio.get_running_loop()) as websession:
+        feed = MockQuakeMLFeed(websession, home_coordinates, "http://test.url/testpath")
+
+        async def _callback(external_id):
+            """Ignore entity changes."""
+
+        feed_manager = QuakeMLFeedManagerBase(
+            feed,
+            _callback,
+            _callback,
+            _callback,
+            # Origin times before 2022-03-01T12:00 are too old.
+            entry_max_age=datetime.now(UTC) - datetime(2022, 3, 1, 12, tzinfo=UTC),
+        )
+        await feed_manager.update()
+
+        assert set(feed_manager.feed_entries) == {"21", "31"}
+        assert [
+            entry.external_id for entry in feed_manager.entries_by_origin_time()
+        ] == ["21", "31"]
+        assert [
+            entry.external_id for entry in feed_manager.entries_by_creation_time()
+        ] == ["21", "31"]
+        assert [entry.external_id for entry in feed_manager.entries_by_magnitude()] == [
+            "21",
+            "31",
+        ]
+        entries = feed_manager.entries_within_radius((42.5, 13.4), 20000.0)
+        assert sorted(entry.external_id for entry, _ in entries) == ["21", "31"]
+        entries = feed_manager.nearest_entries((42.5, 13.4), 3)
+        assert [entry.external_id for entry, _ in entries] == ["21", "31"]
+        assert feed_manager.newest_origin_time == datetime(2022, 3, 3, 6, tzinfo=UTC)
+
+
+@pytest.mark.asyncio
+async def test_feed_manager_concurrent_updates(mock_aiointercept):
+    """Test concurrent updates of the feed manager share a single update."""
+    mock_aiointercept.get(
+        "http://test.url/testpath",
+        status=HTTPStatus.OK,
+        body=load_fixture("generic_feed_3.xml"),
+        repeat=True,
+    )
+
+    async with aiohttp.ClientSession(loop=asyncio.get_running_loop()) as websession:
+        feed = MockQuakeMLFeed(websession, (-31.0, 151.0), "http://test.url/testpath")
+        generated_entity_external_ids = []
+
+        async def _generate_entity(external_id):
+            """Generate new entity."""
+            generated_entity_external_ids.append(external_id)
+
+        async def _callback(external_id):
+            """Ignore other entity changes."""
+
+        feed_manager = QuakeMLFeedManagerBase(
+            feed, _generate_entity, _callback, _callback
+        )
+        await asyncio.gather(*(feed_manager.update() for _ in range(10)))
+        assert len(mock_aiointercept.ordered_requests) == 1
+        assert sorted(generated_entity_external_ids) == ["11", "21", "31"]
+
+
+@pytest.mark.asyncio
+async def test_feed_manager_polling_policy(mock_aiointercept):
+    """Test the feed manager informs the polling policy about updates."""
+    mock_aiointercept.get(
+        "http://test.url/testpath",
+        status=HTTPStatus.OK,
+        body=load_fixture("generic_feed_3.xml"),
+        repeat=2,
+    )
+
+    async with aiohttp.ClientSession(loop=asyncio.get_running_loop()) as websession:
+        feed = MockQuakeMLFeed(websession, (-31.0, 151.0), "http://test.url/testpath")
+        status_update = []
+
+        async def _callback(external_id):
+            """Ignore entity changes."""
+
+        async def _status(status_details):
+            """Capture status update details."""
+            status_update.append(status_details)
+
+        feed_manager = QuakeMLFeedManagerBase(
+            feed,
+            _callback,
+            _callback,
+            _callback,
+            _status,
+            polling_policy=AdaptivePollingPolicy(
+                timedelta(minutes=4),
+                timedelta(minutes=1),
+                timedelta(minutes=10),
+            ),
+        )
+        assert feed_manager.polling_interval == timedelta(minutes=4)
+
+        # New entries speed up polling.
+        await feed_manager.update()
+        assert status_update[-1].created == 3
+        assert status_update[-1].interval == timedelta(minutes=2)
+        assert feed_manager.polling_interval == timedelta(minutes=2)
+
+        # Unchanged data slows polling down.
+        await feed_manager.update()
+        assert status_update[-1].status == "OK_NO_CHANGE"
+        assert status_update[-1].interval == timedelta(minutes=3)
+
+
+@pytest.mark.asyncio
+async def test_feed_manager_stale_entries(mock_aiointercept):
+    """Test the feed manager keeps entries for a number of failed updates."""
+    async with aiohttp.ClientSession(loop=asyncio.get_running_loop()) as websession:
+        feed = MockQuakeMLFeed(websession, (-31.0, 151.0), "http://test.url/testpath")
+        generated_entity_external_ids = []
+        removed_entity_external_ids = []
+        status_update = []
+
+        async def _generate_entity(external_id):
+            """Generate new entity."""
+            generated_entity_external_ids.append(external_id)
+
+        async def _update_entity(external_id):
+            """Ignore updated entities."""
+
+        async def _remove_entity(external_id):
+            """Remove entity."""
+            removed_entity_external_ids.append(external_id)
+
+        async def _status(status_details):
+            """Capture status update details."""
+            status_update.append(status_details)
+
+        feed_manager = QuakeMLFeedManagerBase(
+            feed,
+            _generate_entity,
+            _update_entity,
+            _remove_entity,
+            _status,
+            stale_max_failures=2,
+            stale_max_age=timedelta(hours=1),
+        )
+        mock_aiointercept.get(
+            "http://test.url/testpath",
+            status=HTTPStatus.OK,
+            body=load_fixture("generic_feed_3.xml"),
+        )
+        await feed_manager.update()
+        assert len(generated_entity_external_ids) == 3
+        assert not status_update[-1].stale
+
+        # Entries are kept for up to two failed updates.
+        mock_aiointercept.get(
+            "http://test.url/testpath",
+            status=HTTPStatus.INTERNAL_SERVER_ERROR,
+            repeat=2,
+        )
+        for _ in range(2):
+            await feed_manager.update()
+            assert feed_manager.stale
+            assert status_update[-1].status == "ERROR"
+            assert status_update[-1].stale
+            assert status_update[-1].total == 3
+            assert status_update[-1].removed == 0
+            assert len(feed_manager.entries_by_magnitude()) == 3
+        assert len(removed_entity_external_ids) == 0
+
+        # The next successful update does not re-create entities.
+        generated_entity_external_ids.clear()
+        mock_aiointercept.get(
+            "http://test.url/testpath",
+            status=HTTPStatus.OK,
+            body=load_fixture("generic_feed_3.xml"),
+        )
+        await feed_manager.update()
+        assert not feed_manager.stale
+        assert not status_update[-1].stale
+        assert status_update[-1].updated == 0
+        assert status_update[-1].unchanged == 3
+        assert len(generated_entity_external_ids) == 0
+
+        # Too many failed updates remove all entries.
+        mock_aiointercept.get(
+            "http://test.url/testpath",
+            status=HTTPStatus.INTERNAL_SERVER_ERROR,
+            repeat=3,
+        )
+        for _ in range(3):
+            await feed_manager.update()
+        assert not feed_manager.stale
+        assert status_update[-1].removed == 3
+        assert len(feed_manager.feed_entries) == 0
+        assert len(feed_manager.entries_by_magnitude()) == 0
+
+
+@pytest.mark.asyncio
+async def test_feed_manager_stale_entries_max_age(mock_aiointercept):
+    """Test the feed manager removes stale entries older than the maximum age."""
+    mock_aiointercept.get(
+        "http://test.url/testpath",
+        status=HTTPStatus.OK,
+        body=load_fixture("generic_feed_3.xml"),
+    )
+    mock_aiointercept.get(
+        "http://test.url/testpath", status=HTTPStatus.INTERNAL_SERVER_ERROR
+    )
+    async with aiohttp.ClientSession(loop=asyncio.get_running_loop()) as websession:
+        feed = MockQuakeMLFeed(websession, (-31.0, 151.0), "http://test.url/testpath")
+
+        async def _callback(external_id):
+            """Ignore entity changes."""
+
+        feed_manager = QuakeMLFeedManagerBase(
+            feed,
+            _callback,
+            _callback,
+            _callback,
+            stale_max_age=timedelta(0),
+        )
+        await feed_manager.update()
+        assert len(feed_manager.feed_entries) == 3
+        await feed_manager.update()
+        assert not feed_manager.stale
+        assert len(feed_manager.feed_entries) == 0
+
+
+@pytest.mark.asyncio
+async def test_feed_manager_skipped_update(mock_aiointercept):
+    """Test an update the host defers keeps all entries."""
+    mock_aiointercept.get(
+        "http://test.url/testpath",
+        status=HTTPStatus.OK,
+        body=load_fixture("generic_feed_3.xml"),
+    )
+    clock = FakeClock(auto_advance=True)
+    rate_limiter = RateLimiter(clock=clock.time, sleep=clock.sleep)
+    async with aiohttp.ClientSession(loop=asyncio.get_running_loop()) as websession:
+        feed = MockQuakeMLFeed(
+            websession,
+            (-31.0, 151.0),
+            "http://test.url/testpath",
+            rate_limiter=rate_limiter,
+        )
+        removed_entity_external_ids = []
+        status_update = []
+
+        async def _callback(external_id):
+            """Ignore entity changes."""
+
+        async def _remove_entity(external_id):
+            """Remove entity."""
+            removed_entity_external_ids.append(external_id)
+
+        async def _status(status_details):
+            """Capture status update details."""
+            status_update.append(status_details)
+
+        feed_manager = QuakeMLFeedManagerBase(
+            feed, _callback, _callback, _remove_entity, _status
+        )
+        await feed_manager.update()
+        assert len(feed_manager.feed_entries) == 3
+
+        rate_limiter.record_response(
+            "http://test.url/testpath",
+            HTTPStatus.TOO_MANY_REQUESTS,
+            {"Retry-After": "3600"},
+        )
+        await feed_manager.update()
+        assert status_update[-1].status == UPDATE_SKIPPED
+        assert not status_update[-1].stale
+        assert status_update[-1].total == 3
+        assert len(feed_manager.feed_entries) == 3
+        assert len(feed_manager.entries_by_magnitude()) == 3
+        assert not removed_entity_external_ids
+        assert feed_manager._failed_updates == 0  # noqa: SLF001
+        assert len(mock_aiointercept.ordered_requests) == 1
+
+
+@pytest.mark.asyncio
+async def test_feed_manager_changed_fields(mock_aiointercept):
+    """Test the update callback is only invoked for changed entries."""
+    mock_aiointercept.get(
+        "http://test.url/testpath",
+        status=HTTPStatus.OK,
+        body=load_fixture("generic_feed_3.xml"),
+    )
+    # Same events, but a different payload.
+    mock_aiointercept.get(
+        "http://test.url/testpath",
+        status=HTTPStatus.OK,
+        body=load_fixture("generic_feed_3.xml") + "\n",
+    )
+    mock_aiointercept.get(
+        "http://test.url/testpath",
+        status=HTTPStatus.OK,
+        body=load_fixture("generic_feed_4.xml"),
+    )
+
+    async with aiohttp.ClientSession(loop=asyncio.get_running_loop()) as websession:
+        feed = MockQuakeMLFeed(websession, (-31.0, 151.0), "http://test.url/testpath")
+        updated_entities = {}
+        status_update = []
+
+        async def _callback(external_id):
+            """Ignore generated and removed entities."""
+
+        async def _update_entity(external_id, changed_fields):
+            """Update entity."""
+            updated_entities[external_id] = changed_fields
+
+        async def _status(status_details):
+            """Capture status update."""
+            status_update.append(status_details)
+
+        feed_manager = QuakeMLFeedManagerBase(
+            feed,
+            _callback,
+            _update_entity,
+            _callback,
+            _status,
+            changed_fields=True,
+        )
+        await feed_manager.update()
+        await feed_manager.update()
+        assert updated_entities == {}
+        assert status_update[-1].updated == 0
+        assert status_update[-1].unchanged == 3
+
+        await feed_manager.update()
+        assert updated_entities == {"11": {"description"}, "21": {"magnitude"}}
+        assert status_update[-1].created == 1
+        assert status_update[-1].updated == 2
+        assert status_update[-1].unchanged == 0
+        assert status_update[-1].removed == 1
+
+
+@pytest.mark.asyncio
+async def test_feed_manager_concurrent_callbacks(mock_aiointercept):
+    """Test callbacks running concurrently, with failures isolated."""
+    mock_aiointercept.get(
+        "http://test.url/testpath",
+        status=HTTPStatus.OK,
+        body=load_fixture("generic_feed_3.xml"),
+    )
+    mock_aiointercept.get(
+        "http://test.url/testpath",
+        status=HTTPStatus.OK,
+        body=load_fixture("generic_feed_4.xml"),
+    )
+
+    async with aiohttp.ClientSession(loop=asyncio.get_running_loop()) as websession:
+        feed = MockQuakeMLFeed(websession, (-31.0, 151.0), "http://test.url/testpath")
+        generated_entity_external_ids = []
+        removed_entity_external_ids = []
+        status_update = []
+        running = 0
+        max_running = 0
+        failing = {"21", "31"}
+
+        async def _generate_entity(external_id):
+            """Generate new entity, slowly, failing or hanging for some."""
+            nonlocal running, max_running
+            running += 1
+            max_running = max(max_running, running)
+            try:
+                await asyncio.sleep(0.01)
+                if external_id in failing:
+                    raise RuntimeError("Callback failed")
+                if external_id == "41":
+                    await asyncio.sleep(10)
+                generated_entity_external_ids.append(external_id)
+            finally:
+                running -= 1
+
+        async def _update_entity(external_id):
+            """Ignore updated entities."""
+
+        async def _remove_entity(external_id):
+            """Remove entity, failing the first time."""
+            if external_id in failing:
+                failing.discard(external_id)
+                raise RuntimeError("Callback failed")
+            removed_entity_external_ids.append(external_id)
+
+        async def _status(status_details):
+            """Capture status update."""
+            status_update.append(status_details)
+
+        feed_manager = QuakeMLFeedManagerBase(
+            feed,
+            _generate_entity,
+            _update_entity,
+            _remove_entity,
+            _status,
+            callback_concurrency=2,
+            callback_timeout=timedelta(milliseconds=100),
+        )
+        await feed_manager.update()
+        assert max_running == 2
+        assert generated_entity_external_ids == ["11"]
+        assert status_update[-1].created == 1
+
+        # Entities failing to be generated are tried again.
+        failing = {"11"}
+        generated_entity_external_ids.clear()
+        await feed_manager.update()
+        assert generated_entity_external_ids == ["21"]
+        assert status_update[-1].created == 1
+        assert status_update[-1].removed == 0
+
+        # Entities failing to be removed are still managed, and removed later.
+        mock_aiointercept.get(
+            "http://test.url/testpath",
+            status=HTTPStatus.OK,
+            body=load_fixture("generic_feed_1.xml"),
+            repeat=2,
+        )
+        await feed_manager.update()
+        assert removed_entity_external_ids == ["21"]
+        assert status_update[-1].removed == 1
+        await feed_manager.update()
+        assert removed_entity_external_ids == ["21", "11"]
+
+
+@pytest.mark.asyncio
+async def test_feed_manager_batch_callbacks(mock_aiointercept):
+    """Test batch callbacks receive the entries of each step."""
+    mock_aiointercept.get(
+        "http://test.url/testpath",
+        status=HTTPStatus.OK,
+        body=load_fixture("generic_feed_3.xml"),
+    )
+    mock_aiointercept.get(
+        "http://test.url/testpath",
+        status=HTTPStatus.OK,
+        body=load_fixture("generic_feed_4.xml"),
+    )
+
+    async with aiohttp.ClientSession(loop=asyncio.get_running_loop()) as websession:
+        feed = MockQuakeMLFeed(websession, (-31.0, 151.0), "http://test.url/testpath")
+        generated_batches = []
+        updated_batches = []
+        removed_batches = []
+        status_update = []
+
+        async def _generate_entities(entries):
+            """Generate a batch of entities."""
+            generated_batches.append(entries)
+
+        async def _update_entities(entries, changed_fields):
+            """Update a batch of entities."""
+            updated_batches.append((entries, changed_fields))
+
+        async def _remove_entities(entries):
+            """Remove a batch of entities."""
+            removed_batches.append(entries)
+
+        async def _status(status_details):
+            """Capture status update."""
+            status_update.append(status_details)
+
+        feed_manager = QuakeMLFeedManagerBase(
+            feed,
+            status_async_callback=_status,
+            changed_fields=True,
+            generate_batch_async_callback=_generate_entities,
+            update_batch_async_callback=_update_entities,
+            remove_batch_async_callback=_remove_entities,
+            batch_size=2,
+        )
+        await feed_manager.update()
+        assert sorted(len(batch) for batch in generated_batches) == [1, 2]
+        generated = {}
+        for batch in generated_batches:
+            generated.update(batch)
+        assert generated == feed_manager.feed_entries
+        assert status_update[-1].created == 3
+        assert not updated_batches
+        assert not removed_batches
+
+        generated_batches.clear()
+        entry_31 = feed_manager.feed_entries["31"]
+        await feed_manager.update()
+        assert [list(batch) for batch in generated_batches] == [["41"]]
+        assert len(updated_batches) == 1
+        entries, changed_fields = updated_batches[0]
+        assert entries == {
+            "11": feed_manager.feed_entries["11"],
+            "21": feed_manager.feed_entries["21"],
+        }
+        assert changed_fields == {"11": {"description"}, "21": {"magnitude"}}
+        # Removed entities get their last known entry.
+        assert removed_batches == [{"31": entry_31}]
+        assert status_update[-1].created == 1
+        assert status_update[-1].updated == 2
+        assert status_update[-1].removed == 1
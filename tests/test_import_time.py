@@ -0,0 +1,43 @@
+"""Test the import time of the QuakeML library."""
+
+import subprocess
+import sys
+
+PACKAGE = "aio_quakeml_client"
+# Generous upper limit for the cumulative import time of the package, in
+# microseconds; importing any of the heavy dependencies alone exceeds it.
+IMPORT_TIME_BUDGET = 250000
+# Each of these takes more than 50 ms to import.
+DEFERRED_DEPENDENCIES = ("aiohttp", "dateparser", "xmltodict")
+STATEMENT = f"import {PACKAGE}.feed, {PACKAGE}.feed_manager"
+
+
+def _run(*args: str) -> subprocess.CompletedProcess:
+    """Run the python interpreter in a fresh process."""
+    return subprocess.run(
+        [sys.executable, *args], capture_output=True, text=True, check=True
+    )
+
+
+def test_dependencies_are_deferred():
+    """Test heavy dependencies are not imported together with the package."""
+    result = _run(
+        "-c",
+        f"import sys; {STATEMENT}; "
+        f"print(','.join(name for name in {DEFERRED_DEPENDENCIES!r} "
+        f"if name in sys.modules))",
+    )
+    assert result.stdout.strip() == ""
+
+
+def test_import_time_budget():
+    """Test the cumulative import time of the package stays within budget."""
+    result = _run("-X", "importtime", "-c", STATEMENT)
+    total = 0
+    for line in result.stderr.splitlines():
+        # import time: self [us] | cumulative | imported package
+        _, cumulative, name = line.split("|")
+        # Only count top level imports, nested imports are included in them.
+        if name.startswith(f" {PACKAGE}"):
+            total += int(cumulative)
+    assert 0 < total < IMPORT_TIME_BUDGET
@@ -0,0 +1,56 @@
+"""Test for the polling policies."""
+
+from datetime import timedelta
+
+from aio_quakeml_client.consts import (
+    UPDATE_ERROR,
+    UPDATE_OK,
+    UPDATE_OK_NO_CHANGE,
+    UPDATE_OK_NO_DATA,
+)
+from aio_quakeml_client.polling_policy import AdaptivePollingPolicy, PollingPolicy
+
+
+def test_fixed_polling_policy():
+    """Test fixed interval regardless of the outcome of updates."""
+    policy = PollingPolicy(timedelta(minutes=5))
+    policy.record(UPDATE_OK, 10, 0, 0)
+    policy.record(UPDATE_OK_NO_DATA, 0, 0, 0)
+    assert policy.interval == timedelta(minutes=5)
+    assert repr(policy) == "<PollingPolicy(interval=0:05:00)>"
+
+
+def test_adaptive_polling_policy():
+    """Test interval adapts to the rate of changes, within the bounds."""
+    policy = AdaptivePollingPolicy(
+        timedelta(minutes=5), timedelta(minutes=1), timedelta(minutes=10)
+    )
+    assert policy.interval == timedelta(minutes=5)
+
+    # New events arrive.
+    policy.record(UPDATE_OK, 2, 3, 0)
+    assert policy.interval == timedelta(minutes=2, seconds=30)
+    policy.record(UPDATE_OK, 1, 3, 0)
+    policy.record(UPDATE_OK, 1, 3, 0)
+    assert policy.interval == timedelta(minutes=1)
+
+    # Removed entries keep the interval, as do errors.
+    policy.record(UPDATE_OK, 0, 5, 1)
+    policy.record(UPDATE_ERROR, 0, 0, 0)
+    assert policy.interval == timedelta(minutes=1)
+
+    # Quiet periods.
+    policy.record(UPDATE_OK, 0, 5, 0)
+    assert policy.interval == timedelta(minutes=1, seconds=30)
+    policy.record(UPDATE_OK_NO_DATA, 0, 0, 0)
+    policy.record(UPDATE_OK_NO_CHANGE, 0, 0, 0)
+    assert policy.interval == timedelta(minutes=3, seconds=22.5)
+    for _ in range(5):
+        policy.record(UPDATE_OK_NO_DATA, 0, 0, 0)
+    assert policy.interval == timedelta(minutes=10)
+
+    # The initial interval is limited to the bounds too.
+    policy = AdaptivePollingPolicy(
+        timedelta(seconds=10), timedelta(minutes=1), timedelta(minutes=10)
+    )
+    assert policy.interval == timedelta(minutes=1)
@@ -0,0 +1,236 @@
+"""Test for the per-host rate limiter."""
+
+import asyncio
+from datetime import UTC, datetime, timedelta
+from email.utils import format_datetime
+from http import HTTPStatus
+import time
+
+import aiohttp
+import pytest
+
+from aio_quakeml_client.consts import UPDATE_OK, UPDATE_SKIPPED
+from aio_quakeml_client.rate_limit import RateLimiter, shared_rate_limiter
+from aio_quakeml_client.retry import RetryPolicy
+from tests import MockQuakeMLFeed
+from tests.utils import FakeClock, load_fixture
+
+
+def _rate_limiter(clock: FakeClock, **kwargs) -> RateLimiter:
+    """Return a rate limiter running on the fake clock."""
+    return RateLimiter(clock=clock.time, sleep=clock.sleep, **kwargs)
+
+
+@pytest.mark.asyncio
+async def test_token_bucket_in_order():
+    """Test requests beyond the burst wait for tokens, in order of arrival."""
+    clock = FakeClock(auto_advance=True)
+    rate_limiter = _rate_limiter(clock, rate=2.0, burst=2)
+    completed = []
+
+    async def _request(index: int, url: str):
+        """Acquire a token and record when it was granted."""
+        await rate_limiter.acquire(url)
+        completed.append((index, clock.now))
+
+    await asyncio.gather(
+        _request(5, "http://host2.test/path"),
+        *(_request(index, "http://host1.test/path") for index in range(5)),
+    )
+    assert [index for index, _ in completed if index < 5] == [0, 1, 2, 3, 4]
+    assert [now for index, now in completed if index < 5] == pytest.approx(
+        [0.0, 0.0, 0.5, 1.0, 1.5]
+    )
+    # Other hosts have their own bucket.
+    assert (5, 0.0) in completed
+    assert repr(rate_limiter) == "<RateLimiter(rate=2.0, burst=2, hosts=2)>"
+
+
+@pytest.mark.asyncio
+async def test_retry_after():
+    """Test Retry-After stops all requests to the host until then."""
+    clock = FakeClock(auto_advance=True)
+    rate_limiter = _rate_limiter(clock, rate=10.0)
+    url = "http://test.url/testpath"
+    rate_limiter.record_response(
+        url, HTTPStatus.TOO_MANY_REQUESTS, {"Retry-After": "30"}
+    )
+    await rate_limiter.acquire(url)
+    assert clock.now == pytest.approx(30.1)
+
+    retry_at = datetime.now(UTC) + timedelta(seconds=60)
+    rate_limiter.record_response(
+        url,
+        HTTPStatus.SERVICE_UNAVAILABLE,
+        {"Retry-After": format_datetime(retry_at, usegmt=True)},
+    )
+    start = clock.now
+    await rate_limiter.acquire(url)
+    assert 58.0 < clock.now - start <= 60.1
+
+    # Retry-After is ignored on successful responses.
+    start = clock.now
+    rate_limiter.record_response(url, HTTPStatus.OK, {"Retry-After": "30"})
+    await rate_limiter.acquire(url)
+    assert clock.now - start == pytest.approx(0.1)
+
+
+@pytest.mark.asyncio
+async def test_retry_after_invalid_values():
+    """Test Retry-After values that are not finite or lack a timezone."""
+    clock = FakeClock(auto_advance=True)
+    rate_limiter = _rate_limiter(clock, rate=10.0)
+    url = "http://test.url/testpath"
+    for value in ("inf", "nan", "-inf"):
+        rate_limiter.record_response(
+            url, HTTPStatus.SERVICE_UNAVAILABLE, {"Retry-After": value}
+        )
+        await rate_limiter.acquire(url)
+        assert clock.now == 0.0
+    rate_limiter.record_response(
+        url,
+        HTTPStatus.OK,
+        {"X-RateLimit-Remaining": "0", "X-RateLimit-Reset": "inf"},
+    )
+    await rate_limiter.acquire(url)
+    assert clock.now == 0.0
+
+    # HTTP dates without timezone are in GMT.
+    retry_at = datetime.now(UTC) + timedelta(seconds=60)
+    rate_limiter.record_response(
+        url,
+        HTTPStatus.SERVICE_UNAVAILABLE,
+        {"Retry-After": retry_at.strftime("%a, %d %b %Y %H:%M:%S")},
+    )
+    await rate_limiter.acquire(url)
+    assert 58.0 < clock.now <= 60.1
+
+
+@pytest.mark.asyncio
+async def test_acquire_timeout():
+    """Test requests that may not be made within the timeout fail fast."""
+    clock = FakeClock(auto_advance=True)
+    rate_limiter = _rate_limiter(clock, rate=10.0)
+    url = "http://test.url/testpath"
+    rate_limiter.record_response(
+        url, HTTPStatus.TOO_MANY_REQUESTS, {"Retry-After": "3600"}
+    )
+    assert not await rate_limiter.acquire(url, timeout=60.0)
+    assert clock.now == 0.0
+    assert await rate_limiter.acquire(url, timeout=3600.5)
+    assert clock.now == pytest.approx(3600.1)
+
+
+@pytest.mark.asyncio
+async def test_acquire_timeout_queued():
+    """Test time spent queueing behind other requests does not count."""
+    clock = FakeClock(auto_advance=True)
+    rate_limiter = _rate_limiter(clock, rate=1.0, burst=5)
+    url = "http://test.url/testpath"
+    results = await asyncio.gather(
+        *(rate_limiter.acquire(url, timeout=10.0) for _ in range(30))
+    )
+    assert all(results)
+    assert clock.now == pytest.approx(25.0)
+
+
+@pytest.mark.asyncio
+async def test_rate_limit_headers():
+    """Test X-RateLimit headers with no requests remaining."""
+    clock = FakeClock(auto_advance=True)
+    rate_limiter = _rate_limiter(clock, rate=10.0)
+    url = "http://test.url/testpath"
+    rate_limiter.record_response(
+        url, HTTPStatus.OK, {"X-RateLimit-Remaining": "5", "X-RateLimit-Reset": "20"}
+    )
+    await rate_limiter.acquire(url)
+    assert clock.now == 0.0
+
+    rate_limiter.record_response(
+        url, HTTPStatus.OK, {"X-RateLimit-Remaining": "0", "X-RateLimit-Reset": "20"}
+    )
+    await rate_limiter.acquire(url)
+    assert clock.now == pytest.approx(20.1)
+
+    start = clock.now
+    rate_limiter.record_response(
+        url,
+        HTTPStatus.OK,
+        {"X-RateLimit-Remaining": "0", "X-RateLimit-Reset": str(time.time() + 10)},
+    )
+    await rate_limiter.acquire(url)
+    assert 9.0 < clock.now - start <= 10.1
+
+
+@pytest.mark.asyncio
+async def test_feed_honours_retry_after(mock_aiointercept):
+    """Test a throttled feed waits as requested and retries."""
+    mock_aiointercept.get(
+        "http://test.url/testpath",
+        status=HTTPStatus.TOO_MANY_REQUESTS,
+        headers={"Retry-After": "15"},
+    )
+    mock_aiointercept.get(
+        "http://test.url/testpath",
+        status=HTTPStatus.OK,
+        body=load_fixture("generic_feed_1.xml"),
+    )
+    clock = FakeClock(auto_advance=True)
+    rate_limiter = _rate_limiter(clock)
+
+    async with aiohttp.ClientSession(loop=asyncio.get_running_loop()) as websession:
+        feed = MockQuakeMLFeed(
+            websession,
+            (-31.0, 151.0),
+            "http://test.url/testpath",
+            retry_policy=RetryPolicy(initial_backoff=timedelta(0)),
+            rate_limiter=rate_limiter,
+        )
+        status, entries = await feed.update()
+        assert status == UPDATE_OK
+        assert len(entries) == 1
+        assert clock.now == pytest.approx(16.0)
+        assert len(mock_aiointercept.ordered_requests) == 2
+
+
+@pytest.mark.asyncio
+async def test_feed_retry_after_beyond_deadline(mock_aiointercept):
+    """Test a feed does not wait for a Retry-After beyond its deadline."""
+    mock_aiointercept.get(
+        "http://test.url/testpath",
+        status=HTTPStatus.TOO_MANY_REQUESTS,
+        headers={"Retry-After": "3600"},
+    )
+    clock = FakeClock(auto_advance=True)
+    rate_limiter = _rate_limiter(clock)
+
+    async with aiohttp.ClientSession(loop=asyncio.get_running_loop()) as websession:
+        feed = MockQuakeMLFeed(
+            websession,
+            (-31.0, 151.0),
+            "http://test.url/testpath",
+            retry_policy=RetryPolicy(initial_backoff=timedelta(0)),
+            rate_limiter=rate_limiter,
+        )
+        status, entries = await feed.update()
+        assert status == UPDATE_SKIPPED
+        assert entries is None
+        assert clock.now == 0.0
+        assert len(mock_aiointercept.ordered_requests) == 1
+
+        # Without retry policy, the request timeout applies.
+        feed = MockQuakeMLFeed(
+            websession,
+            (-31.0, 151.0),
+            "http://test.url/testpath",
+            rate_limiter=rate_limiter,
+        )
+        status, _ = await feed.update()
+        assert status == UPDATE_SKIPPED
+        assert clock.now == 0.0
+        assert len(mock_aiointercept.ordered_requests) == 1
+
+
+def test_shared_rate_limiter():
+    """Test all feeds share the same rate limiter."""
+    assert shared_rate_limiter() is shared_rate_limiter()
@@ -0,0 +1,229 @@
+"""Test for retrying failed requests and circuit breakers."""
+
+import asyncio
+from datetime import timedelta
+from http import HTTPStatus
+import random
+
+import aiohttp
+from aiohttp import web
+from aiohttp.test_utils import TestServer
+import pytest
+
+from aio_quakeml_client.consts import (
+    CIRCUIT_CLOSED,
+    CIRCUIT_HALF_OPEN,
+    CIRCUIT_OPEN,
+    UPDATE_ERROR,
+    UPDATE_OK,
+)
+from aio_quakeml_client.retry import CircuitBreaker, CircuitBreakers, RetryPolicy
+from tests import MockQuakeMLFeed
+from tests.utils import load_fixture
+
+
+class FaultyServer:
+    """Local server failing requests as instructed, then serving a feed."""
+
+    def __init__(self, faults: list[str]):
+        """Initialise the server with the faults to inject, in order."""
+        self.faults = faults
+        self.requests = 0
+        app = web.Application()
+        app.router.add_get("/feed", self._handle)
+        self.server = TestServer(app)
+
+    async def _handle(self, request: web.Request) -> web.StreamResponse:
+        """Inject the next fault, or serve the feed."""
+        self.requests += 1
+        fault = self.faults.pop(0) if self.faults else None
+        if fault == "server_error":
+            return web.Response(status=HTTPStatus.SERVICE_UNAVAILABLE)
+        if fault == "not_found":
+            return web.Response(status=HTTPStatus.NOT_FOUND)
+        if fault == "reset":
+            request.transport.close()
+            return web.Response()
+        if fault == "slow":
+            await asyncio.sleep(1)
+        return web.Response(body=load_fixture("generic_feed_1.xml"))
+
+    @property
+    def url(self) -> str:
+        """Return the URL of the feed."""
+        return str(self.server.make_url("/feed"))
+
+
+class ShortTimeoutQuakeMLFeed(MockQuakeMLFeed):
+    """Mock feed giving up on slow responses quickly."""
+
+    def _client_session_timeout(self) -> float:
+        """Define client session timeout in seconds."""
+        return 0.2
+
+
+def _retry_policy(**kwargs) -> RetryPolicy:
+    """Return a retry policy with short backoffs."""
+    return RetryPolicy(
+        initial_backoff=timedelta(milliseconds=1),
+        rng=random.Random(0),
+        **kwargs,
+    )
+
+
+@pytest.mark.asyncio
+async def test_retry_transient_faults():
+    """Test timeouts, server errors and dropped connections are retried."""
+    faulty_server = FaultyServer(["server_error", "reset", "slow"])
+    async with faulty_server.server, aiohttp.ClientSession() as websession:
+        feed = ShortTimeoutQuakeMLFeed(
+            websession,
+            (-31.0, 151.0),
+            faulty_server.url,
+            retry_policy=_retry_policy(max_attempts=4),
+        )
+        status, entries = await feed.update()
+        assert status == UPDATE_OK
+        assert len(entries) == 1
+        assert faulty_server.requests == 4
+        assert feed.failed_attempts == 0
+
+
+@pytest.mark.asyncio
+async def test_retry_gives_up():
+    """Test retries stop after the maximum attempts and on client errors."""
+    faulty_server = FaultyServer(["server_error"] * 3 + ["not_found"])
+    async with faulty_server.server, aiohttp.ClientSession() as websession:
+        feed = MockQuakeMLFeed(
+            websession,
+            (-31.0, 151.0),
+            faulty_server.url,
+            retry_policy=_retry_policy(max_attempts=2),
+        )
+        status, entries = await feed.update()
+        assert status == UPDATE_ERROR
+        assert entries is None
+        assert faulty_server.requests == 2
+        assert feed.failed_attempts == 2
+
+        # Client errors are not retried.
+        status, _ = await feed.update()
+        assert status == UPDATE_ERROR
+        assert faulty_server.requests == 4
+        assert feed.failed_attempts == 4
+
+        # No retries without a retry policy.
+        feed = MockQuakeMLFeed(websession, (-31.0, 151.0), faulty_server.url)
+        faulty_server.faults = ["server_error"]
+        status, _ = await feed.update()
+        assert status == UPDATE_ERROR
+        assert faulty_server.requests == 5
+
+
+@pytest.mark.asyncio
+async def test_retry_deadline():
+    """Test no attempt is started after the deadline."""
+    faulty_server = FaultyServer(["server_error"] * 3)
+    async with faulty_server.server, aiohttp.ClientSession() as websession:
+        feed = MockQuakeMLFeed(
+            websession,
+            (-31.0, 151.0),
+            faulty_server.url,
+            retry_policy=RetryPolicy(
+                max_attempts=10,
+                initial_backoff=timedelta(seconds=5),
+                deadline=timedelta(seconds=1),
+            ),
+        )
+        status, _ = await feed.update()
+        assert status == UPDATE_ERROR
+        assert faulty_server.requests == 1
+
+
+@pytest.mark.asyncio
+async def test_circuit_breaker_with_feed():
+    """Test an open circuit stops requests until a probe succeeds."""
+    now = [0.0]
+    faulty_server = FaultyServer(["server_error"] * 2)
+    circuit_breakers = CircuitBreakers(
+        failure_threshold=2,
+        reset_timeout=timedelta(seconds=30),
+        clock=lambda: now[0],
+    )
+    async with faulty_server.server, aiohttp.ClientSession() as websession:
+        feeds = [
+            MockQuakeMLFeed(
+                websession,
+                (-31.0, 151.0),
+                faulty_server.url,
+                circuit_breakers=circuit_breakers,
+            )
+            for _ in range(2)
+        ]
+        for feed in feeds:
+            status, _ = await feed.update()
+            assert status == UPDATE_ERROR
+        circuit_breaker = feeds[0].circuit_breaker
+        assert circuit_breaker is feeds[1].circuit_breaker
+        assert circuit_breaker.state == CIRCUIT_OPEN
+        assert circuit_breaker.failures == 2
+
+        # Rejected without a request while open.
+        status, _ = await feeds[0].update()
+        assert status == UPDATE_ERROR
+        assert faulty_server.requests == 2
+
+        now[0] = 31.0
+        status, entries = await feeds[0].update()
+        assert status == UPDATE_OK
+        assert len(entries) == 1
+        assert faulty_server.requests == 3
+        assert circuit_breaker.state == CIRCUIT_CLOSED
+
+
+def test_circuit_breaker():
+    """Test the states of the circuit breaker."""
+    now = [0.0]
+    circuit_breaker = CircuitBreaker(
+        failure_threshold=3,
+        reset_timeout=timedelta(seconds=10),
+        clock=lambda: now[0],
+    )
+    assert repr(circuit_breaker) == "<CircuitBreaker(state=closed, failures=0)>"
+    circuit_breaker.record_failure()
+    circuit_breaker.record_failure()
+    assert circuit_breaker.state == CIRCUIT_CLOSED
+    assert circuit_breaker.allow_request()
+    circuit_breaker.record_failure()
+    assert circuit_breaker.state == CIRCUIT_OPEN
+    assert not circuit_breaker.allow_request()
+
+    # Only a single probe while half-open.
+    now[0] = 10.0
+    assert circuit_breaker.allow_request()
+    assert circuit_breaker.state == CIRCUIT_HALF_OPEN
+    assert not circuit_breaker.allow_request()
+    circuit_breaker.record_failure()
+    assert circuit_breaker.state == CIRCUIT_OPEN
+    assert not circuit_breaker.allow_request()
+
+    # A lost probe is replaced after the reset timeout.
+    now[0] = 20.0
+    assert circuit_breaker.allow_request()
+    now[0] = 30.0
+    assert circuit_breaker.allow_request()
+    circuit_breaker.record_success()
+    assert circuit_breaker.state == CIRCUIT_CLOSED
+    assert circuit_breaker.failures == 0
+
+
+def test_retry_policy_backoff():
+    """Test the backoff grows exponentially up to the maximum."""
+    policy = RetryPolicy(
+        initial_backoff=timedelta(seconds=1),
+        max_backoff=timedelta(seconds=5),
+        jitter=0.0,
+    )
+    assert [policy.backoff(attempt) for attempt in range(1, 5)] == [1, 2, 4, 5]
+    policy = RetryPolicy(rng=random.Random(0))
+    assert all(0.8 <= policy.backoff(1) <= 1.2 for _ in range(100))
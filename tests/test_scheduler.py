@@ -0,0 +1,242 @@
+"""Test for the feed scheduler."""
+
+import asyncio
+from datetime import timedelta
+from http import HTTPStatus
+import random
+
+import aiohttp
+import pytest
+
+from aio_quakeml_client.feed_manager import QuakeMLFeedManagerBase
+from aio_quakeml_client.scheduler import FeedScheduler
+from tests import MockQuakeMLFeed
+from tests.utils import FakeClock, load_fixture, settle
+
+
+class MockFeed:
+    """Feed stand-in, only providing the URL."""
+
+    def __init__(self, url):
+        """Initialise the feed."""
+        self.url = url
+
+
+class MockManager:
+    """Feed manager stand-in, with updates completing on demand."""
+
+    def __init__(self, url="http://test.url/testpath"):
+        """Initialise the manager."""
+        self.feed = MockFeed(url)
+        self.polling_interval = None
+        self.updates = 0
+        self.running = 0
+        self.release = asyncio.Event()
+
+    async def update(self):
+        """Update, and wait until released."""
+        self.updates += 1
+        self.running += 1
+        try:
+            await self.release.wait()
+        finally:
+            self.running -= 1
+
+
+def _scheduler(clock: FakeClock, **kwargs) -> FeedScheduler:
+    """Return a scheduler running on the fake clock."""
+    return FeedScheduler(
+        clock=clock.time, sleep=clock.sleep, rng=random.Random(0), **kwargs
+    )
+
+
+@pytest.mark.asyncio
+async def test_scheduler_phase_and_skipped_ticks():
+    """Test first updates are spread out and busy managers skip ticks."""
+    clock = FakeClock()
+    scheduler = _scheduler(clock, jitter=0.0, max_concurrency_per_host=5)
+    managers = [MockManager() for _ in range(5)]
+    for manager in managers:
+        scheduler.add(manager, timedelta(minutes=1))
+    assert repr(scheduler) == "<FeedScheduler(managers=5, started=False)>"
+    scheduler.start()
+    await settle()
+    assert sum(manager.updates for manager in managers) == 0
+
+    await clock.advance(30)
+    first_round = sum(manager.updates for manager in managers)
+    assert 0 < first_round < 5
+    await clock.advance(30)
+    assert all(manager.updates == 1 for manager in managers)
+
+    # Updates are still running, so the next ticks are skipped.
+    await clock.advance(60)
+    assert all(manager.updates == 1 for manager in managers)
+    assert all(scheduled.skipped == 1 for scheduled in scheduler.scheduled)
+
+    for manager in managers:
+        manager.release.set()
+    await clock.advance(60)
+    assert all(manager.updates == 2 for manager in managers)
+    assert scheduler.max_lag == 0.0
+    assert scheduler.mean_lag == 0.0
+    await scheduler.stop()
+
+
+@pytest.mark.asyncio
+async def test_scheduler_concurrency_limits():
+    """Test the global and per-host limits of concurrent updates."""
+    clock = FakeClock()
+    scheduler = _scheduler(clock, max_concurrency=3, max_concurrency_per_host=2)
+    managers = [MockManager(f"http://host{index % 2}.test/path") for index in range(6)]
+    managers.append(MockManager("http://host2.test/path"))
+    for manager in managers:
+        scheduler.add(manager, timedelta(minutes=1))
+    scheduler.start()
+    await clock.advance(70)
+    assert sum(manager.running for manager in managers) == 3
+    running_hosts = [manager.feed.url for manager in managers if manager.running]
+    assert all(running_hosts.count(url) <= 2 for url in running_hosts)
+
+    # Waiting updates start once others complete, and report their lag.
+    for manager in managers:
+        manager.release.set()
+    await settle()
+    assert all(manager.updates == 1 for manager in managers)
+    assert scheduler.max_lag > 0.0
+    lagging = [scheduled for scheduled in scheduler.scheduled if scheduled.last_lag]
+    assert lagging
+    assert all(scheduled.mean_lag == scheduled.last_lag for scheduled in lagging)
+    await scheduler.stop()
+
+
+@pytest.mark.asyncio
+async def test_scheduler_busy_host_does_not_block_other_hosts():
+    """Test updates waiting for a busy host leave global slots to other hosts."""
+    clock = FakeClock()
+    scheduler = _scheduler(clock, max_concurrency=2, max_concurrency_per_host=1)
+    managers = [MockManager("http://host0.test/path") for _ in range(3)]
+    for manager in managers:
+        scheduler.add(manager, timedelta(minutes=1))
+    scheduler.start()
+    await clock.advance(70)
+    assert sum(manager.running for manager in managers) == 1
+
+    other_manager = MockManager("http://host1.test/path")
+    scheduler.add(other_manager, timedelta(minutes=1))
+    await clock.advance(70)
+    assert other_manager.running == 1
+    for manager in [*managers, other_manager]:
+        manager.release.set()
+    await scheduler.stop()
+
+
+@pytest.mark.asyncio
+async def test_scheduler_remove_while_running():
+    """Test stopping waits for the update of a removed manager to complete."""
+    clock = FakeClock()
+    scheduler = _scheduler(clock)
+    manager = MockManager()
+    scheduler.add(manager, timedelta(minutes=1))
+    scheduler.start()
+    await clock.advance(70)
+    assert manager.running == 1
+
+    scheduler.remove(manager)
+    assert scheduler.running(manager)
+    stop_task = asyncio.ensure_future(scheduler.stop())
+    await settle()
+    assert not stop_task.done()
+    manager.release.set()
+    await stop_task
+    assert manager.running == 0
+    assert not scheduler.running(manager)
+
+
+@pytest.mark.asyncio
+async def test_scheduler_remove_and_failures():
+    """Test removing managers and updates raising exceptions."""
+    clock = FakeClock()
+    scheduler = _scheduler(clock)
+    manager = MockManager()
+    manager.release.set()
+    removed_manager = MockManager()
+
+    async def _failing_update():
+        """Fail to update."""
+        raise RuntimeError("Update failed")
+
+    failing_manager = MockManager()
+    failing_manager.update = _failing_update
+    scheduler.start()
+    scheduled = scheduler.add(manager, timedelta(seconds=10))
+    scheduler.add(removed_manager, timedelta(seconds=10))
+    failing = scheduler.add(failing_manager, timedelta(seconds=10))
+    scheduler.remove(removed_manager)
+    await clock.advance(100)
+    assert 8 <= scheduled.runs <= 11
+    assert scheduled.failed == 0
+    assert failing.failed == failing.runs > 0
+    assert removed_manager.updates == 0
+    assert len(scheduler.scheduled) == 2
+    await scheduler.stop()
+    runs = scheduled.runs
+    await clock.advance(100)
+    assert scheduled.runs == runs
+
+
+@pytest.mark.asyncio
+async def test_scheduler_with_polling_interval():
+    """Test the scheduler follows the polling interval of managers."""
+    clock = FakeClock()
+    scheduler = _scheduler(clock, jitter=0.0)
+    manager = MockManager()
+    manager.release.set()
+    manager.polling_interval = timedelta(seconds=10)
+    with pytest.raises(ValueError, match="No interval defined"):
+        scheduler.add(MockManager())
+    scheduled = scheduler.add(manager)
+    scheduler.start()
+    await clock.advance(100)
+    assert 9 <= manager.updates <= 10
+
+    manager.polling_interval = timedelta(seconds=50)
+    updates = manager.updates
+    await clock.advance(100)
+    assert manager.updates - updates <= 3
+    assert scheduled.interval == 50.0
+    await scheduler.stop()
+
+
+@pytest.mark.asyncio
+async def test_scheduler_with_feed_managers(mock_aiointercept):
+    """Test the scheduler updating feed managers against a stand-in server."""
+    mock_aiointercept.get(
+        "http://test.url/testpath",
+        status=HTTPStatus.OK,
+        body=load_fixture("generic_feed_3.xml"),
+        repeat=True,
+    )
+
+    async def _callback(external_id):
+        """Ignore entity changes."""
+
+    clock = FakeClock()
+    scheduler = _scheduler(clock, max_concurrency_per_host=1)
+    async with aiohttp.ClientSession(loop=asyncio.get_running_loop()) as websession:
+        managers = [
+            QuakeMLFeedManagerBase(
+                MockQuakeMLFeed(websession, (-31.0, 151.0), "http://test.url/testpath"),
+                _callback,
+                _callback,
+                _callback,
+            )
+            for _ in range(3)
+        ]
+        for manager in managers:
+            scheduler.add(manager, timedelta(minutes=1))
+        scheduler.start()
+        await clock.advance(70)
+        await scheduler.stop()
+        assert len(mock_aiointercept.ordered_requests) == 3
+        assert all(len(manager.feed_entries) == 3 for manager in managers)
@@ -0,0 +1,39 @@
+"""Test for the sorted index."""
+
+from aio_quakeml_client.sorted_index import SortedIndex
+
+
+def test_sorted_index():
+    """Test adding, moving and removing keys, and range queries."""
+    index = SortedIndex()
+    assert index.minimum is None
+    assert index.maximum is None
+    index.add("a", 3.0)
+    index.add("b", 1.0)
+    index.add("c", 3.0)
+    index.add("d", 2.0)
+    index.add("e", None)
+    assert len(index) == 4
+    assert "e" not in index
+    assert repr(index) == "<SortedIndex(keys=4)>"
+    assert index.between() == ["b", "d", "a", "c"]
+    assert index.between(2.0, 3.0) == ["d", "a", "c"]
+    assert index.between(minimum=2.5) == ["a", "c"]
+    assert index.between(maximum=2.0) == ["b", "d"]
+    assert index.before(3.0) == ["b", "d"]
+    assert index.minimum == 1.0
+    assert index.maximum == 3.0
+
+    # Move a key to a new value, and remove keys sharing the same value.
+    index.add("b", 4.0)
+    assert index.between() == ["d", "a", "c", "b"]
+    assert index.value("b") == 4.0
+    index.remove("c")
+    index.remove("unknown")
+    assert index.between() == ["d", "a", "b"]
+    index.add("a", None)
+    assert index.between() == ["d", "b"]
+
+    index.clear()
+    assert len(index) == 0
+    assert index.value("d") is None
@@ -0,0 +1,94 @@
+"""Test for the spatial index."""
+
+import random
+
+from haversine import haversine
+import pytest
+
+from aio_quakeml_client.spatial_index import SpatialIndex
+
+
+@pytest.fixture
+def points():
+    """Return random points across the globe."""
+    rng = random.Random(1)
+    return {
+        index: (rng.uniform(-90.0, 90.0), rng.uniform(-180.0, 180.0))
+        for index in range(2000)
+    }
+
+
+@pytest.fixture
+def spatial_index(points):
+    """Return a spatial index containing all points."""
+    index = SpatialIndex(cell_size=5.0)
+    for key, coordinates in points.items():
+        index.add(key, coordinates)
+    return index
+
+
+@pytest.mark.parametrize(
+    ("coordinates", "radius"),
+    [((-31.0, 151.0), 1000.0), ((0.0, 179.9), 800.0), ((88.0, 10.0), 1500.0)],
+)
+def test_within_radius(points, spatial_index, coordinates, radius):
+    """Test radius queries return the same as a linear scan."""
+    expected = {
+        key for key, point in points.items() if haversine(coordinates, point) <= radius
+    }
+    matches = spatial_index.within_radius(coordinates, radius)
+    assert {key for key, _ in matches} == expected
+    distances = [distance for _, distance in matches]
+    assert distances == sorted(distances)
+
+
+@pytest.mark.parametrize(
+    ("south_west", "north_east"),
+    [((-40.0, 140.0), (-20.0, 160.0)), ((-10.0, 170.0), (10.0, -170.0))],
+)
+def test_within_bounding_box(points, spatial_index, south_west, north_east):
+    """Test bounding box queries, including boxes across the antimeridian."""
+    expected = {
+        key
+        for key, (latitude, longitude) in points.items()
+        if south_west[0] <= latitude <= north_east[0]
+        and (
+            south_west[1] <= longitude <= north_east[1]
+            if south_west[1] <= north_east[1]
+            else longitude >= south_west[1] or longitude <= north_east[1]
+        )
+    }
+    assert expected
+    assert set(spatial_index.within_bounding_box(south_west, north_east)) == expected
+
+
+def test_nearest(points, spatial_index):
+    """Test nearest points are the same as from a linear scan."""
+    coordinates = (-31.0, 151.0)
+    expected = sorted(points, key=lambda key: haversine(coordinates, points[key]))
+    assert [key for key, _ in spatial_index.nearest(coordinates, 5)] == expected[:5]
+    assert len(spatial_index.nearest(coordinates, 5000)) == len(points)
+    assert spatial_index.nearest(coordinates, 0) == []
+
+
+def test_add_and_remove():
+    """Test moving and removing points."""
+    spatial_index = SpatialIndex()
+    spatial_index.add("a", (-31.0, 151.0))
+    spatial_index.add("b", (42.5, 13.4))
+    assert len(spatial_index) == 2
+    assert repr(spatial_index) == "<SpatialIndex(points=2, cells=2)>"
+
+    spatial_index.add("a", (42.6, 13.5))
+    assert [key for key, _ in spatial_index.within_radius((42.5, 13.4), 50.0)] == [
+        "b",
+        "a",
+    ]
+    assert spatial_index.within_radius((-31.0, 151.0), 50.0) == []
+
+    spatial_index.add("b", None)
+    assert "b" not in spatial_index
+    spatial_index.remove("a")
+    spatial_index.remove("unknown")
+    assert len(spatial_index) == 0
+    assert repr(spatial_index) == "<SpatialIndex(points=0, cells=0)>"
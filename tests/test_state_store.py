@@ -0,0 +1,219 @@
+"""Test for persisting the state of feed managers."""
+
+import asyncio
+from http import HTTPStatus
+import json
+
+import aiohttp
+import pytest
+
+from aio_quakeml_client.feed_manager import QuakeMLFeedManagerBase
+from aio_quakeml_client.state_store import JsonFileStateStore, SqliteStateStore
+from tests import MockQuakeMLFeed
+from tests.utils import load_fixture
+
+
+def _json_store(tmp_path):
+    """Return a JSON file state store."""
+    return JsonFileStateStore(tmp_path / "state.json")
+
+
+def _sqlite_store(tmp_path):
+    """Return an SQLite state store."""
+    return SqliteStateStore(tmp_path / "state.db", key="test")
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("store_factory", [_json_store, _sqlite_store])
+async def test_warm_restart(mock_aiointercept, tmp_path, store_factory):
+    """Test a restarted manager neither generates nor updates known entities."""
+    mock_aiointercept.get(
+        "http://test.url/testpath",
+        status=HTTPStatus.OK,
+        body=load_fixture("generic_feed_3.xml"),
+        headers={"ETag": '"abc123"'},
+    )
+    mock_aiointercept.get(
+        "http://test.url/testpath",
+        status=HTTPStatus.OK,
+        body=load_fixture("generic_feed_3.xml"),
+        headers={"ETag": '"abc123"'},
+    )
+    mock_aiointercept.get(
+        "http://test.url/testpath",
+        status=HTTPStatus.OK,
+        body=load_fixture("generic_feed_4.xml"),
+    )
+
+    async with aiohttp.ClientSession(loop=asyncio.get_running_loop()) as websession:
+        generated_entity_external_ids = []
+        updated_entity_external_ids = []
+        removed_entity_external_ids = []
+        status_update = []
+
+        async def _generate_entity(external_id):
+            """Generate new entity."""
+            generated_entity_external_ids.append(external_id)
+
+        async def _update_entity(external_id):
+            """Update entity."""
+            updated_entity_external_ids.append(external_id)
+
+        async def _remove_entity(external_id):
+            """Remove entity."""
+            removed_entity_external_ids.append(external_id)
+
+        async def _status(status_details):
+            """Capture status update."""
+            status_update.append(status_details)
+
+        def _feed_manager():
+            """Return a new feed manager, with the state store."""
+            return QuakeMLFeedManagerBase(
+                MockQuakeMLFeed(websession, (-31.0, 151.0), "http://test.url/testpath"),
+                _generate_entity,
+                _update_entity,
+                _remove_entity,
+                _status,
+                state_store=store_factory(tmp_path),
+            )
+
+        feed_manager = _feed_manager()
+        await feed_manager.update()
+        assert len(generated_entity_external_ids) == 3
+        assert "validators" not in feed_manager.snapshot_state()["feed"]
+
+        # Restart with a full request, which builds the entries again.
+        generated_entity_external_ids.clear()
+        feed_manager = _feed_manager()
+        await feed_manager.update()
+        assert "If-None-Match" not in mock_aiointercept.last_request.headers
+        assert status_update[-1].status == "OK"
+        assert status_update[-1].unchanged == 3
+        assert status_update[-1].removed == 0
+        assert len(generated_entity_external_ids) == 0
+        assert len(updated_entity_external_ids) == 0
+        assert len(removed_entity_external_ids) == 0
+        entries = feed_manager.entries_within_radius((42.5, 13.4), 20000.0)
+        assert sorted(entry.external_id for entry, _ in entries) == ["11", "21", "31"]
+
+        # Only changes since before the restart are reported.
+        await feed_manager.update()
+        assert generated_entity_external_ids == ["41"]
+        assert sorted(updated_entity_external_ids) == ["11", "21"]
+        assert removed_entity_external_ids == ["31"]
+        assert status_update[-1].unchanged == 0
+
+        # The state is saved after every update.
+        state = await store_factory(tmp_path).load()
+        assert sorted(state["entries"]) == ["11", "21", "41"]
+
+
+@pytest.mark.asyncio
+async def test_warm_restart_incremental(mock_aiointercept, tmp_path):
+    """Test a restarted manager of an incremental feed starts with a full request."""
+    mock_aiointercept.get(
+        "http://test.url/testpath",
+        status=HTTPStatus.OK,
+        body=load_fixture("generic_feed_1.xml"),
+        repeat=2,
+    )
+    mock_aiointercept.get(
+        "http://test.url/testpath?updatedafter=2022-03-01T22:54:13",
+        status=HTTPStatus.OK,
+        body=load_fixture("generic_feed_3.xml"),
+    )
+
+    async with aiohttp.ClientSession(loop=asyncio.get_running_loop()) as websession:
+        generated_entity_external_ids = []
+        status_update = []
+
+        async def _generate_entity(external_id):
+            """Generate new entity."""
+            generated_entity_external_ids.append(external_id)
+
+        async def _callback(external_id):
+            """Ignore entity changes."""
+
+        async def _status(status_details):
+            """Capture status update."""
+            status_update.append(status_details)
+
+        def _feed_manager():
+            """Return a new feed manager of an incremental feed."""
+            return QuakeMLFeedManagerBase(
+                MockQuakeMLFeed(
+                    websession,
+                    (-31.0, 151.0),
+                    "http://test.url/testpath",
+                    incremental=True,
+                ),
+                _generate_entity,
+                _callback,
+                _callback,
+                _status,
+                state_store=_json_store(tmp_path),
+            )
+
+        feed_manager = _feed_manager()
+        await feed_manager.update()
+        assert len(generated_entity_external_ids) == 1
+        assert "watermark" not in feed_manager.snapshot_state()["feed"]
+
+        # The watermark is not restored, the first request is a full one.
+        generated_entity_external_ids.clear()
+        feed_manager = _feed_manager()
+        await feed_manager.update()
+        assert mock_aiointercept.last_request.url.query_string == ""
+        assert status_update[-1].unchanged == 1
+        assert len(generated_entity_external_ids) == 0
+        assert len(feed_manager.feed_entries) == 1
+
+        # Later requests only ask for changes.
+        await feed_manager.update()
+        assert mock_aiointercept.last_request.url.query_string == (
+            "updatedafter=2022-03-01T22:54:13"
+        )
+        assert len(generated_entity_external_ids) == 3
+
+
+@pytest.mark.asyncio
+async def test_broken_state(tmp_path):
+    """Test a missing or broken state is ignored."""
+    store = JsonFileStateStore(tmp_path / "state.json")
+    assert await store.load() is None
+    (tmp_path / "state.json").write_text("{broken")
+    assert await store.load() is None
+    await store.save({"entries": {}})
+    assert await store.load() == {"entries": {}}
+    assert repr(store) == f"<JsonFileStateStore(path={tmp_path / 'state.json'})>"
+
+    store = SqliteStateStore(tmp_path / "state.db")
+    assert await store.load() is None
+    (tmp_path / "broken.db").write_text("not a database")
+    store = SqliteStateStore(tmp_path / "broken.db")
+    assert await store.load() is None
+    await store.save({"entries": {}})
+
+
+@pytest.mark.asyncio
+async def test_feed_state(mock_aiointercept):
+    """Test the state of a feed survives a round trip."""
+    mock_aiointercept.get(
+        "http://test.url/testpath",
+        status=HTTPStatus.OK,
+        body=load_fixture("generic_feed_1.xml"),
+    )
+
+    async with aiohttp.ClientSession(loop=asyncio.get_running_loop()) as websession:
+        feed = MockQuakeMLFeed(
+            websession, (-31.0, 151.0), "http://test.url/testpath", incremental=True
+        )
+        await feed.update()
+        assert feed.last_timestamp is not None
+        restored_feed = MockQuakeMLFeed(
+            websession, (-31.0, 151.0), "http://test.url/testpath", incremental=True
+        )
+        restored_feed.restore_state(json.loads(json.dumps(feed.snapshot_state())))
+        assert restored_feed.last_timestamp == feed.last_timestamp
+        assert restored_feed.snapshot_state() == feed.snapshot_state()
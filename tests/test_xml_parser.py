@@ -0,0 +1,182 @@
+"""Test for the XML parser."""
+
+from datetime import UTC, datetime, timedelta
+
+from aio_quakeml_client.consts import (
+    XML_TAG_CREATIONINFO,
+    XML_TAG_EVENT,
+    XML_TAG_EVENTPARAMETERS,
+    XML_TAG_MAGNITUDE,
+    XML_TAG_ORIGIN,
+    XML_TAG_Q_QUAKEML,
+)
+from aio_quakeml_client.xml_parser import XmlParser
+from tests.utils import load_fixture
+
+
+def test_incremental_parser():
+    """Test events are emitted as soon as they are complete."""
+    xml = load_fixture("generic_feed_3.xml").encode("utf-8")
+    parser = XmlParser().incremental()
+    events = []
+    emitted_at = []
+    for position in range(0, len(xml), 64):
+        new_events = parser.feed(xml[position : position + 64])
+        events.extend(new_events)
+        emitted_at.extend([position] * len(new_events))
+    events.extend(parser.close())
+
+    assert [event.public_id for event in events] == ["11", "21", "31"]
+    # The first event is available long before the end of the document.
+    assert emitted_at[0] < len(xml) / 2
+    assert events[0].origin.latitude == 42.5218
+    assert events[0].magnitude.mag == 2.6
+    assert (
+        parser.event_parameters.public_id
+        == "smi:webservices.ingv.it/fdsnws/event/1/query"
+    )
+
+
+def test_incremental_parser_same_as_full_parse():
+    """Test streamed events are identical to events of a full parse."""
+    xml = load_fixture("generic_feed_1.xml")
+    full_events = XmlParser().parse(xml).events
+    parser = XmlParser().incremental()
+    streamed_events = parser.feed(xml.encode("utf-8")) + parser.close()
+
+    assert len(streamed_events) == 1
+    for tag in (XML_TAG_ORIGIN, XML_TAG_MAGNITUDE, XML_TAG_CREATIONINFO):
+        assert streamed_events[0].attribute([tag]) == full_events[0].attribute([tag])
+    assert streamed_events[0].origin.time == datetime(
+        2022, 3, 1, 22, 53, 55, 680000, tzinfo=UTC
+    )
+
+    # Elements of <eventParameters> other than events are kept as well.
+    xml = load_fixture("generic_feed_9.xml")
+    full_event_parameters = XmlParser().parse(xml)
+    parser = XmlParser().incremental()
+    streamed_events = parser.feed(xml) + parser.close()
+    compact_event_parameters = XmlParser(compact=True).parse(xml)
+
+    full_source = dict(full_event_parameters._source)  # noqa: SLF001
+    del full_source[XML_TAG_EVENT]
+    assert full_source == parser.event_parameters._source  # noqa: SLF001
+    assert full_source == compact_event_parameters._source  # noqa: SLF001
+    assert full_source["creationInfo"]["agencyID"] == "INGV"
+    assert [event.public_id for event in streamed_events] == ["11", "21", "31"]
+    assert [event.public_id for event in compact_event_parameters.events] == [
+        "11",
+        "21",
+        "31",
+    ]
+
+    # Documents other than QuakeML are not parsed, same as for a full parse.
+    xml = "<rss><channel><item><title>Title</title></item></channel></rss>"
+    assert XmlParser().parse(xml) is None
+    assert XmlParser(compact=True).parse(xml) is None
+
+
+def test_incremental_parser_same_structure_as_full_parse():
+    """Test streamed events have exactly the structure of a full parse."""
+    for fixture in ("generic_feed_1.xml", "generic_feed_3.xml"):
+        xml = load_fixture(fixture)
+        full_events = XmlParser().parse(xml).events
+        parser = XmlParser().incremental()
+        streamed_events = []
+        for position in range(0, len(xml), 50):
+            streamed_events.extend(parser.feed(xml[position : position + 50]))
+        streamed_events.extend(parser.close())
+
+        assert [event._source for event in streamed_events] == [  # noqa: SLF001
+            event._source  # noqa: SLF001
+            for event in full_events
+        ]
+
+
+def test_postprocessor():
+    """Test the postprocessor can still be used without a parser instance."""
+    path = [
+        (name, None)
+        for name in (
+            XML_TAG_Q_QUAKEML,
+            XML_TAG_EVENTPARAMETERS,
+            XML_TAG_EVENT,
+            XML_TAG_MAGNITUDE,
+            "mag",
+            "value",
+        )
+    ]
+    assert XmlParser.postprocessor(path, "value", "2.5") == ("value", 2.5)
+    assert XmlParser.postprocessor(path, "value", "n/a") == ("value", "n/a")
+    assert XmlParser.postprocessor(path[:-1], "mag", "2.5") == ("mag", "2.5")
+
+
+def test_additional_conversions():
+    """Test additional typed paths are converted."""
+    origin_path = (
+        XML_TAG_Q_QUAKEML,
+        XML_TAG_EVENTPARAMETERS,
+        XML_TAG_EVENT,
+        XML_TAG_ORIGIN,
+    )
+    parser = XmlParser(
+        additional_conversions={
+            (*origin_path, "quality", "usedPhaseCount"): int,
+            (*origin_path, "latitude", "uncertainty"): float,
+            (*origin_path, "originUncertainty", "preferredDescription"): float,
+        }
+    )
+    event = parser.parse(load_fixture("generic_feed_1.xml")).events[0]
+    origin = event.origin
+    assert origin.attribute(["quality"])["usedPhaseCount"] == 46
+    assert origin.attribute(["latitude"])["uncertainty"] == 0.0027
+    # Values that cannot be converted are left unchanged.
+    assert (
+        origin.attribute(["originUncertainty"])["preferredDescription"]
+        == "uncertainty ellipse"
+    )
+    # Paths of the default schema are still converted.
+    assert origin.latitude == 42.5218
+
+    # The default parser is not affected by additional conversions.
+    event = XmlParser().parse(load_fixture("generic_feed_1.xml")).events[0]
+    assert event.origin.attribute(["quality"])["usedPhaseCount"] == "46"
+
+
+def test_timestamp_conversion():
+    """Test timestamps are converted into timezone-aware UTC datetimes."""
+    xml = (
+        '<q:quakeml xmlns:q="http://quakeml.org/xmlns/quakeml/1.2" '
+        'xmlns="http://quakeml.org/xmlns/bed/1.2"><eventParameters>'
+        "<event><origin><time><value>2022-04-28T12:00:00+02:00</value></time>"
+        "</origin><creationInfo><creationTime>2022-04-28T10:00:00.123Z"
+        "</creationTime></creationInfo></event>"
+        "<event><origin><time><value>28 April 2022 10:00</value></time></origin>"
+        "<creationInfo><creationTime>2022-04-28T10:00:00</creationTime>"
+        "</creationInfo></event>"
+        "</eventParameters></q:quakeml>"
+    )
+    events = XmlParser().parse(xml).events
+    assert events[0].origin.time == datetime(2022, 4, 28, 10, 0, 0, tzinfo=UTC)
+    assert events[0].origin.time.utcoffset() == timedelta(0)
+    assert events[0].creation_info.creation_time == datetime(
+        2022, 4, 28, 10, 0, 0, 123000, tzinfo=UTC
+    )
+    # Values which are not ISO 8601 are handled by the fallback parser.
+    assert events[1].origin.time == datetime(2022, 4, 28, 10, 0, 0, tzinfo=UTC)
+    assert events[1].creation_info.creation_time == datetime(
+        2022, 4, 28, 10, 0, 0, tzinfo=UTC
+    )
+
+
+def test_memoized_elements():
+    """Test derived elements and values are only computed once."""
+    event = XmlParser().parse(load_fixture("generic_feed_1.xml")).events[0]
+    assert event.origin is event.origin
+    assert event.origins[0] is event.origin
+    assert event.magnitude is event.magnitude
+    assert event.creation_info is event.creation_info
+    assert event.description is event.description
+    assert event.origin.latitude == 42.5218
+    assert not hasattr(event, "__dict__")
+    assert not hasattr(event.origin, "__dict__")
@@ -1,5 +1,8 @@
 """Test utilities."""
 
+import asyncio
+import heapq
+import itertools
 import os
 
 
@@ -8,3 +11,51 @@ def load_fixture(filename):
     path = os.path.join(os.path.dirname(__file__), "fixtures", filename)
     with open(path, encoding="utf-8") as fptr:
         return fptr.read()
+
+
+class FakeClock:
+    """Virtual clock, providing time and sleep functions.
+
+    Sleepers wait until the clock is advanced, unless it advances
+    automatically, by the delay of each sleep.
+    """
+
+    def __init__(self, *, auto_advance: bool = False):
+        """Initialise the clock."""
+        self.now = 0.0
+        self._auto_advance = auto_advance
+        self._sleepers = []
+        self._sequence = itertools.count()
+
+    def time(self) -> float:
+        """Return the current virtual time."""
+        return self.now
+
+    async def sleep(self, delay: float):
+        """Sleep until the virtual time has advanced by the delay."""
+        if self._auto_advance:
+            self.now += delay
+            await asyncio.sleep(0)
+            return
+        future = asyncio.get_running_loop().create_future()
+        heapq.heappush(self._sleepers, (self.now + delay, next(self._sequence), future))
+        await future
+
+    async def advance(self, seconds: float):
+        """Advance the virtual time, waking up all sleepers on the way."""
+        end = self.now + seconds
+        await settle()
+        while self._sleepers and self._sleepers[0][0] <= end:
+            deadline, _, future = heapq.heappop(self._sleepers)
+            self.now = max(self.now, deadline)
+            if not future.done():
+                future.set_result(None)
+            await settle()
+        self.now = end
+        await settle()
+
+
+async def settle():
+    """Let all ready tasks run."""
+    for _ in range(10):
+        await asyncio.sleep(0)